@@ -0,0 +1,118 @@
+package com.llmhub.llmhub.data
+
+import android.content.Context
+import com.google.gson.Gson
+import java.io.IOException
+import java.io.InputStreamReader
+
+/**
+ * Lazily decoded copy of the model catalog compiled by
+ * `python3 -m scripts.catalog asset` into assets/model_catalog.json.
+ *
+ * Entries are grouped by the ModelData list they are declared in
+ * (baseModels, sdxlModels, ...). Device-specific `${DeviceInfo...}`
+ * templates and per-chipset sizes are resolved when the asset is loaded.
+ * [groups] returns null when the asset is missing or was written by an
+ * incompatible catalog tool; callers should then fall back to ModelData.
+ */
+object ModelCatalogAsset {
+    const val FORMAT_VERSION = 1
+    private const val ASSET_NAME = "model_catalog.json"
+
+    private class Payload(
+        val formatVersion: Int = 0,
+        val sourceSha256: String = "",
+        val groups: Map<String, List<Entry>> = emptyMap()
+    )
+
+    private class Requirements(val minRamGB: Int = 0, val recommendedRamGB: Int = 0)
+
+    private class SizeSwitch(val subject: String = "", val cases: Map<String, Long> = emptyMap())
+
+    // Defaults mirror LLMModel; the catalog tool omits arguments equal to them.
+    private class Entry(
+        val name: String = "",
+        val description: String = "",
+        val url: String = "",
+        val category: String = "",
+        val sizeBytes: Long = 0L,
+        val sizeBytesWhen: SizeSwitch? = null,
+        val source: String = "",
+        val supportsVision: Boolean = false,
+        val supportsAudio: Boolean = false,
+        val supportsThinking: Boolean = false,
+        val supportsGpu: Boolean = false,
+        val supportsMtp: Boolean = true,
+        val requirements: Requirements = Requirements(),
+        val contextWindowSize: Int = 2048,
+        val modelFormat: String = "task",
+        val additionalFiles: List<String> = emptyList()
+    )
+
+    private val templateValues: Map<String, () -> String> = mapOf(
+        "DeviceInfo.getDeviceSoc()" to { DeviceInfo.getDeviceSoc() },
+        "DeviceInfo.getSdQnnPackageSuffix()" to { DeviceInfo.getSdQnnPackageSuffix() },
+        "DeviceInfo.getUpscalerSuffix()" to { DeviceInfo.getUpscalerSuffix() }
+    )
+
+    @Volatile
+    private var cached: Map<String, List<LLMModel>>? = null
+
+    fun groups(context: Context): Map<String, List<LLMModel>>? {
+        cached?.let { return it }
+        return synchronized(this) {
+            cached ?: load(context)?.also { cached = it }
+        }
+    }
+
+    private fun load(context: Context): Map<String, List<LLMModel>>? {
+        val payload = try {
+            context.assets.open(ASSET_NAME).use { stream ->
+                Gson().fromJson(InputStreamReader(stream, Charsets.UTF_8), Payload::class.java)
+            }
+        } catch (e: IOException) {
+            return null
+        }
+        if (payload == null || payload.formatVersion != FORMAT_VERSION) return null
+        val resolved = HashMap<String, String>()
+        fun expand(value: String): String {
+            if (!value.contains("\${")) return value
+            var out = value
+            for ((expr, provider) in templateValues) {
+                val placeholder = "\${$expr}"
+                if (out.contains(placeholder)) {
+                    out = out.replace(placeholder, resolved.getOrPut(expr, provider))
+                }
+            }
+            return out
+        }
+        return payload.groups.mapValues { (_, entries) ->
+            entries.map { entry ->
+                val size = entry.sizeBytesWhen?.let { switch ->
+                    val key = templateValues[switch.subject]?.let { resolved.getOrPut(switch.subject, it) }
+                    switch.cases[key] ?: switch.cases["else"] ?: 0L
+                } ?: entry.sizeBytes
+                LLMModel(
+                    name = expand(entry.name),
+                    description = expand(entry.description),
+                    url = expand(entry.url),
+                    category = entry.category,
+                    sizeBytes = size,
+                    source = entry.source,
+                    supportsVision = entry.supportsVision,
+                    supportsAudio = entry.supportsAudio,
+                    supportsThinking = entry.supportsThinking,
+                    supportsGpu = entry.supportsGpu,
+                    supportsMtp = entry.supportsMtp,
+                    requirements = ModelRequirements(
+                        minRamGB = entry.requirements.minRamGB,
+                        recommendedRamGB = entry.requirements.recommendedRamGB
+                    ),
+                    contextWindowSize = entry.contextWindowSize,
+                    modelFormat = entry.modelFormat,
+                    additionalFiles = entry.additionalFiles.map(::expand)
+                )
+            }
+        }
+    }
+}
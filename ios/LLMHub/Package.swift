@@ -44,6 +44,7 @@ let package = Package(
             ],
             resources: [
                 .process("Icon.png"),
+                .process("model_catalog.json"),
                 .process("en.lproj"),
                 .process("ar.lproj"),
                 .process("da.lproj"),
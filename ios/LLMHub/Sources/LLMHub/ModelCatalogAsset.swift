@@ -0,0 +1,40 @@
+import Foundation
+
+/// Lazily decoded copy of the model catalog compiled by
+/// `python3 -m scripts.catalog asset` into `model_catalog.json`.
+///
+/// The file is memory-mapped and decoded on first access. `nil` means the
+/// resource is not bundled or was written by an incompatible catalog tool;
+/// callers should then fall back to `ModelData.models`.
+public enum ModelCatalogAsset {
+    public static let formatVersion = 1
+
+    private struct Payload: Decodable {
+        let formatVersion: Int
+        let sourceSha256: String
+        let groups: [String: [AIModel]]
+    }
+
+    private static var bundle: Bundle {
+        #if SWIFT_PACKAGE
+        return Bundle.module
+        #else
+        return Bundle.main
+        #endif
+    }
+
+    private static let payload: Payload? = {
+        guard let url = bundle.url(forResource: "model_catalog", withExtension: "json"),
+              let data = try? Data(contentsOf: url, options: .alwaysMapped),
+              let payload = try? JSONDecoder().decode(Payload.self, from: data),
+              payload.formatVersion == formatVersion else {
+            return nil
+        }
+        return payload
+    }()
+
+    /// SHA-256 of the ModelData.swift the asset was compiled from.
+    public static var sourceSha256: String? { payload?.sourceSha256 }
+
+    public static var models: [AIModel]? { payload?.groups["models"] }
+}
@@ -5,8 +5,8 @@
 #
 #   - generate_swift_convenience.py
 #   - generate_kotlin_convenience.py
-#   - generate_dart_convenience.py   (forthcoming)
-#   - generate_ts_convenience.py     (forthcoming)
+#   - generate_dart_convenience.py
+#   - generate_ts_convenience.py
 #
 # All four generators consume `idl/rac_options.proto` annotations off a
 # `FileDescriptorSet` produced by `protoc --include_imports` and emit
@@ -20,16 +20,15 @@
 
 from __future__ import annotations
 
-import os
 import struct
-import subprocess
-import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Iterator, Optional
+from typing import Iterator, Optional
 
 from google.protobuf import descriptor_pb2
 
+from _descriptor_cache import descriptor_set_bytes
+
 # ---------------------------------------------------------------------------
 # RunAnywhere proto-annotation field numbers (mirror idl/rac_options.proto).
 # ---------------------------------------------------------------------------
@@ -116,138 +115,179 @@ def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
             raise ValueError("varint too long")
 
 
-def _scan_fields(buf: bytes) -> Iterable[tuple[int, int, bytes | int]]:
-    """Yield (field_number, wire_type, payload) tuples. Wire types we don't
-    decode (1 / 5) advance the cursor without yielding so the scan stays
-    aligned for later fields the caller might still want."""
+def _to_int32(v: int) -> int:
+    v &= 0xFFFFFFFF
+    return v - 0x100000000 if v & 0x80000000 else v
+
+
+# ---------------------------------------------------------------------------
+# Annotation extraction. The protobuf python runtime can't always resolve
+# our extensions through the typed accessors (no compiled extension
+# registry on the codegen path), so we go through the raw serialized form.
+#
+# Every options message is serialized and scanned exactly once: one pass
+# decodes all rac_* extensions into an `Annotations` record, and
+# `build_annotation_index` does that for every field and enum value in the
+# RunAnywhere schemas up front. Emitters look records up by name instead of
+# re-serializing options per annotation.
+# ---------------------------------------------------------------------------
+
+# field number -> (Annotations slot, expected wire type)
+_ANNOTATION_SLOTS: dict[int, tuple[str, int]] = {
+    RAC_DEFAULT_FIELD_NUM:       ("default",       2),
+    RAC_REQUIRED_FIELD_NUM:      ("required",      0),
+    RAC_MIN_FIELD_NUM:           ("min",           0),
+    RAC_MAX_FIELD_NUM:           ("max",           0),
+    RAC_MIN_FLOAT_FIELD_NUM:     ("min_float",     1),
+    RAC_MAX_FLOAT_FIELD_NUM:     ("max_float",     1),
+    RAC_DISPLAY_NAME_FIELD_NUM:  ("display_name",  2),
+    RAC_ANALYTICS_KEY_FIELD_NUM: ("analytics_key", 2),
+    RAC_WIRE_STRING_FIELD_NUM:   ("wire_string",   2),
+}
+
+
+class Annotations:
+    """Decoded `rac_*` options of one field or enum value. A slot is None
+    when the annotation is absent."""
+
+    __slots__ = (
+        "default", "required", "min", "max", "min_float", "max_float",
+        "display_name", "analytics_key", "wire_string",
+    )
+
+    def __init__(self) -> None:
+        self.default:       Optional[str]   = None
+        self.required:      Optional[bool]  = None
+        self.min:           Optional[int]   = None
+        self.max:           Optional[int]   = None
+        self.min_float:     Optional[float] = None
+        self.max_float:     Optional[float] = None
+        self.display_name:  Optional[str]   = None
+        self.analytics_key: Optional[str]   = None
+        self.wire_string:   Optional[str]   = None
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state: tuple) -> None:
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def by_field_num(self, field_num: int):
+        """Value for the annotation with extension number `field_num`."""
+        return getattr(self, _ANNOTATION_SLOTS[field_num][0])
+
+
+NO_ANNOTATIONS = Annotations()
+
+
+def decode_annotations(buf: bytes) -> Annotations:
+    """Decode every rac_* extension in a serialized options message in one
+    pass. The first occurrence of each annotation wins; other fields and
+    unexpected wire types are skipped."""
+    out = Annotations()
     pos = 0
-    while pos < len(buf):
+    n = len(buf)
+    while pos < n:
         tag, pos = _read_varint(buf, pos)
         wt = tag & 0x07
-        fn = tag >> 3
+        slot = _ANNOTATION_SLOTS.get(tag >> 3)
         if wt == 0:
             val, pos = _read_varint(buf, pos)
-            yield fn, wt, val
+            if slot is not None and slot[1] == 0 and getattr(out, slot[0]) is None:
+                setattr(out, slot[0], bool(val) if slot[0] == "required" else _to_int32(val))
         elif wt == 2:
             length, pos = _read_varint(buf, pos)
-            payload = buf[pos:pos + length]
+            if slot is not None and slot[1] == 2 and getattr(out, slot[0]) is None:
+                setattr(out, slot[0], buf[pos:pos + length].decode("utf-8"))
             pos += length
-            yield fn, wt, payload
         elif wt == 1:
+            if slot is not None and slot[1] == 1 and getattr(out, slot[0]) is None:
+                setattr(out, slot[0], struct.unpack_from("<d", buf, pos)[0])
             pos += 8
         elif wt == 5:
             pos += 4
         else:
             # SGROUP / EGROUP — not used in proto3, skip silently.
             pass
+    return out
 
 
-def _decode_string_field(buf: bytes, field_num: int) -> Optional[str]:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 2:
-            return payload.decode("utf-8")
-    return None
+def annotations_of(desc) -> Annotations:
+    """Decode the rac_* options of a single field / enum-value descriptor."""
+    if not desc.HasField("options"):
+        return NO_ANNOTATIONS
+    return decode_annotations(desc.options.SerializeToString())
 
 
-def _decode_bool_field(buf: bytes, field_num: int) -> Optional[bool]:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 0:
-            return bool(payload)
-    return None
+class AnnotationIndex:
+    """rac_* annotations of every field and enum value in the RunAnywhere
+    schemas, keyed by the owning type's package-relative name
+    (``"STTOptions"``, ``"Outer.Inner"``) and the member name."""
 
+    __slots__ = ("_fields", "_values")
 
-def _decode_int32_field(buf: bytes, field_num: int) -> Optional[int]:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 0:
-            v = int(payload) & 0xFFFFFFFF
-            if v & 0x80000000:
-                v -= 0x100000000
-            return v
-    return None
+    def __init__(self) -> None:
+        self._fields: dict[tuple[str, str], Annotations] = {}
+        self._values: dict[tuple[str, str], Annotations] = {}
 
+    def __getstate__(self) -> tuple:
+        return self._fields, self._values
 
-def _decode_double_field(buf: bytes, field_num: int) -> Optional[float]:
-    """Read a proto3 double (wire type 1 = fixed64). The shared scanner
-    skips 64-bit payloads, so this walks the buffer with a richer loop."""
-    pos = 0
-    while pos < len(buf):
-        tag, pos = _read_varint(buf, pos)
-        wt = tag & 0x07
-        fn = tag >> 3
-        if wt == 1:
-            if fn == field_num:
-                return struct.unpack("<d", buf[pos:pos + 8])[0]
-            pos += 8
-        elif wt == 0:
-            _, pos = _read_varint(buf, pos)
-        elif wt == 2:
-            length, pos = _read_varint(buf, pos)
-            pos += length
-        elif wt == 5:
-            pos += 4
-        else:
-            pass
-    return None
+    def __setstate__(self, state: tuple) -> None:
+        self._fields, self._values = state
 
+    def field(self, message_name: str, field_name: str) -> Annotations:
+        return self._fields.get((message_name, field_name), NO_ANNOTATIONS)
 
-# ---------------------------------------------------------------------------
-# Annotation extraction. The protobuf python runtime can't always resolve
-# our extensions through the typed accessors (no compiled extension
-# registry on the codegen path), so we go through the raw serialized form.
-# ---------------------------------------------------------------------------
+    def value(self, enum_name: str, value_name: str) -> Annotations:
+        return self._values.get((enum_name, value_name), NO_ANNOTATIONS)
 
-def get_string_option(opts, field_num: int) -> Optional[str]:
-    return _decode_string_field(opts.SerializeToString(), field_num)
+    def __len__(self) -> int:
+        return len(self._fields) + len(self._values)
 
 
-def get_bool_option(opts, field_num: int) -> Optional[bool]:
-    return _decode_bool_field(opts.SerializeToString(), field_num)
+def build_annotation_index(fds: descriptor_pb2.FileDescriptorSet) -> AnnotationIndex:
+    """Single pass over `fds`: serialize and decode the options of every
+    annotated field / enum value (top-level and nested) exactly once."""
+    index = AnnotationIndex()
 
+    def add_enum(scope: str, enum_desc: descriptor_pb2.EnumDescriptorProto) -> None:
+        for value in enum_desc.value:
+            if value.HasField("options"):
+                index._values[(scope, value.name)] = annotations_of(value)
 
-def get_int32_option(opts, field_num: int) -> Optional[int]:
-    return _decode_int32_field(opts.SerializeToString(), field_num)
+    def add_message(scope: str, msg_desc: descriptor_pb2.DescriptorProto) -> None:
+        for field in msg_desc.field:
+            if field.HasField("options"):
+                index._fields[(scope, field.name)] = annotations_of(field)
+        for nested in msg_desc.enum_type:
+            add_enum(f"{scope}.{nested.name}", nested)
+        for nested in msg_desc.nested_type:
+            add_message(f"{scope}.{nested.name}", nested)
 
-
-def get_double_option(opts, field_num: int) -> Optional[float]:
-    return _decode_double_field(opts.SerializeToString(), field_num)
+    for file_desc in iter_runanywhere_files(fds):
+        for enum_desc in file_desc.enum_type:
+            add_enum(enum_desc.name, enum_desc)
+        for msg_desc in file_desc.message_type:
+            add_message(msg_desc.name, msg_desc)
+    return index
 
 
 # ---------------------------------------------------------------------------
 # Descriptor build & walk.
 # ---------------------------------------------------------------------------
 
-def build_descriptor_set(proto_dir: Path, proto_files: list[Path]) -> Path:
-    """Invoke protoc to produce a FileDescriptorSet covering all idl/*.proto.
-    Caller is responsible for unlinking the returned path."""
-    fd, set_path = tempfile.mkstemp(prefix="rac-fds-", suffix=".pb")
-    os.close(fd)
-    cmd = [
-        "protoc",
-        f"--proto_path={proto_dir}",
-        f"--descriptor_set_out={set_path}",
-        "--include_imports",
-        *[str(p) for p in proto_files],
-    ]
-    subprocess.run(cmd, check=True)
-    return Path(set_path)
-
-
 def load_file_descriptor_set(proto_dir: Path) -> Optional[descriptor_pb2.FileDescriptorSet]:
-    """Build the descriptor set for every `*.proto` in `proto_dir` and return
-    the parsed `FileDescriptorSet`, or `None` when the directory is empty."""
+    """Return the parsed `FileDescriptorSet` for every `*.proto` in
+    `proto_dir` (served from the descriptor cache when warm), or `None`
+    when the directory is empty."""
     proto_files = sorted(proto_dir.glob("*.proto"))
     if not proto_files:
         return None
-    set_path = build_descriptor_set(proto_dir, proto_files)
-    try:
-        fds = descriptor_pb2.FileDescriptorSet()
-        fds.ParseFromString(set_path.read_bytes())
-        return fds
-    finally:
-        try:
-            set_path.unlink()
-        except OSError:
-            pass
+    fds = descriptor_pb2.FileDescriptorSet()
+    fds.ParseFromString(descriptor_set_bytes(proto_dir, proto_files))
+    return fds
 
 
 def iter_runanywhere_files(
@@ -406,6 +446,31 @@ def ts_proto_function_prefix(symbol: str) -> str:
     return symbol[0].lower() + symbol[1:]
 
 
+# ---------------------------------------------------------------------------
+# Reverse wire-string lookup. `fromWireString` runs on SDK event decoding,
+# analytics keys and config parsing, so the emitters no longer lowercase the
+# input (one String allocation per call): they switch on its length and
+# compare each same-length candidate with an allocation-free ASCII
+# case-insensitive match against the pre-lowered annotation value.
+# ---------------------------------------------------------------------------
+
+def wire_cases_by_length(
+    cases: list[tuple[str, str]],
+) -> Optional[list[tuple[int, list[tuple[str, str]]]]]:
+    """Group reverse-lookup `cases` — (case name, lowercased wire string),
+    in declaration order — into (length, cases) buckets, shortest first.
+    Within a bucket declaration order is kept, so the first of two equal
+    strings still wins. Returns None when a wire string is not ASCII (ASCII
+    folding would no longer match `lowercase()`); callers then keep the
+    lowercasing switch."""
+    if not all(value.isascii() for _, value in cases):
+        return None
+    buckets: dict[int, list[tuple[str, str]]] = {}
+    for name, value in cases:
+        buckets.setdefault(len(value), []).append((name, value))
+    return sorted(buckets.items())
+
+
 # ---------------------------------------------------------------------------
 # Default-literal translation. Each language passes a `LangProfile` that
 # captures its dialect-specific suffixes/wrappers. Enum cases are looked
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+#
+# Content-addressed cache for the `protoc --include_imports` FileDescriptorSet
+# every convenience generator consumes.
+#
+# Before this cache each of generate_{swift,kotlin,dart,ts}_convenience.py
+# shelled out to protoc over all of idl/*.proto on every run. The set is a
+# pure function of:
+#
+#   - the bytes of every input .proto (and its name relative to the
+#     include path),
+#   - the include path itself,
+#   - the protoc release (which also pins the bundled
+#     google/protobuf/descriptor.proto that `--include_imports` pulls in).
+#
+# So the serialized set is stored under the SHA-256 of exactly those inputs
+# and reused until one of them changes. A full generate_all.sh run with
+# unchanged protos builds the set at most once (zero times on a warm cache).
+#
+# Cache location: $RAC_DESCRIPTOR_CACHE_DIR, else
+# $XDG_CACHE_HOME/runanywhere-idl/descriptors (~/.cache/... by default). It
+# lives outside the repo so ci-drift-check.sh never sees it as an untracked
+# file. Setting RAC_DESCRIPTOR_CACHE=0 bypasses the cache entirely.
+#
+# Run directly to warm the cache and print the cached set's path:
+#
+#   python3 idl/codegen/_descriptor_cache.py [PROTO_DIR]
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from _output import atomic_write
+
+# Bump when the cache layout or key derivation changes.
+CACHE_FORMAT = 1
+
+# Entries kept after a store; older ones (by mtime) are pruned.
+MAX_ENTRIES = 32
+
+_VERSION_FILE = "protoc-versions.json"
+
+
+def cache_dir() -> Path:
+    override = os.environ.get("RAC_DESCRIPTOR_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "runanywhere-idl" / "descriptors"
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("RAC_DESCRIPTOR_CACHE", "1") not in ("0", "false", "no")
+
+
+# ---------------------------------------------------------------------------
+# Key derivation.
+# ---------------------------------------------------------------------------
+
+def _protoc_path() -> str:
+    path = shutil.which("protoc")
+    if path is None:
+        raise FileNotFoundError("protoc not found on PATH")
+    return os.path.realpath(path)
+
+
+def protoc_version(directory: Optional[Path] = None) -> str:
+    """`protoc --version`, memoised per binary (path, size, mtime) so a warm
+    run does not have to start protoc just to learn its version."""
+    binary = _protoc_path()
+    st = os.stat(binary)
+    stamp = f"{binary}:{st.st_size}:{st.st_mtime_ns}"
+    memo_path = (directory or cache_dir()) / _VERSION_FILE
+    try:
+        memo = json.loads(memo_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        memo = {}
+    version = memo.get(stamp)
+    if version is None:
+        version = subprocess.run(
+            [binary, "--version"], check=True, capture_output=True, text=True,
+        ).stdout.strip()
+        memo[stamp] = version
+        try:
+            atomic_write(memo_path, json.dumps(memo, indent=1, sort_keys=True).encode("utf-8"))
+        except OSError:
+            pass
+    return version
+
+
+def descriptor_key(proto_dir: Path, proto_files: list[Path], version: str) -> str:
+    """SHA-256 over (format, protoc version, include path, each proto's
+    include-relative name and bytes). File order is normalised."""
+    proto_dir = Path(proto_dir).resolve()
+    h = hashlib.sha256()
+    h.update(f"rac-fds:{CACHE_FORMAT}\0{version}\0{proto_dir}\0".encode("utf-8"))
+    for path in sorted(Path(p).resolve() for p in proto_files):
+        data = path.read_bytes()
+        h.update(f"{path.relative_to(proto_dir)}\0{len(data)}\0".encode("utf-8"))
+        h.update(data)
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Store.
+# ---------------------------------------------------------------------------
+
+def _prune(directory: Path, keep: int = MAX_ENTRIES) -> None:
+    entries = sorted(directory.glob("*.pb"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in entries[keep:]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+
+def run_protoc(proto_dir: Path, proto_files: list[Path], out_path: Path) -> None:
+    cmd = [
+        "protoc",
+        f"--proto_path={proto_dir}",
+        f"--descriptor_set_out={out_path}",
+        "--include_imports",
+        *[str(p) for p in proto_files],
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def descriptor_set_bytes(proto_dir: Path, proto_files: list[Path]) -> bytes:
+    """Serialized FileDescriptorSet for `proto_files`, from the cache when
+    the key matches, otherwise built with protoc and stored."""
+    if not cache_enabled():
+        return _build_uncached(proto_dir, proto_files)
+    directory = cache_dir()
+    key = descriptor_key(proto_dir, proto_files, protoc_version(directory))
+    entry = directory / f"{key}.pb"
+    try:
+        data = entry.read_bytes()
+        os.utime(entry)  # keep recently used entries out of _prune's reach
+        return data
+    except OSError:
+        pass
+    data = _build_uncached(proto_dir, proto_files)
+    try:
+        atomic_write(entry, data)
+        _prune(directory)
+    except OSError as e:
+        print(f"warning: descriptor cache not writable ({e}); continuing uncached",
+              file=sys.stderr)
+    return data
+
+
+def _build_uncached(proto_dir: Path, proto_files: list[Path]) -> bytes:
+    fd, set_path = tempfile.mkstemp(prefix="rac-fds-", suffix=".pb")
+    os.close(fd)
+    try:
+        run_protoc(proto_dir, proto_files, Path(set_path))
+        return Path(set_path).read_bytes()
+    finally:
+        try:
+            os.unlink(set_path)
+        except OSError:
+            pass
+
+
+def cached_set_path(proto_dir: Path) -> Optional[Path]:
+    """Warm the cache for every `*.proto` in `proto_dir` and return the
+    entry's path (None when the directory has no protos or caching is off)."""
+    proto_files = sorted(Path(proto_dir).glob("*.proto"))
+    if not proto_files or not cache_enabled():
+        return None
+    descriptor_set_bytes(proto_dir, proto_files)
+    directory = cache_dir()
+    return directory / f"{descriptor_key(proto_dir, proto_files, protoc_version(directory))}.pb"
+
+
+def main(argv: list[str]) -> int:
+    proto_dir = Path(argv[1]) if len(argv) > 1 else Path(__file__).resolve().parent.parent
+    path = cached_set_path(proto_dir)
+    if path is None:
+        print(f"warning: no .proto files in {proto_dir} (or RAC_DESCRIPTOR_CACHE=0)", file=sys.stderr)
+        return 0
+    print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
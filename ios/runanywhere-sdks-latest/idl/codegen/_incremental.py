@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+#
+# Import-graph driven incremental codegen.
+#
+# Every per-proto output (X.pb.swift, X.ts, X.pb.dart, X.pb.h/.cc,
+# X_convenience.ts) is a function of X.proto, the protos X imports
+# (transitively: type names and enum constants resolve through them) and the
+# generator that produced it. So each proto gets a *closure hash* over its
+# own bytes and the bytes of every transitive import, read off the
+# FileDescriptorSet's `dependency` lists.
+#
+# A stamp file records, per codegen target (swift, kotlin, dart, ts, cpp,
+# convenience-<lang>), the closure hashes of its last successful run plus a
+# fingerprint of the target's own inputs (generator scripts, pinned plugin
+# versions, protoc release). `plan` compares the current hashes with the
+# stamp and returns the protos whose outputs are out of date:
+#
+#   - nothing, when no closure changed;
+#   - the changed closures, for per-proto targets;
+#   - every proto ("full"), when the fingerprint changed, there is no stamp
+#     yet, the target is `--whole` (one aggregated output, or a generator
+#     that pre-cleans its whole output tree), or a proto was added/removed
+#     — so stale-output cleanup (`_clean_stale_outputs`, Wire's pre-clean)
+#     runs with exactly the semantics of a full regeneration.
+#
+# `plan` parks the hashes it computed as the target's pending entry;
+# `record` promotes them once the target's codegen succeeded, so an edit
+# made while codegen runs is picked up next time rather than lost.
+#
+# Stamps live beside the descriptor cache (outside the repo, so
+# ci-drift-check.sh never sees them), one file per idl/ checkout. CI stays a
+# full regeneration: generate_all.sh --full / RAC_CODEGEN_FULL=1.
+#
+# Shell usage (generate_all.sh):
+#
+#   python3 _incremental.py plan swift --input generate_swift.sh   # dirty paths
+#   python3 _incremental.py record swift
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from google.protobuf import descriptor_pb2
+
+from _descriptor_cache import cache_dir, descriptor_set_bytes, protoc_version
+from _output import atomic_write
+
+# Bump when the stamp layout or the closure-hash derivation changes.
+STAMP_FORMAT = 1
+
+
+# ---------------------------------------------------------------------------
+# Import graph.
+# ---------------------------------------------------------------------------
+
+def import_graph(fds: descriptor_pb2.FileDescriptorSet) -> dict[str, list[str]]:
+    """proto name (include-relative, e.g. ``llm_options.proto``) -> direct
+    imports, for every file in the set (`--include_imports` makes it closed)."""
+    return {f.name: list(f.dependency) for f in fds.file}
+
+
+def transitive_imports(graph: dict[str, list[str]], name: str) -> set[str]:
+    seen: set[str] = set()
+    stack = list(graph.get(name, ()))
+    while stack:
+        dep = stack.pop()
+        if dep in seen:
+            continue
+        seen.add(dep)
+        stack.extend(graph.get(dep, ()))
+    return seen
+
+
+def closure_hashes(proto_dir: Path, fds: descriptor_pb2.FileDescriptorSet) -> dict[str, str]:
+    """Closure hash for every proto under `proto_dir`: SHA-256 over the
+    (name, content hash) of the file and each transitive import. Imports
+    outside `proto_dir` (google/protobuf/*) are hashed by their descriptor,
+    which the protoc release pins."""
+    proto_dir = Path(proto_dir)
+    graph = import_graph(fds)
+    own: dict[str, str] = {}
+    for f in fds.file:
+        path = proto_dir / f.name
+        data = path.read_bytes() if path.is_file() else f.SerializeToString()
+        own[f.name] = hashlib.sha256(data).hexdigest()
+
+    out: dict[str, str] = {}
+    for f in fds.file:
+        if not (proto_dir / f.name).is_file():
+            continue
+        h = hashlib.sha256()
+        for name in sorted({f.name} | transitive_imports(graph, f.name)):
+            h.update(f"{name}\0{own[name]}\n".encode("utf-8"))
+        out[f.name] = h.hexdigest()
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Stamps.
+# ---------------------------------------------------------------------------
+
+def stamp_path(proto_dir: Path) -> Path:
+    checkout = hashlib.sha256(str(Path(proto_dir).resolve()).encode("utf-8")).hexdigest()[:16]
+    return cache_dir().parent / "stamps" / f"{checkout}.json"
+
+
+def fingerprint(inputs: Iterable[Path], version: str) -> str:
+    """Hash of a target's own inputs: generator scripts, manifests, VERSIONS
+    pins, and the protoc release. Missing inputs hash as absent."""
+    h = hashlib.sha256(f"rac-stamp:{STAMP_FORMAT}\0{version}\0".encode("utf-8"))
+    for path in sorted(Path(p).resolve() for p in inputs):
+        h.update(f"{path.name}\0".encode("utf-8"))
+        h.update(path.read_bytes() if path.is_file() else b"<missing>")
+    return h.hexdigest()
+
+
+@dataclass
+class Plan:
+    target: str
+    dirty: list[str] = field(default_factory=list)  # proto names, sorted
+    full: bool = False
+    reason: str = ""
+
+
+class Stamps:
+    """Per-target closure hashes from the last successful run."""
+
+    def __init__(self, path: Path, data: Optional[dict] = None):
+        self.path = path
+        data = data if data and data.get("format") == STAMP_FORMAT else {}
+        self.targets: dict[str, dict] = data.get("targets", {})
+
+    @classmethod
+    def load(cls, path: Path) -> "Stamps":
+        try:
+            return cls(path, json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return cls(path)
+
+    def save(self) -> None:
+        data = {"format": STAMP_FORMAT, "targets": self.targets}
+        atomic_write(self.path, (json.dumps(data, indent=1, sort_keys=True) + "\n").encode("utf-8"))
+
+    def plan(self, target: str, hashes: dict[str, str], fp: str, whole: bool = False) -> Plan:
+        """Compare `hashes` (closure hashes) and the target fingerprint `fp`
+        with the last recorded run; park them as pending."""
+        entry = self.targets.setdefault(target, {})
+        entry["pending"] = {"fingerprint": fp, "hashes": hashes}
+        previous = entry.get("current")
+        result = Plan(target)
+        if previous is None:
+            result.reason = "no stamp"
+        elif previous["fingerprint"] != fp:
+            result.reason = "generator inputs changed"
+        elif set(previous["hashes"]) != set(hashes):
+            result.reason = "protos added or removed"
+        else:
+            changed = sorted(n for n, h in hashes.items() if previous["hashes"][n] != h)
+            if not changed:
+                return result
+            if not whole:
+                result.dirty = changed
+                return result
+            result.reason = f"{len(changed)} proto(s) changed"
+        result.full = True
+        result.dirty = sorted(hashes)
+        return result
+
+    def record(self, target: str) -> bool:
+        entry = self.targets.get(target, {})
+        pending = entry.pop("pending", None)
+        if pending is None:
+            return False
+        entry["current"] = pending
+        return True
+
+
+def load_state(proto_dir: Path) -> tuple[Optional[descriptor_pb2.FileDescriptorSet], Stamps]:
+    proto_files = sorted(Path(proto_dir).glob("*.proto"))
+    stamps = Stamps.load(stamp_path(proto_dir))
+    if not proto_files:
+        return None, stamps
+    fds = descriptor_pb2.FileDescriptorSet()
+    fds.ParseFromString(descriptor_set_bytes(proto_dir, proto_files))
+    return fds, stamps
+
+
+# ---------------------------------------------------------------------------
+# CLI (generate_all.sh).
+# ---------------------------------------------------------------------------
+
+def cmd_plan(args: argparse.Namespace) -> int:
+    proto_dir = Path(args.proto_dir)
+    fds, stamps = load_state(proto_dir)
+    if fds is None:
+        return 0
+    fp = fingerprint([Path(p) for p in args.input], protoc_version())
+    result = stamps.plan(args.target, closure_hashes(proto_dir, fds), fp, whole=args.whole)
+    stamps.save()
+    if result.full:
+        print(f"  {args.target}: full ({result.reason})", file=sys.stderr)
+    elif result.dirty:
+        print(f"  {args.target}: {len(result.dirty)} proto(s): {', '.join(result.dirty)}",
+              file=sys.stderr)
+    for name in result.dirty:
+        print(proto_dir / name)
+    return 0
+
+
+def cmd_record(args: argparse.Namespace) -> int:
+    stamps = Stamps.load(stamp_path(Path(args.proto_dir)))
+    if stamps.record(args.target):
+        stamps.save()
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    default_proto_dir = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description="Import-graph driven incremental codegen stamps.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("plan", help="print the protos whose TARGET outputs are out of date")
+    p.add_argument("target")
+    p.add_argument("--input", action="append", default=[],
+                   help="generator input folded into the target fingerprint (repeatable)")
+    p.add_argument("--whole", action="store_true",
+                   help="the target regenerates all protos or none")
+    p.add_argument("--proto-dir", default=str(default_proto_dir))
+    p.set_defaults(func=cmd_plan)
+
+    p = sub.add_parser("record", help="mark TARGET's last plan as generated")
+    p.add_argument("target")
+    p.add_argument("--proto-dir", default=str(default_proto_dir))
+    p.set_defaults(func=cmd_record)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
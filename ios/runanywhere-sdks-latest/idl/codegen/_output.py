@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+#
+# Write-if-changed output layer shared by every codegen script in this
+# directory (the four convenience emitters and
+# generate_swift_modality_abi.py).
+#
+# Gradle, Xcode, Flutter and tsc decide what to recompile from file mtimes.
+# Rewriting a generated file with identical bytes still bumps its mtime and
+# invalidates everything downstream of it, so a no-op regeneration used to
+# cost a full rebuild on every platform. `OutputWriter.write` compares the
+# new content with the file on disk (size first, then bytes) and only
+# replaces it — atomically, via a sibling temp file + os.replace — when the
+# content changed. Each writer counts written vs unchanged paths for the
+# generator's summary line.
+#
+# Inside `capture()` nothing reaches the disk: writes and removals land in a
+# VirtualTree instead, which drift_check.py compares with the committed
+# files. Generators therefore route every filesystem mutation (including
+# stale-output cleanup) through this module, and create no directories
+# themselves — atomic_write makes parents on demand.
+#
+# This is a library module; it has no CLI.
+
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+class VirtualTree:
+    """Outputs a generator run would have written / removed, by absolute
+    path. Populated only inside `capture()`."""
+
+    def __init__(self) -> None:
+        self.files: dict[Path, bytes] = {}
+        self.removed: set[Path] = set()
+
+
+_capture: Optional[VirtualTree] = None
+
+
+@contextlib.contextmanager
+def capture() -> Iterator[VirtualTree]:
+    """Redirect write_if_changed / remove_output into a fresh VirtualTree
+    for the duration of the block (per process; not thread-safe)."""
+    global _capture
+    previous, _capture = _capture, VirtualTree()
+    try:
+        yield _capture
+    finally:
+        _capture = previous
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace `path` with `data` in one rename; readers never see a
+    partial file, and a failed write leaves the old content in place.
+
+    mkstemp creates the temp file 0600, so it is given the replaced file's
+    mode, or 0666 & ~umask for a new file, before the rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_umask()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def content_matches(path: Path, data: bytes) -> bool:
+    """True when `path` exists and already holds exactly `data`."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write `data` to `path` unless it is already there; True if written
+    (or, under `capture()`, if it would have been)."""
+    if _capture is not None:
+        path = Path(path).absolute()
+        _capture.files[path] = data
+        _capture.removed.discard(path)
+        return not content_matches(path, data)
+    if content_matches(path, data):
+        return False
+    atomic_write(path, data)
+    return True
+
+
+def remove_output(path: Path) -> None:
+    """Delete a stale generated file (recorded instead under `capture()`)."""
+    if _capture is not None:
+        path = Path(path).absolute()
+        _capture.removed.add(path)
+        _capture.files.pop(path, None)
+        return
+    Path(path).unlink()
+
+
+class OutputWriter:
+    """Writes a generator's outputs and tallies written vs unchanged."""
+
+    def __init__(self) -> None:
+        self.written: list[Path] = []
+        self.unchanged: list[Path] = []
+
+    def write(self, path: Path, content: str) -> bool:
+        """Write `content` (UTF-8) to `path` if it differs; True if written."""
+        changed = write_if_changed(Path(path), content.encode("utf-8"))
+        (self.written if changed else self.unchanged).append(Path(path))
+        return changed
+
+    def summary(self) -> str:
+        return f"{len(self.written)} written, {len(self.unchanged)} unchanged"
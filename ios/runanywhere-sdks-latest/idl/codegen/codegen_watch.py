@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+#
+# Long-running codegen daemon for IDL work (generate_all.sh --watch).
+#
+# Running generate_all.sh by hand after every edit pays for a cold protoc,
+# a handful of Python start-ups and every language plugin each time. This
+# daemon pays those once: it keeps the parsed FileDescriptorSet, the
+# AnnotationIndex, the per-proto closure hashes, the loaded emitter modules
+# and the parsed swift-modality-abi.yaml in memory, watches idl/*.proto and
+# the manifest, and after each (debounced) burst of edits regenerates only
+# what the edit affects:
+#
+#   - a .proto change rebuilds the set (through the descriptor cache),
+#     diffs closure hashes (_incremental.py) to find the dirty protos, reruns
+#     the four convenience emitters in-process (TS for the dirty protos
+#     only), then the protoc-plugin scripts over RAC_PROTO_FILES=<dirty>,
+#     concurrently. Kotlin (Wire pre-cleans its tree) and the stream
+#     wrappers rerun whole. A proto added or removed reruns everything, so
+#     stale-output cleanup keeps full-run semantics.
+#   - a manifest change re-renders the ModalityProtoABI+<Modality>.swift
+#     files (only the modalities it touched get new bytes).
+#
+# Every write goes through the write-if-changed layer (_output.py), so an
+# edit that does not change generated code touches no output mtimes. An
+# edit that fails anywhere (protoc, a manifest that does not render, an
+# emitter that raises, a file that vanished mid-read) is reported and the
+# last good state is kept, so the next edit is diffed against it.
+# Content, not mtime, decides what changed: saving a file unmodified is a
+# no-op.
+#
+# Changes are picked up with inotify on Linux (via ctypes; no extra
+# dependency) and by polling mtimes elsewhere or with --poll. Generator
+# scripts are not watched — restart the daemon after editing them. The
+# daemon does not update the generate_all.sh stamps; the next incremental
+# generate_all.sh reruns the protos edited meanwhile once.
+#
+# Usage:
+#   idl/codegen/generate_all.sh --watch [--skip-dart]
+#   python3 idl/codegen/codegen_watch.py [--no-plugins] [--poll] [--debounce MS]
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import importlib
+import io
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from google.protobuf import descriptor_pb2
+
+from _convenience_common import build_annotation_index
+from _descriptor_cache import descriptor_set_bytes
+from _incremental import closure_hashes
+from generate_convenience import EMITTERS, PER_PROTO
+
+_HERE = Path(__file__).resolve().parent
+REPO_ROOT = _HERE.parent.parent
+PROTO_DIR = REPO_ROOT / "idl"
+MANIFEST_PATH = _HERE / "swift-modality-abi.yaml"
+
+
+@dataclass(frozen=True)
+class PluginTarget:
+    """A per-language protoc-plugin script rerun after proto edits."""
+    name: str
+    script: str
+    whole: bool = False  # rerun over every proto, not just the dirty ones
+
+
+# Same order and granularity as generate_all.sh.
+PLUGIN_TARGETS: list[PluginTarget] = [
+    PluginTarget("swift",   "generate_swift.sh"),
+    PluginTarget("kotlin",  "generate_kotlin.sh", whole=True),
+    PluginTarget("dart",    "generate_dart.sh"),
+    PluginTarget("ts",      "generate_ts.sh"),
+    PluginTarget("cpp",     "generate_cpp.sh"),
+    PluginTarget("streams", "generate_streams.sh", whole=True),
+]
+
+
+# ---------------------------------------------------------------------------
+# File watching.
+# ---------------------------------------------------------------------------
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (then `len` name bytes)
+
+
+def is_input(path: Path) -> bool:
+    return (path.parent == PROTO_DIR and path.suffix == ".proto") or path == MANIFEST_PATH
+
+
+class InotifyWatcher:
+    """Directory watches on idl/ and idl/codegen/ (editors save by rename,
+    so watching the files themselves would lose track of them)."""
+
+    def __init__(self, dirs: list[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify unavailable")
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        for directory in dirs:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch {directory} failed")
+            self._dirs[wd] = directory
+
+    def read(self, timeout: Optional[float]) -> set[Path]:
+        """Inputs touched within `timeout` seconds (None: block until one is)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._drain()
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def _drain(self) -> set[Path]:
+        changed: set[Path] = set()
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buf):
+            wd, _, _, length = _EVENT.unpack_from(buf, offset)
+            offset += _EVENT.size
+            name = buf[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._dirs.get(wd)
+            if directory is not None and name:
+                path = directory / os.fsdecode(name)
+                if is_input(path):
+                    changed.add(path)
+        return changed
+
+
+class PollingWatcher:
+    """mtime/size snapshots of the inputs every `interval` seconds."""
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    @staticmethod
+    def _scan() -> dict[Path, tuple[int, int]]:
+        out: dict[Path, tuple[int, int]] = {}
+        for path in [*PROTO_DIR.glob("*.proto"), MANIFEST_PATH]:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            out[path] = (st.st_mtime_ns, st.st_size)
+        return out
+
+    def read(self, timeout: Optional[float]) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {p for p in current.keys() | self._snapshot.keys()
+                       if current.get(p) != self._snapshot.get(p)}
+            self._snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            step = self._interval
+            if deadline is not None:
+                step = min(step, max(0.0, deadline - time.monotonic()))
+            time.sleep(step)
+
+
+def next_batch(watcher, debounce: float) -> set[Path]:
+    """Block for the first change, then keep collecting until the inputs
+    have been quiet for `debounce` seconds (an editor's save, a git
+    checkout or a formatter run arrives as a burst of events)."""
+    changed = watcher.read(None)
+    while True:
+        more = watcher.read(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+# ---------------------------------------------------------------------------
+# Warm state.
+# ---------------------------------------------------------------------------
+
+class WarmState:
+    """Everything a regeneration needs, kept across edits."""
+
+    def __init__(self, langs: list[str]):
+        self.langs = langs
+        self.emitters = {lang: importlib.import_module(EMITTERS[lang]) for lang in langs}
+        self.modality_abi = importlib.import_module("generate_swift_modality_abi")
+        self.sources: dict[Path, bytes] = {}
+        self.fds: Optional[descriptor_pb2.FileDescriptorSet] = None
+        self.index = None
+        self.hashes: dict[str, str] = {}
+        self.manifest: Optional[bytes] = None
+        self.manifest_files: dict[Path, str] = {}
+        self._last_good: Optional[tuple] = None
+
+    def reload_protos(self) -> Optional[list[str]]:
+        """Re-read idl/*.proto. Returns the dirty proto names (closure hash
+        changed; every proto when one was added or removed), [] when no
+        content changed, or None when the edit could not be loaded (the
+        error is printed and the previous state is kept)."""
+        paths = sorted(PROTO_DIR.glob("*.proto"))
+        try:
+            sources = {p: p.read_bytes() for p in paths}
+        except OSError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return None
+        if sources == self.sources:
+            return []
+        try:
+            data = descriptor_set_bytes(PROTO_DIR, paths)
+        except subprocess.CalledProcessError:
+            return None  # protoc already printed the error
+        try:
+            fds = descriptor_pb2.FileDescriptorSet()
+            fds.ParseFromString(data)
+            hashes = closure_hashes(PROTO_DIR, fds)
+            index = build_annotation_index(fds)
+        except Exception as e:
+            print(f"error: {type(e).__name__}: {e}", file=sys.stderr)
+            return None
+        if set(hashes) != set(self.hashes):
+            dirty = sorted(hashes)
+        else:
+            dirty = sorted(n for n, h in hashes.items() if self.hashes[n] != h)
+        self._last_good = (self.sources, self.fds, self.hashes, self.index)
+        self.sources, self.fds, self.hashes, self.index = sources, fds, hashes, index
+        return dirty
+
+    def revert_protos(self) -> None:
+        """Go back to the set before the last reload_protos(), so the next
+        edit regenerates the protos whose outputs failed this time."""
+        if self._last_good is not None:
+            self.sources, self.fds, self.hashes, self.index = self._last_good
+            self._last_good = None
+
+    def reload_manifest(self) -> Optional[bool]:
+        """Re-read and render the modality ABI manifest. Returns True when it
+        changed and rendered, False when its content is unchanged, or None
+        when it could not be read, parsed or rendered (a bad coalesce:
+        limit, a method without swift_name, an empty file); the error is
+        printed and the previous render is kept."""
+        try:
+            raw = MANIFEST_PATH.read_bytes()
+        except OSError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return None
+        if raw == self.manifest:
+            return False
+        try:
+            data = self.modality_abi.yaml.safe_load(raw)
+        except self.modality_abi.yaml.YAMLError as e:
+            print(f"error: {MANIFEST_PATH.name}: {e}", file=sys.stderr)
+            return None
+        if not isinstance(data, dict):
+            print(f"error: {MANIFEST_PATH.name}: expected a mapping at the top level", file=sys.stderr)
+            return None
+        try:
+            files, _ = self.modality_abi.render(data)
+        except Exception as e:
+            print(f"error: {MANIFEST_PATH.name}: {type(e).__name__}: {e}", file=sys.stderr)
+            return None
+        self.manifest, self.manifest_files = raw, files
+        return True
+
+    def run_convenience(self, only: Optional[set[str]]) -> Optional[int]:
+        """Every emitter against the in-memory set; `only` narrows the
+        per-proto emitters (None: all protos). Returns the worst exit code,
+        or None when an emitter raised (the error is printed)."""
+        worst = 0
+        for lang, module in self.emitters.items():
+            log = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(log):
+                    if only is not None and lang in PER_PROTO:
+                        code = module.generate(self.fds, REPO_ROOT, self.index, only=only)
+                    else:
+                        code = module.generate(self.fds, REPO_ROOT, self.index)
+            except Exception as e:
+                sys.stdout.write(log.getvalue())
+                print(f"error: {lang} convenience emitter: {type(e).__name__}: {e}", file=sys.stderr)
+                return None
+            if code:
+                sys.stdout.write(log.getvalue())
+                print(f"error: {lang} convenience emitter exited {code}", file=sys.stderr)
+            worst = max(worst, code)
+        return worst
+
+    def run_modality_abi(self) -> str:
+        """Write the per-modality Swift files rendered by reload_manifest();
+        returns the write summary."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            out = self.modality_abi.write_outputs(self.manifest_files)
+        return out.summary()
+
+
+# ---------------------------------------------------------------------------
+# Protoc plugins.
+# ---------------------------------------------------------------------------
+
+def _run_plugin(target: PluginTarget, proto_files: list[str]) -> tuple[PluginTarget, int, str]:
+    env = dict(os.environ)
+    env["RAC_PROTO_FILES"] = "\n".join(proto_files)
+    env["RAC_CONVENIENCE_DEFERRED"] = "1"
+    try:
+        proc = subprocess.run(
+            [str(_HERE / target.script)], env=env, cwd=REPO_ROOT,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+    except OSError as e:
+        return target, 126, f"{e}\n"
+    return target, proc.returncode, proc.stdout
+
+
+def run_plugins(targets: list[PluginTarget], dirty: list[str]) -> list[PluginTarget]:
+    """Run `targets` concurrently over the dirty protos; returns the targets
+    whose toolchain is missing (exit 127), which the caller stops running."""
+    every = [str(p) for p in sorted(PROTO_DIR.glob("*.proto"))]
+    subset = [str(PROTO_DIR / name) for name in dirty]
+    missing: list[PluginTarget] = []
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        futures = [pool.submit(_run_plugin, t, every if t.whole else subset) for t in targets]
+        for future in futures:
+            target, code, output = future.result()
+            if code == 127:
+                print(f"  {target.name}: toolchain missing; not rerunning it", file=sys.stderr)
+                missing.append(target)
+            elif code:
+                sys.stdout.write(output)
+                print(f"error: {target.script} exited {code}", file=sys.stderr)
+    return missing
+
+
+# ---------------------------------------------------------------------------
+# Main loop.
+# ---------------------------------------------------------------------------
+
+def _ms(start: float) -> str:
+    return f"{(time.perf_counter() - start) * 1000:.0f} ms"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Watch idl/*.proto and swift-modality-abi.yaml and regenerate on change.")
+    parser.add_argument("--skip-dart", action="store_true",
+                        help="leave out the Dart plugin and convenience emitter")
+    parser.add_argument("--no-plugins", action="store_true",
+                        help="rerun only the in-process generators (convenience, modality ABI)")
+    parser.add_argument("--poll", action="store_true",
+                        help="poll mtimes instead of using inotify")
+    parser.add_argument("--debounce", type=int, default=150, metavar="MS",
+                        help="quiet period before regenerating (default: %(default)s)")
+    parser.add_argument("--interval", type=int, default=250, metavar="MS",
+                        help="polling interval (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    langs = [lang for lang in EMITTERS if not (args.skip_dart and lang == "dart")]
+    plugins = [] if args.no_plugins else [
+        t for t in PLUGIN_TARGETS if not (args.skip_dart and t.name == "dart")
+    ]
+
+    start = time.perf_counter()
+    state = WarmState(langs)
+    if state.reload_protos() is None or not state.reload_manifest():
+        print("error: initial load failed; fix the error above and restart", file=sys.stderr)
+        return 1
+    if state.run_convenience(None) is None:
+        print("error: initial generation failed; fix the error above and restart", file=sys.stderr)
+        return 1
+    state.run_modality_abi()
+    print(f"▶ warm in {_ms(start)}: {len(state.hashes)} protos, "
+          f"{len(langs)} convenience emitter(s), "
+          f"plugins: {' '.join(t.name for t in plugins) or 'none'}")
+
+    watcher = None
+    if not args.poll:
+        try:
+            watcher = InotifyWatcher([PROTO_DIR, _HERE])
+        except (OSError, AttributeError) as e:
+            print(f"  inotify unavailable ({e}); polling", file=sys.stderr)
+    if watcher is None:
+        watcher = PollingWatcher(args.interval / 1000)
+    print(f"▶ watching {PROTO_DIR.relative_to(REPO_ROOT)}/*.proto and "
+          f"{MANIFEST_PATH.name} ({type(watcher).__name__}); Ctrl-C to stop")
+
+    try:
+        while True:
+            changed = next_batch(watcher, args.debounce / 1000)
+            start = time.perf_counter()
+            names = ", ".join(sorted(p.name for p in changed))
+            steps: list[str] = []
+            failed = False
+
+            if MANIFEST_PATH in changed:
+                t = time.perf_counter()
+                loaded = state.reload_manifest()
+                if loaded:
+                    try:
+                        steps.append(f"modality ABI {state.run_modality_abi()} ({_ms(t)})")
+                    except OSError as e:
+                        print(f"error: {e}", file=sys.stderr)
+                        state.manifest = None  # rewrite on the next save
+                        loaded = None
+                if loaded is None:
+                    print(f"✗ {MANIFEST_PATH.name}: keeping the last good state", file=sys.stderr)
+                    failed = True
+
+            if any(p.suffix == ".proto" for p in changed):
+                t = time.perf_counter()
+                dirty = state.reload_protos()
+                if dirty is None:
+                    print(f"✗ {names}: not loaded; keeping the last good state", file=sys.stderr)
+                    continue
+                if dirty:
+                    full = len(dirty) == len(state.hashes)
+                    if state.run_convenience(None if full else set(dirty)) is None:
+                        state.revert_protos()
+                        print(f"✗ {names}: emitter failed; keeping the last good state",
+                              file=sys.stderr)
+                        continue
+                    steps.append(f"{len(dirty)} dirty proto(s), convenience ({_ms(t)})")
+                    if plugins:
+                        t = time.perf_counter()
+                        for target in run_plugins(plugins, dirty):
+                            plugins.remove(target)
+                        steps.append(f"plugins ({_ms(t)})")
+
+            if steps:
+                print(f"✓ {names}: {'; '.join(steps)} — {_ms(start)} total")
+            elif not failed:
+                print(f"  {names}: no content change")
+    except KeyboardInterrupt:
+        print("▶ stopped")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
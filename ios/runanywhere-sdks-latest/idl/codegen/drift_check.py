@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+#
+# Drift check that never touches the working tree.
+#
+# ci-drift-check.sh regenerates into the checkout and then asks git what
+# changed: slow, unsafe to run next to other jobs using the same checkout,
+# and it leaves the tree dirty when it fails. This script renders every
+# generator's output somewhere else and compares bytes with the index
+# instead:
+#
+#   - The Python generators (the four convenience emitters, through
+#     generate_convenience.render(), and generate_swift_modality_abi.py)
+#     run under _output.capture(), so their writes and stale-file removals
+#     land in an in-memory VirtualTree. The descriptor set is read once
+#     (cached by content hash, see _descriptor_cache.py).
+#
+#   - The protoc-plugin / node generators (generate_{swift,kotlin,dart,ts,
+#     cpp,streams}.sh) are external tools that can only write files, so they
+#     run concurrently in a scratch copy of idl/ under a temp directory; the
+#     scripts derive every path from their own location, so nothing lands
+#     in the real tree.
+#
+# Each rendered file is hashed as a git blob and compared with the blob id
+# `git ls-files -s` reports for the committed file, so unchanged files cost
+# one hash and are never read from disk. Mismatches (modified, new, or —
+# for generators that delete stale output — removed files) are reported
+# with per-file unified diffs against the committed blob.
+#
+# A tool-driven target whose toolchain is missing renders nothing; it is
+# reported as skipped, and --strict turns a skip into a failure (CI).
+#
+# Usage:
+#   python3 idl/codegen/drift_check.py                 # everything
+#   python3 idl/codegen/drift_check.py --python-only   # no toolchains needed
+#   python3 idl/codegen/drift_check.py --strict --stat
+#
+# Exit code: 0 when every rendered file matches, 1 on drift or a generator
+# failure (or a skipped target under --strict).
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import difflib
+import hashlib
+import importlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from google.protobuf import descriptor_pb2
+
+from _convenience_common import build_annotation_index
+from _descriptor_cache import descriptor_set_bytes
+from _output import capture
+from generate_convenience import EMITTERS, render
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+IDL_DIR = REPO_ROOT / "idl"
+
+
+@dataclass(frozen=True)
+class ToolTarget:
+    script: str
+    out_root: str                   # repo-relative output directory
+    stale_prefix: str | None = None  # subtree the script pre-cleans, if any
+
+
+# Tool-driven generators, in generate_all.sh order. Kotlin's Wire subtree is
+# wiped before every run, so committed files Wire no longer emits are drift.
+TOOL_TARGETS: dict[str, ToolTarget] = {
+    "swift":   ToolTarget("generate_swift.sh", "sdk/runanywhere-swift/Sources/RunAnywhere/Generated"),
+    "kotlin":  ToolTarget(
+        "generate_kotlin.sh",
+        "sdk/runanywhere-kotlin/src/main/kotlin/com/runanywhere/sdk/generated",
+        "sdk/runanywhere-kotlin/src/main/kotlin/com/runanywhere/sdk/generated/ai/runanywhere/proto/v1/",
+    ),
+    "dart":    ToolTarget("generate_dart.sh", "sdk/runanywhere-flutter/packages/runanywhere/lib/generated"),
+    "ts":      ToolTarget("generate_ts.sh", "sdk/shared/proto-ts/src"),
+    "cpp":     ToolTarget("generate_cpp.sh", "sdk/runanywhere-commons/src/generated/proto"),
+    "streams": ToolTarget("generate_streams.sh", "sdk/shared/proto-ts/src/streams"),
+}
+
+
+@dataclass
+class Rendered:
+    files: dict[str, bytes] = field(default_factory=dict)  # repo-relative path -> bytes
+    removed: set[str] = field(default_factory=set)
+    skipped: list[str] = field(default_factory=list)
+    failures: list[str] = field(default_factory=list)
+
+
+def _rel(path: Path) -> str:
+    return Path(path).resolve().relative_to(REPO_ROOT).as_posix()
+
+
+# ---------------------------------------------------------------------------
+# Python generators (in memory).
+# ---------------------------------------------------------------------------
+
+def render_python(langs: list[str], modality_abi: bool) -> Rendered:
+    out = Rendered()
+    proto_files = sorted(IDL_DIR.glob("*.proto"))
+    fds = descriptor_pb2.FileDescriptorSet()
+    fds.ParseFromString(descriptor_set_bytes(IDL_DIR, proto_files))
+    index = build_annotation_index(fds)
+
+    # In-process (jobs=1): the tool targets run on threads meanwhile, and
+    # forking a process pool under live threads is not safe.
+    try:
+        for tree in render(langs, fds, REPO_ROOT, index, jobs=1).values():
+            out.files.update({_rel(p): data for p, data in tree.files.items()})
+            out.removed.update(_rel(p) for p in tree.removed)
+    except RuntimeError as e:
+        out.failures.append(str(e))
+
+    if not modality_abi:
+        return out
+    with capture() as tree, contextlib.redirect_stdout(io.StringIO()):
+        try:
+            module = importlib.import_module("generate_swift_modality_abi")
+        except SystemExit:  # PyYAML missing; the module already said so
+            out.skipped.append("modality_abi (PyYAML not installed)")
+        else:
+            code = module.main([])
+            if code:
+                out.failures.append(f"generate_swift_modality_abi.py exited {code}")
+    out.files.update({_rel(p): data for p, data in tree.files.items()})
+    out.removed.update(_rel(p) for p in tree.removed)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Tool-driven generators (scratch copy of idl/).
+# ---------------------------------------------------------------------------
+
+def _build_scratch(scratch: Path) -> None:
+    (scratch / "idl").mkdir(parents=True)
+    for proto in IDL_DIR.glob("*.proto"):
+        shutil.copy(proto, scratch / "idl" / proto.name)
+    shutil.copytree(SCRIPT_DIR, scratch / "idl" / "codegen",
+                    ignore=shutil.ignore_patterns("__pycache__", "tests"))
+    versions = REPO_ROOT / "sdk" / "runanywhere-commons" / "VERSIONS"
+    if versions.is_file():
+        (scratch / versions.parent.relative_to(REPO_ROOT)).mkdir(parents=True)
+        shutil.copy(versions, scratch / versions.relative_to(REPO_ROOT))
+
+
+def _owner(rel: str, targets: list[str]) -> str | None:
+    """Target whose out_root is the longest prefix of `rel`."""
+    best = None
+    for name in targets:
+        root = TOOL_TARGETS[name].out_root + "/"
+        if rel.startswith(root) and (best is None or len(root) > len(TOOL_TARGETS[best].out_root) + 1):
+            best = name
+    return best
+
+
+def render_tools(targets: list[str], jobs: int) -> Rendered:
+    out = Rendered()
+    with tempfile.TemporaryDirectory(prefix="rac-drift-") as tmp:
+        scratch = Path(tmp) / "repo"
+        _build_scratch(scratch)
+        env = dict(os.environ, RAC_CONVENIENCE_DEFERRED="1")
+        env.pop("RAC_PROTO_FILES", None)
+
+        def run(name: str) -> tuple[str, subprocess.CompletedProcess]:
+            script = scratch / "idl" / "codegen" / TOOL_TARGETS[name].script
+            return name, subprocess.run(["bash", str(script)], env=env,
+                                        capture_output=True, text=True)
+
+        missing: set[str] = set()
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            for name, proc in pool.map(run, targets):
+                if proc.returncode == 127:  # the scripts' "tool not found" exit
+                    reason = next((line for line in proc.stderr.splitlines() if "error" in line),
+                                  "toolchain missing")
+                    out.skipped.append(f"{name} ({reason.strip()})")
+                    missing.add(name)
+                elif proc.returncode:
+                    out.failures.append(f"{TOOL_TARGETS[name].script} exited {proc.returncode}:\n"
+                                        f"{proc.stdout}{proc.stderr}".rstrip())
+
+        produced: dict[str, int] = dict.fromkeys(targets, 0)
+        sdk = scratch / "sdk"
+        for path in sorted(sdk.rglob("*")) if sdk.is_dir() else ():
+            if not path.is_file():
+                continue
+            rel = path.relative_to(scratch).as_posix()
+            owner = _owner(rel, targets)
+            if owner is None:
+                continue
+            produced[owner] += 1
+            out.files[rel] = path.read_bytes()
+        for name, count in produced.items():
+            if count == 0 and name not in missing:
+                out.skipped.append(f"{name} (no output; toolchain missing?)")
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Comparison.
+# ---------------------------------------------------------------------------
+
+def git_blob_id(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def committed_blobs(paths: list[str]) -> dict[str, str]:
+    """repo-relative path -> blob id from the index, for files under `paths`."""
+    proc = subprocess.run(["git", "ls-files", "-s", "-z", "--", *paths], cwd=REPO_ROOT,
+                          check=True, capture_output=True)
+    blobs: dict[str, str] = {}
+    for entry in proc.stdout.split(b"\0"):
+        if not entry:
+            continue
+        meta, path = entry.split(b"\t", 1)
+        blobs[path.decode("utf-8")] = meta.split()[1].decode("ascii")
+    return blobs
+
+
+def read_blobs(ids: list[str]) -> dict[str, bytes]:
+    if not ids:
+        return {}
+    proc = subprocess.run(["git", "cat-file", "--batch"], cwd=REPO_ROOT, check=True,
+                          input="".join(f"{i}\n" for i in ids).encode("ascii"), capture_output=True)
+    data, pos, out = proc.stdout, 0, {}
+    for blob_id in ids:
+        header_end = data.index(b"\n", pos)
+        size = int(data[pos:header_end].split()[2])
+        out[blob_id] = data[header_end + 1:header_end + 1 + size]
+        pos = header_end + 1 + size + 1
+    return out
+
+
+@dataclass
+class Drift:
+    modified: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.modified or self.added or self.removed)
+
+
+def compare(rendered: Rendered, stale_prefixes: list[str]) -> tuple[Drift, dict[str, str]]:
+    roots = sorted({p.split("/", 1)[0] for p in rendered.files} | {"sdk"})
+    blobs = committed_blobs(roots)
+    drift = Drift()
+    for rel, data in sorted(rendered.files.items()):
+        committed = blobs.get(rel)
+        if committed is None:
+            drift.added.append(rel)
+        elif committed != git_blob_id(data):
+            drift.modified.append(rel)
+    stale = set(rendered.removed)
+    for prefix in stale_prefixes:
+        stale |= {rel for rel in blobs if rel.startswith(prefix) and rel not in rendered.files}
+    drift.removed = sorted(rel for rel in stale if rel in blobs)
+    return drift, blobs
+
+
+def _text(data: bytes) -> list[str]:
+    return data.decode("utf-8", "replace").splitlines(keepends=True)
+
+
+def print_diffs(drift: Drift, rendered: Rendered, blobs: dict[str, str], max_lines: int) -> None:
+    committed = read_blobs([blobs[rel] for rel in drift.modified + drift.removed])
+    for rel in drift.modified + drift.added + drift.removed:
+        old = _text(committed[blobs[rel]]) if rel in blobs else []
+        new = _text(rendered.files[rel]) if rel in rendered.files else []
+        lines = list(difflib.unified_diff(old, new, f"a/{rel}", f"b/{rel}"))
+        for line in lines[:max_lines]:
+            sys.stdout.write(line if line.endswith("\n") else line + "\n")
+        if len(lines) > max_lines:
+            print(f"... ({len(lines) - max_lines} more diff lines in {rel})")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check generated code against the committed tree without writing to it.")
+    parser.add_argument("--python-only", action="store_true",
+                        help="only the Python generators (no protoc plugins / node needed)")
+    parser.add_argument("--skip-dart", action="store_true",
+                        help="leave Dart out, as generate_all.sh --skip-dart does")
+    parser.add_argument("--strict", action="store_true",
+                        help="fail when a target is skipped for a missing toolchain")
+    parser.add_argument("--stat", action="store_true", help="list drifted files without diffs")
+    parser.add_argument("--max-diff-lines", type=int, default=200,
+                        help="diff lines shown per file (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="tool-driven generators run concurrently (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    langs = [lang for lang in EMITTERS if not (args.skip_dart and lang == "dart")]
+    targets = [] if args.python_only else [
+        name for name in TOOL_TARGETS if not (args.skip_dart and name == "dart")]
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        tools = pool.submit(render_tools, targets, args.jobs) if targets else None
+        rendered = render_python(langs, modality_abi=True)
+        if tools is not None:
+            tool_out = tools.result()
+            # The Python generators own their files; the copies the shell
+            # scripts produced in scratch (e.g. the modality ABI) yield.
+            for rel, data in tool_out.files.items():
+                rendered.files.setdefault(rel, data)
+            rendered.skipped += tool_out.skipped
+            rendered.failures += tool_out.failures
+
+    skipped = {note.split(" ", 1)[0] for note in rendered.skipped}
+    stale_prefixes = [TOOL_TARGETS[n].stale_prefix for n in targets
+                      if TOOL_TARGETS[n].stale_prefix and n not in skipped]
+    drift, blobs = compare(rendered, stale_prefixes)
+    elapsed = time.perf_counter() - start
+
+    for note in rendered.skipped:
+        print(f"warning: skipped {note}", file=sys.stderr)
+    for failure in rendered.failures:
+        print(f"error: {failure}", file=sys.stderr)
+    if drift:
+        if not args.stat:
+            print_diffs(drift, rendered, blobs, args.max_diff_lines)
+        print()
+        for label, paths in (("M", drift.modified), ("??", drift.added), ("D", drift.removed)):
+            for rel in paths:
+                print(f"  {label:>2} {rel}")
+        print()
+        print("::error::IDL-generated code is out of sync with .proto sources.", file=sys.stderr)
+        print("Run ./idl/codegen/generate_all.sh locally, commit the result, and push again.",
+              file=sys.stderr)
+
+    print(f"drift check: {len(rendered.files)} file(s) rendered in {elapsed:.1f}s, "
+          f"{len(drift.modified)} modified, {len(drift.added)} new, {len(drift.removed)} removed",
+          file=sys.stderr)
+    if drift or rendered.failures or (args.strict and rendered.skipped):
+        return 1
+    print("✓ No drift detected — committed generated files match fresh output.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,15 @@
 # Flags:
 #   --skip-dart   Skip Dart codegen (use when Dart 3.0+ is unavailable
 #                 locally; CI regenerates Dart bindings on the pinned toolchain).
+#   --full        Regenerate everything, ignoring the incremental stamps
+#                 (also RAC_CODEGEN_FULL=1). CI always runs full.
+#   --watch       Stay running and regenerate on every proto / modality
+#                 manifest edit with warm state (codegen_watch.py).
+#
+# By default each language reruns only for the protos whose own bytes or
+# transitive imports changed since its last successful run (see
+# _incremental.py); a change to a generator script, VERSIONS pin or protoc
+# release reruns that language in full.
 set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
@@ -14,11 +23,15 @@ REPO_ROOT="$(cd "${SCRIPT_DIR}/../.." && pwd)"
 IDL_DIR="${REPO_ROOT}/idl"
 
 SKIP_DART=0
+FULL="${RAC_CODEGEN_FULL:-0}"
+WATCH=0
 for arg in "$@"; do
     case "$arg" in
         --skip-dart) SKIP_DART=1 ;;
+        --full) FULL=1 ;;
+        --watch) WATCH=1 ;;
         -h|--help)
-            sed -n '1,15p' "$0" | sed 's/^#//'
+            sed -n '1,18p' "$0" | sed 's/^#//'
             exit 0
             ;;
     esac
@@ -36,6 +49,14 @@ fi
 
 echo "▶ protoc version: $(protoc --version)"
 
+if [ "${WATCH}" -eq 1 ]; then
+    WATCH_FLAGS=()
+    if [ "${SKIP_DART}" -eq 1 ]; then
+        WATCH_FLAGS=(--skip-dart)
+    fi
+    exec python3 "${SCRIPT_DIR}/codegen_watch.py" ${WATCH_FLAGS[@]+"${WATCH_FLAGS[@]}"}
+fi
+
 # Canonical proto-file list shared with every per-language codegen
 # script via the RAC_PROTO_FILES env var (absolute paths, newline-separated,
 # sorted). Discovery via `ls` prevents drift when a new .proto is added — the
@@ -49,54 +70,91 @@ export RAC_PROTO_FILES
 echo "▶ canonical proto file list:"
 echo "${RAC_PROTO_FILES}" | sed 's|^.*/|    - |'
 
+# Build the FileDescriptorSet the convenience post-processors share once,
+# up front. It is cached by content hash (see _descriptor_cache.py), so the
+# convenience step below reads it instead of re-running protoc, and an
+# unchanged IDL tree does not run protoc for it at all.
+if command -v python3 >/dev/null 2>&1; then
+    echo "▶ descriptor set: $(python3 "${SCRIPT_DIR}/_descriptor_cache.py" "${IDL_DIR}")"
+fi
+
+# generate_swift.sh runs the Swift convenience emitter itself when invoked
+# standalone; here all four run together after the language plugins.
+export RAC_CONVENIENCE_DEFERRED=1
+
+INCREMENTAL=0
+if [ "${FULL}" != "1" ] && command -v python3 >/dev/null 2>&1; then
+    INCREMENTAL=1
+fi
+VERSIONS_FILE="${REPO_ROOT}/sdk/runanywhere-commons/VERSIONS"
+
+# run_codegen <target> <script> [plan flags...]
+#
+# Full mode runs <script> over the canonical list. Incremental mode asks
+# _incremental.py which protos are out of date for <target>, runs <script>
+# over just those (via RAC_PROTO_FILES), and records the stamp only once the
+# script succeeded. The script and VERSIONS are always fingerprint inputs.
+run_codegen() {
+    local target="$1" script="$2"
+    shift 2
+    if [ "${INCREMENTAL}" -ne 1 ]; then
+        "${script}"
+        return
+    fi
+    local dirty
+    dirty="$(python3 "${SCRIPT_DIR}/_incremental.py" plan "${target}" \
+        --proto-dir "${IDL_DIR}" --input "${script}" --input "${VERSIONS_FILE}" "$@")"
+    if [ -z "${dirty}" ]; then
+        echo "  (up to date)"
+        return
+    fi
+    RAC_PROTO_FILES="${dirty}" "${script}"
+    python3 "${SCRIPT_DIR}/_incremental.py" record "${target}" --proto-dir "${IDL_DIR}"
+}
+
 echo "▶ Swift proto codegen"
-"${SCRIPT_DIR}/generate_swift.sh"
+run_codegen swift "${SCRIPT_DIR}/generate_swift.sh" \
+    --input "${SCRIPT_DIR}/generate_swift_modality_abi.py" \
+    --input "${SCRIPT_DIR}/swift-modality-abi.yaml"
 
+# Wire output is pre-cleaned wholesale, so Kotlin reruns all protos or none.
 echo "▶ Kotlin proto codegen"
-"${SCRIPT_DIR}/generate_kotlin.sh"
-
-# Emit RAConvenience.kt from rac_options.proto annotations on top of the
-# Wire-generated message/enum types. Must run AFTER generate_kotlin.sh so the
-# referenced types (ai.runanywhere.proto.v1.*) exist on disk; Wire emits a
-# `companion object` on every message/enum, which the convenience extensions
-# bind to. The post-processor exits 0 (warning) when python3 is unavailable so
-# Kotlin-only developer workflows that omit Python remain unblocked.
-if command -v python3 >/dev/null 2>&1; then
-    python3 "${SCRIPT_DIR}/generate_kotlin_convenience.py"
-else
-    echo "warning: python3 not found — skipping RAConvenience.kt codegen." >&2
-fi
+run_codegen kotlin "${SCRIPT_DIR}/generate_kotlin.sh" --whole
 
 if [ "${SKIP_DART}" -eq 1 ]; then
     echo "▶ Dart proto codegen (skipped via --skip-dart)"
 else
     echo "▶ Dart proto codegen"
-    "${SCRIPT_DIR}/generate_dart.sh"
-    # Convenience post-processor (rac_* annotations -> defaults() / validate()
-    # / wireString helpers). Tolerant of a python3-less environment: skip
-    # with a warning rather than fail the upstream codegen.
-    if command -v python3 >/dev/null 2>&1; then
-        echo "▶ Dart convenience post-processor"
-        python3 "${SCRIPT_DIR}/generate_dart_convenience.py"
-    else
-        echo "warning: python3 not on PATH; skipping Dart convenience post-processor." >&2
-    fi
+    run_codegen dart "${SCRIPT_DIR}/generate_dart.sh"
 fi
 
 echo "▶ TypeScript proto codegen (RN + Web)"
-"${SCRIPT_DIR}/generate_ts.sh"
-# TypeScript convenience helpers (defaults / validate /
-# wireString) derived from rac_* annotations. Skips silently when python3
-# is absent, so a TS-only developer environment without Python still
-# completes the upstream codegen successfully.
+run_codegen ts "${SCRIPT_DIR}/generate_ts.sh"
+
+# Convenience post-processors (rac_* annotations -> displayName / wireString /
+# defaults() / validate() helpers) for Swift, Kotlin, Dart and TypeScript.
+# They read only the protos, not the plugin output, so all four run here in
+# one interpreter: generate_convenience.py loads the descriptor set once and
+# fans the emitters out over a process pool. Skips with a warning when
+# python3 is absent so single-language workflows without Python still finish.
 if command -v python3 >/dev/null 2>&1; then
-    python3 "${SCRIPT_DIR}/generate_ts_convenience.py"
+    CONVENIENCE_LANGS=(swift kotlin dart ts)
+    if [ "${SKIP_DART}" -eq 1 ]; then
+        CONVENIENCE_LANGS=(swift kotlin ts)
+    fi
+    CONVENIENCE_FLAGS=()
+    if [ "${INCREMENTAL}" -eq 1 ]; then
+        CONVENIENCE_FLAGS=(--incremental)
+    fi
+    echo "▶ Convenience post-processors (${CONVENIENCE_LANGS[*]})"
+    python3 "${SCRIPT_DIR}/generate_convenience.py" --lang "${CONVENIENCE_LANGS[@]}" \
+        ${CONVENIENCE_FLAGS[@]+"${CONVENIENCE_FLAGS[@]}"}
 else
-    echo "warning: python3 not on PATH; skipping generate_ts_convenience.py" >&2
+    echo "warning: python3 not on PATH; skipping the convenience post-processors." >&2
 fi
 
 echo "▶ C++ proto codegen"
-"${SCRIPT_DIR}/generate_cpp.sh"
+run_codegen cpp "${SCRIPT_DIR}/generate_cpp.sh"
 
 # AsyncIterable<T> stream wrappers for RN + Web. The
 # template-based renderer is intentionally separate from generate_ts.sh
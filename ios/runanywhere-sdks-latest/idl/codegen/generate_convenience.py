@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+#
+# One-process driver for the four convenience post-processors
+# (generate_{swift,kotlin,dart,ts}_convenience.py).
+#
+# Run separately, each post-processor is its own interpreter: it re-imports
+# google.protobuf, re-reads the FileDescriptorSet and walks every
+# descriptor. This driver reads the set once (through the content-hash
+# cache in _descriptor_cache.py), decodes every rac_* annotation into one
+# AnnotationIndex, and hands both to the four emitters, which run
+# concurrently in a process pool. Every emitter is the same
+# `generate(fds, repo_root, index)` its standalone `main()` calls, so the
+# per-language outputs are byte-identical either way.
+#
+# Each worker's stdout is captured and replayed in language order, so the
+# log reads the same as four sequential runs.
+#
+# --incremental consults the import-graph stamps in _incremental.py
+# (targets convenience-<lang>): an emitter whose protos' closures, own
+# module and _convenience_common.py are unchanged since its last successful
+# run is skipped. Swift, Kotlin and Dart write one aggregated file per
+# language, so they rerun whole; TS reruns only the changed protos.
+#
+# `render()` is the library entry point for callers that want the output
+# without touching disk (the golden test, drift_check.py): each emitter
+# runs under _output.capture() and its VirtualTree comes back instead.
+#
+# Usage:
+#   python3 idl/codegen/generate_convenience.py                  # all four
+#   python3 idl/codegen/generate_convenience.py --lang swift ts  # a subset
+#   python3 idl/codegen/generate_convenience.py --jobs 1         # in-process
+#   python3 idl/codegen/generate_convenience.py --incremental    # stamps
+#
+# Exit code: the highest exit code any emitter returned (0 when all pass).
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from google.protobuf import descriptor_pb2
+
+from _convenience_common import AnnotationIndex, build_annotation_index
+from _descriptor_cache import descriptor_set_bytes, protoc_version
+from _incremental import Stamps, closure_hashes, fingerprint, stamp_path
+from _output import VirtualTree, capture
+
+# Language -> emitter module, in the order generate_all.sh used to run them.
+EMITTERS: dict[str, str] = {
+    "swift":  "generate_swift_convenience",
+    "kotlin": "generate_kotlin_convenience",
+    "dart":   "generate_dart_convenience",
+    "ts":     "generate_ts_convenience",
+}
+
+# Emitters that can rewrite a subset of protos (`generate(..., only=...)`).
+PER_PROTO = {"ts"}
+
+_HERE = Path(__file__).resolve().parent
+
+
+def _run_emitter(
+    lang: str, fds_bytes: bytes, index: AnnotationIndex, repo_root: str,
+    only: set[str] | None = None,
+) -> tuple[str, int, str]:
+    """Parse the shared set and run one emitter; returns (lang, exit code,
+    captured stdout). Runs in a worker process or, with --jobs 1, inline."""
+    fds = descriptor_pb2.FileDescriptorSet()
+    fds.ParseFromString(fds_bytes)
+    module = importlib.import_module(EMITTERS[lang])
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        if only is None:
+            code = module.generate(fds, Path(repo_root), index)
+        else:
+            code = module.generate(fds, Path(repo_root), index, only=only)
+    return lang, code, out.getvalue()
+
+
+def _render_emitter(
+    lang: str, fds_bytes: bytes, index: AnnotationIndex, repo_root: str,
+) -> tuple[str, int, str, VirtualTree]:
+    """`_run_emitter` under capture(): nothing is written, and the files the
+    emitter would have written / removed come back as a VirtualTree."""
+    with capture() as tree:
+        _, code, output = _run_emitter(lang, fds_bytes, index, repo_root)
+    return lang, code, output, tree
+
+
+def render(
+    langs: list[str],
+    fds: descriptor_pb2.FileDescriptorSet,
+    repo_root: Path,
+    index: AnnotationIndex | None = None,
+    jobs: int | None = None,
+) -> dict[str, VirtualTree]:
+    """Render `langs` for `fds` as if `repo_root` were the repo, without
+    writing anything; returns lang -> VirtualTree (absolute paths). Emitters
+    run in a process pool unless `jobs` is 1. Raises RuntimeError, with the
+    emitter's log, if one fails."""
+    fds_bytes = fds.SerializeToString()
+    if index is None:
+        index = build_annotation_index(fds)
+    if jobs is None:
+        jobs = len(langs)
+    args = [(lang, fds_bytes, index, str(repo_root)) for lang in langs]
+    if jobs > 1 and len(langs) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(langs))) as pool:
+            results = [f.result() for f in [pool.submit(_render_emitter, *a) for a in args]]
+    else:
+        results = [_render_emitter(*a) for a in args]
+
+    trees: dict[str, VirtualTree] = {}
+    for lang, code, output, tree in results:
+        if code:
+            raise RuntimeError(f"{lang} convenience emitter exited {code}:\n{output}")
+        trees[lang] = tree
+    return trees
+
+
+def _plan(
+    stamps: Stamps, langs: list[str], proto_dir: Path, fds: descriptor_pb2.FileDescriptorSet,
+) -> dict[str, set[str] | None]:
+    """lang -> `only` set (None: rerun whole) for every emitter with
+    out-of-date outputs; up-to-date emitters are left out."""
+    hashes = closure_hashes(proto_dir, fds)
+    version = protoc_version()
+    todo: dict[str, set[str] | None] = {}
+    for lang in langs:
+        inputs = [_HERE / f"{EMITTERS[lang]}.py", _HERE / "_convenience_common.py", Path(__file__)]
+        result = stamps.plan(f"convenience-{lang}", hashes, fingerprint(inputs, version),
+                             whole=lang not in PER_PROTO)
+        if not result.dirty:
+            print(f"  {lang} convenience: up to date")
+        elif result.full:
+            todo[lang] = None
+        else:
+            todo[lang] = set(result.dirty)
+    stamps.save()
+    return todo
+
+
+def run(
+    langs: list[str], repo_root: Path, jobs: int | None = None, incremental: bool = False,
+) -> int:
+    proto_dir = repo_root / "idl"
+    proto_files = sorted(proto_dir.glob("*.proto"))
+    if not proto_files:
+        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
+        return 0
+
+    start = time.perf_counter()
+    fds_bytes = descriptor_set_bytes(proto_dir, proto_files)
+    fds = descriptor_pb2.FileDescriptorSet()
+    fds.ParseFromString(fds_bytes)
+    stamps = Stamps.load(stamp_path(proto_dir)) if incremental else None
+    todo = _plan(stamps, langs, proto_dir, fds) if stamps is not None else dict.fromkeys(langs)
+    if not todo:
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"convenience: 0 emitter(s) in {elapsed:.0f} ms", file=sys.stderr)
+        return 0
+    index = build_annotation_index(fds)
+
+    if jobs is None:
+        jobs = len(todo)
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            futures = [
+                pool.submit(_run_emitter, lang, fds_bytes, index, str(repo_root), only)
+                for lang, only in todo.items()
+            ]
+            results = [f.result() for f in futures]
+    else:
+        results = [
+            _run_emitter(lang, fds_bytes, index, str(repo_root), only)
+            for lang, only in todo.items()
+        ]
+
+    worst = 0
+    for lang, code, output in results:
+        sys.stdout.write(output)
+        if code:
+            print(f"error: {lang} convenience emitter exited {code}", file=sys.stderr)
+        elif stamps is not None:
+            stamps.record(f"convenience-{lang}")
+        worst = max(worst, code)
+    if stamps is not None:
+        stamps.save()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"convenience: {len(todo)} emitter(s) in {elapsed:.0f} ms", file=sys.stderr)
+    return worst
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the swift/kotlin/dart/ts convenience post-processors in one process.")
+    parser.add_argument("--lang", nargs="+", choices=list(EMITTERS), default=list(EMITTERS),
+                        help="emitters to run (default: all, in %(choices)s order)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (default: one per emitter; 1 runs in-process)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="skip emitters whose inputs are unchanged since their last run")
+    args = parser.parse_args(argv)
+
+    langs = [lang for lang in EMITTERS if lang in args.lang]
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    return run(langs, repo_root, args.jobs, args.incremental)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,53 +28,29 @@
 
 from __future__ import annotations
 
-import os
-import subprocess
 import sys
-import tempfile
 from pathlib import Path
-from typing import Iterable
 
 from google.protobuf import descriptor_pb2
 
-# --- rac_options.proto field numbers (mirror idl/rac_options.proto:97-135).
-RAC_DEFAULT_FIELD_NUM       = 50001
-RAC_REQUIRED_FIELD_NUM      = 50002
-RAC_MIN_FIELD_NUM           = 50004
-RAC_MAX_FIELD_NUM           = 50005
-RAC_MIN_FLOAT_FIELD_NUM     = 50006
-RAC_MAX_FLOAT_FIELD_NUM     = 50007
-RAC_DISPLAY_NAME_FIELD_NUM  = 50010
-RAC_ANALYTICS_KEY_FIELD_NUM = 50011
-RAC_WIRE_STRING_FIELD_NUM   = 50012
-
-# --- Proto wire-format type enums (mirror google/protobuf/descriptor.proto).
-TYPE_DOUBLE   = 1
-TYPE_FLOAT    = 2
-TYPE_INT64    = 3
-TYPE_UINT64   = 4
-TYPE_INT32    = 5
-TYPE_FIXED64  = 6
-TYPE_FIXED32  = 7
-TYPE_BOOL     = 8
-TYPE_STRING   = 9
-TYPE_MESSAGE  = 11
-TYPE_BYTES    = 12
-TYPE_UINT32   = 13
-TYPE_ENUM     = 14
-TYPE_SFIXED32 = 15
-TYPE_SFIXED64 = 16
-TYPE_SINT32   = 17
-TYPE_SINT64   = 18
-
-_INT32_TYPES = frozenset((
-    TYPE_INT32, TYPE_UINT32, TYPE_FIXED32, TYPE_SFIXED32, TYPE_SINT32,
-))
-_INT64_TYPES = frozenset((
-    TYPE_INT64, TYPE_UINT64, TYPE_FIXED64, TYPE_SFIXED64, TYPE_SINT64,
-))
-_INTEGER_TYPES = _INT32_TYPES | _INT64_TYPES
-_FLOAT_TYPES = frozenset((TYPE_DOUBLE, TYPE_FLOAT))
+from _convenience_common import (
+    FLOAT_TYPES,
+    INT64_TYPES,
+    INTEGER_TYPES,
+    RAC_ANALYTICS_KEY_FIELD_NUM,
+    RAC_DISPLAY_NAME_FIELD_NUM,
+    RAC_WIRE_STRING_FIELD_NUM,
+    TYPE_BOOL,
+    TYPE_ENUM,
+    TYPE_STRING,
+    AnnotationIndex,
+    build_annotation_index,
+    load_file_descriptor_set,
+    wire_cases_by_length,
+)
+from _output import OutputWriter
+
+_INT32_TYPES = INTEGER_TYPES - INT64_TYPES
 
 LABEL_REPEATED = 3
 
@@ -86,117 +62,6 @@ CONVENIENCE_SUBDIR = "convenience"
 OUTPUT_FILE_NAME  = "ra_convenience.dart"
 
 
-# --- Minimal wire-format reader -------------------------------------------
-# The Python proto runtime can't decode our rac_* extensions unless the
-# extension definitions are themselves compiled into the runtime; rather than
-# bootstrap that, we walk the serialized options bytes directly using the
-# proto wire format (varint + length-delimited only — that covers every
-# rac_* field type we care about).
-
-def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
-    result = 0
-    shift = 0
-    while True:
-        if pos >= len(buf):
-            raise ValueError("truncated varint")
-        b = buf[pos]
-        pos += 1
-        result |= (b & 0x7F) << shift
-        if (b & 0x80) == 0:
-            return result, pos
-        shift += 7
-        if shift >= 64:
-            raise ValueError("varint too long")
-
-
-def _scan_fields(buf: bytes) -> Iterable[tuple[int, int, bytes | int]]:
-    """Yield (field_number, wire_type, payload) for length-delim / varint
-    fields. 64-bit / 32-bit fields are consumed separately by callers needing
-    them (see ``_decode_double_field``)."""
-    pos = 0
-    while pos < len(buf):
-        tag, pos = _read_varint(buf, pos)
-        wt = tag & 0x07
-        fn = tag >> 3
-        if wt == 0:
-            val, pos = _read_varint(buf, pos)
-            yield fn, wt, val
-        elif wt == 2:
-            length, pos = _read_varint(buf, pos)
-            payload = buf[pos:pos + length]
-            pos += length
-            yield fn, wt, payload
-        elif wt == 1:
-            pos += 8
-        elif wt == 5:
-            pos += 4
-        else:
-            # SGROUP / EGROUP — not used in proto3.
-            pass
-
-
-def _decode_string_field(buf: bytes, field_num: int) -> str | None:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 2:
-            return payload.decode("utf-8")
-    return None
-
-
-def _decode_bool_field(buf: bytes, field_num: int) -> bool | None:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 0:
-            return bool(payload)
-    return None
-
-
-def _decode_int32_field(buf: bytes, field_num: int) -> int | None:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 0:
-            v = int(payload) & 0xFFFFFFFF
-            if v & 0x80000000:
-                v -= 0x100000000
-            return v
-    return None
-
-
-def _decode_double_field(buf: bytes, field_num: int) -> float | None:
-    """Read a proto3 double (wire type 1 = fixed64) at ``field_num``."""
-    import struct
-    pos = 0
-    while pos < len(buf):
-        tag, pos = _read_varint(buf, pos)
-        wt = tag & 0x07
-        fn = tag >> 3
-        if wt == 1:
-            if fn == field_num:
-                return struct.unpack("<d", buf[pos:pos + 8])[0]
-            pos += 8
-        elif wt == 0:
-            _, pos = _read_varint(buf, pos)
-        elif wt == 2:
-            length, pos = _read_varint(buf, pos)
-            pos += length
-        elif wt == 5:
-            pos += 4
-    return None
-
-
-def _get_string_opt(opts, field_num: int) -> str | None:
-    return _decode_string_field(opts.SerializeToString(), field_num)
-
-
-def _get_bool_opt(opts, field_num: int) -> bool | None:
-    return _decode_bool_field(opts.SerializeToString(), field_num)
-
-
-def _get_int32_opt(opts, field_num: int) -> int | None:
-    return _decode_int32_field(opts.SerializeToString(), field_num)
-
-
-def _get_double_opt(opts, field_num: int) -> float | None:
-    return _decode_double_field(opts.SerializeToString(), field_num)
-
-
 # --- Naming utilities ------------------------------------------------------
 
 def _snake_to_lower_camel(name: str) -> str:
@@ -265,22 +130,6 @@ def _proto_basename(file_desc) -> str:
     return Path(file_desc.name).stem
 
 
-# --- Descriptor build ------------------------------------------------------
-
-def _build_descriptor_set(proto_dir: Path, proto_files: list[Path]) -> Path:
-    fd, set_path = tempfile.mkstemp(prefix="rac-fds-dart-", suffix=".pb")
-    os.close(fd)
-    cmd = [
-        "protoc",
-        f"--proto_path={proto_dir}",
-        f"--descriptor_set_out={set_path}",
-        "--include_imports",
-        *[str(p) for p in proto_files],
-    ]
-    subprocess.run(cmd, check=True)
-    return Path(set_path)
-
-
 # --- Enum-name -> source-file lookup --------------------------------------
 
 def _build_enum_file_map(fds: descriptor_pb2.FileDescriptorSet) -> dict[str, str]:
@@ -318,14 +167,14 @@ def _dart_default_literal(field, default_str: str, want_int64_wrapper: list[bool
             return str(int(default_str))
         except ValueError:
             return None
-    if t in _INT64_TYPES:
+    if t in INT64_TYPES:
         try:
             v = int(default_str)
         except ValueError:
             return None
         want_int64_wrapper[0] = True
         return f"Int64({v})"
-    if t in _FLOAT_TYPES:
+    if t in FLOAT_TYPES:
         try:
             v = float(default_str)
         except ValueError:
@@ -348,6 +197,7 @@ def _emit_enum_extension(
     extension_suffix: str,
     getter_name: str,
     field_num: int,
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit ``extension <Enum><Suffix> on <Enum> { String get <getter> }`` when
     at least one enum value carries the given annotation.
@@ -359,11 +209,10 @@ def _emit_enum_extension(
     annotated: dict[str, str] = {}
     has_any = False
     for value in enum_desc.value:
-        if value.HasField("options"):
-            s = _get_string_opt(value.options, field_num)
-            if s is not None:
-                annotated[value.name] = _escape_dart_string(s)
-                has_any = True
+        s = index.value(enum_name, value.name).by_field_num(field_num)
+        if s is not None:
+            annotated[value.name] = _escape_dart_string(s)
+            has_any = True
     if not has_any:
         return None
     lines: list[str] = []
@@ -386,31 +235,63 @@ def _emit_enum_extension(
     return "\n".join(lines)
 
 
+# ASCII case-insensitive match used by every length-dispatched
+# ``<enumName>FromWireString``. Emitted once, after the blocks that call it.
+WIRE_MATCH_HELPER = """/// ASCII case-insensitive comparison of [value] with an already-lowercased
+/// wire string. Unlike `value.toLowerCase() == lowered` it allocates
+/// nothing; the FromWireString factories run on event-decoding hot paths.
+bool _wireStringMatches(String value, String lowered) {
+  if (value.length != lowered.length) return false;
+  for (var i = 0; i < value.length; i++) {
+    var c = value.codeUnitAt(i);
+    if (c >= 0x41 && c <= 0x5A) c |= 0x20;
+    if (c != lowered.codeUnitAt(i)) return false;
+  }
+  return true;
+}"""
+
+
 def _emit_enum_reverse_factory(
     enum_name: str,
     enum_desc: descriptor_pb2.EnumDescriptorProto,
     field_num: int,
+    index: AnnotationIndex,
+    wire_match_used: list[bool],
 ) -> str | None:
     """Emit ``<enumName>FromWireString(String value) -> <Enum>?`` top-level
-    function when at least one enum value carries ``rac_wire_string``."""
+    function when at least one enum value carries ``rac_wire_string``.
+    Switches on ``value.length`` and compares with ``_wireStringMatches``
+    (sets ``wire_match_used[0]``) instead of allocating a lowercased copy."""
     cases: list[tuple[str, str]] = []
     for value in enum_desc.value:
-        if not value.HasField("options"):
-            continue
-        s = _get_string_opt(value.options, field_num)
+        s = index.value(enum_name, value.name).by_field_num(field_num)
         if s is None:
             continue
-        cases.append((value.name, _escape_dart_string(s.lower())))
+        cases.append((value.name, s.lower()))
     if not cases:
         return None
     fn_name = _dart_lower_first(enum_name) + "FromWireString"
     lines: list[str] = []
     lines.append(f"{enum_name}? {fn_name}(String value) {{")
-    lines.append("  switch (value.toLowerCase()) {")
-    for value_name, value_str in cases:
-        lines.append(f"    case '{value_str}':")
-        lines.append(f"      return {enum_name}.{value_name};")
-    lines.append("  }")
+    buckets = wire_cases_by_length(cases)
+    if buckets is None:
+        lines.append("  switch (value.toLowerCase()) {")
+        for value_name, value_str in cases:
+            lines.append(f"    case '{_escape_dart_string(value_str)}':")
+            lines.append(f"      return {enum_name}.{value_name};")
+        lines.append("  }")
+    else:
+        wire_match_used[0] = True
+        lines.append("  switch (value.length) {")
+        for length, bucket in buckets:
+            lines.append(f"    case {length}:")
+            for value_name, value_str in bucket:
+                lines.append(
+                    f"      if (_wireStringMatches(value, '{_escape_dart_string(value_str)}')) "
+                    f"return {enum_name}.{value_name};"
+                )
+            lines.append("      return null;")
+        lines.append("  }")
     lines.append("  return null;")
     lines.append("}")
     return "\n".join(lines)
@@ -424,6 +305,7 @@ def _emit_message_defaults(
     enum_file_map: dict[str, str],
     int64_used: list[bool],
     enum_imports: set[str],
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit ``extension <Msg>Convenience on <Msg> { static <Msg> defaults() }``
     when at least one field carries ``rac_default``. Repeated fields are
@@ -432,9 +314,7 @@ def _emit_message_defaults(
     for field in msg_desc.field:
         if field.label == LABEL_REPEATED:
             continue
-        if not field.HasField("options"):
-            continue
-        default_str = _get_string_opt(field.options, RAC_DEFAULT_FIELD_NUM)
+        default_str = index.field(msg_name, field.name).default
         if default_str is None:
             continue
         wants64 = [False]
@@ -478,10 +358,10 @@ def _required_zero_check_expr(field, dart_name: str, int64_used: list[bool]) ->
         return None
     if t in _INT32_TYPES:
         return f"{dart_name} == 0"
-    if t in _INT64_TYPES:
+    if t in INT64_TYPES:
         int64_used[0] = True
         return f"{dart_name} == Int64(0)"
-    if t in _FLOAT_TYPES:
+    if t in FLOAT_TYPES:
         return f"{dart_name} == 0"
     if t == TYPE_ENUM:
         enum_type = _simple_type_name(field.type_name)
@@ -496,6 +376,7 @@ def _emit_message_validate(
     msg_name: str,
     msg_desc: descriptor_pb2.DescriptorProto,
     int64_used: list[bool],
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit ``extension <Msg>Validate on <Msg> { void validate() }`` when at
     least one field carries a validation annotation."""
@@ -505,12 +386,13 @@ def _emit_message_validate(
             continue
         if not field.HasField("options"):
             continue
+        ann = index.field(msg_name, field.name)
         dart_name = _snake_to_lower_camel(field.name)
 
         field_path = f"{msg_name}.{field.name}"
         field_path_escaped = _escape_dart_string(field_path)
 
-        is_required = _get_bool_opt(field.options, RAC_REQUIRED_FIELD_NUM)
+        is_required = ann.required
         if is_required:
             expr = _required_zero_check_expr(field, dart_name, int64_used)
             if expr is not None:
@@ -522,10 +404,10 @@ def _emit_message_validate(
                 checks.append("      );")
                 checks.append("    }")
 
-        min_int = _get_int32_opt(field.options, RAC_MIN_FIELD_NUM)
-        max_int = _get_int32_opt(field.options, RAC_MAX_FIELD_NUM)
-        if (min_int is not None or max_int is not None) and field.type in _INTEGER_TYPES:
-            is64 = field.type in _INT64_TYPES
+        min_int = ann.min
+        max_int = ann.max
+        if (min_int is not None or max_int is not None) and field.type in INTEGER_TYPES:
+            is64 = field.type in INT64_TYPES
             if is64:
                 int64_used[0] = True
             def lit(v: int) -> str:
@@ -551,9 +433,9 @@ def _emit_message_validate(
             checks.append("      );")
             checks.append("    }")
 
-        min_f = _get_double_opt(field.options, RAC_MIN_FLOAT_FIELD_NUM)
-        max_f = _get_double_opt(field.options, RAC_MAX_FLOAT_FIELD_NUM)
-        if (min_f is not None or max_f is not None) and field.type in _FLOAT_TYPES:
+        min_f = ann.min_float
+        max_f = ann.max_float
+        if (min_f is not None or max_f is not None) and field.type in FLOAT_TYPES:
             parts = []
             if min_f is not None:
                 parts.append(f"{dart_name} < {min_f}")
@@ -612,10 +494,13 @@ def _format_import_block(
     return [f"import '{uri}';" for uri in sorted(set(uris))]
 
 
-def main() -> int:
-    script_dir = Path(__file__).resolve().parent
-    repo_root  = script_dir.parent.parent
-    proto_dir  = repo_root / "idl"
+def generate(
+    fds: descriptor_pb2.FileDescriptorSet,
+    repo_root: Path,
+    index: AnnotationIndex | None = None,
+) -> int:
+    """Write ra_convenience.dart for `fds` under `repo_root`. Shared by main() and the
+    one-process driver (generate_convenience.py)."""
     out_dir    = (
         repo_root
         / "sdk" / "runanywhere-flutter" / "packages" / "runanywhere"
@@ -623,29 +508,15 @@ def main() -> int:
     )
     out_path   = out_dir / OUTPUT_FILE_NAME
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    proto_files = sorted(proto_dir.glob("*.proto"))
-    if not proto_files:
-        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
-        return 0
-
-    set_path = _build_descriptor_set(proto_dir, proto_files)
-    try:
-        fds = descriptor_pb2.FileDescriptorSet()
-        fds.ParseFromString(set_path.read_bytes())
-    finally:
-        try:
-            set_path.unlink()
-        except OSError:
-            pass
-
     enum_file_map = _build_enum_file_map(fds)
+    if index is None:
+        index = build_annotation_index(fds)
 
     blocks: list[str] = []
     enum_imports: set[str] = set()
     message_imports: set[str] = set()
     int64_used: list[bool] = [False]
+    wire_match_used: list[bool] = [False]
     validate_emitted = False
     enum_block_count = 0
     defaults_count = 0
@@ -667,13 +538,13 @@ def main() -> int:
                 ("DisplayName",  "displayName",  RAC_DISPLAY_NAME_FIELD_NUM),
                 ("AnalyticsKey", "analyticsKey", RAC_ANALYTICS_KEY_FIELD_NUM),
             ):
-                b = _emit_enum_extension(enum_name, enum_desc, suffix, getter, fn)
+                b = _emit_enum_extension(enum_name, enum_desc, suffix, getter, fn, index)
                 if b is not None:
                     local_blocks.append(b)
                     enum_block_count += 1
 
             reverse = _emit_enum_reverse_factory(
-                enum_name, enum_desc, RAC_WIRE_STRING_FIELD_NUM,
+                enum_name, enum_desc, RAC_WIRE_STRING_FIELD_NUM, index, wire_match_used,
             )
             if reverse is not None:
                 local_blocks.append(reverse)
@@ -688,7 +559,7 @@ def main() -> int:
             msg_name = msg_desc.name
             defaults_block = _emit_message_defaults(
                 msg_name, msg_desc, enum_file_map,
-                int64_used, enum_imports,
+                int64_used, enum_imports, index,
             )
             if defaults_block is not None:
                 blocks.append(defaults_block)
@@ -697,7 +568,7 @@ def main() -> int:
                     message_imports.add(base)
                     file_added_message_import = True
 
-            validate_block = _emit_message_validate(msg_name, msg_desc, int64_used)
+            validate_block = _emit_message_validate(msg_name, msg_desc, int64_used, index)
             if validate_block is not None:
                 blocks.append(validate_block)
                 validate_count += 1
@@ -706,6 +577,9 @@ def main() -> int:
                     message_imports.add(base)
                     file_added_message_import = True
 
+    if wire_match_used[0]:
+        blocks.append(WIRE_MATCH_HELPER)
+
     # When a message-import covers the same base as an enum-import, drop the
     # redundant enum import: the .pb.dart file re-exports its .pbenum.dart.
     enum_imports_final = {b for b in enum_imports if b not in message_imports}
@@ -752,14 +626,26 @@ def main() -> int:
         )
 
     content = "\n".join(header_lines) + body_text + "\n"
-    out_path.write_text(content, encoding="utf-8")
+    out = OutputWriter()
+    out.write(out_path, content)
 
     print(f"✓ Dart convenience post-processor → {out_path}")
+    print(f"  output: {out.summary()}")
     print(f"  enum accessor blocks:    {enum_block_count}")
     print(f"  message defaults blocks: {defaults_count}")
     print(f"  message validate blocks: {validate_count}")
     return 0
 
 
+def main() -> int:
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    proto_dir = repo_root / "idl"
+    fds = load_file_descriptor_set(proto_dir)
+    if fds is None:
+        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
+        return 0
+    return generate(fds, repo_root)
+
+
 if __name__ == "__main__":
     sys.exit(main())
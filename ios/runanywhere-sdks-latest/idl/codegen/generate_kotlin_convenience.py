@@ -54,28 +54,22 @@ from _convenience_common import (
     FLOAT_TYPES,
     KOTLIN_PROFILE,
     RAC_ANALYTICS_KEY_FIELD_NUM,
-    RAC_DEFAULT_FIELD_NUM,
     RAC_DISPLAY_NAME_FIELD_NUM,
-    RAC_MAX_FIELD_NUM,
-    RAC_MAX_FLOAT_FIELD_NUM,
-    RAC_MIN_FIELD_NUM,
-    RAC_MIN_FLOAT_FIELD_NUM,
-    RAC_REQUIRED_FIELD_NUM,
     RAC_WIRE_STRING_FIELD_NUM,
     TYPE_STRING,
+    AnnotationIndex,
     annotation_name,
+    build_annotation_index,
     build_enum_case_map,
-    get_bool_option,
-    get_double_option,
-    get_int32_option,
-    get_string_option,
     iter_runanywhere_files,
     iter_top_level_enums,
     iter_top_level_messages,
     load_file_descriptor_set,
     to_default_literal,
+    wire_cases_by_length,
     zero_literal_for_required,
 )
+from _output import OutputWriter
 
 # ---------------------------------------------------------------------------
 # Output target & static configuration.
@@ -111,6 +105,7 @@ def _emit_enum_accessor(
     enum_desc: descriptor_pb2.EnumDescriptorProto,
     accessor_name: str,
     field_num: int,
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `val <Enum>.<accessor>: String` as a switch over the proto
     SCREAMING_SNAKE constants. Always emits an `else -> ""` fall-through to
@@ -121,9 +116,7 @@ def _emit_enum_accessor(
     (pass3-syn-038)"""
     cases: list[tuple[str, str]] = []
     for value in enum_desc.value:
-        if not value.HasField("options"):
-            continue
-        opt_str = get_string_option(value.options, field_num)
+        opt_str = index.value(proto_enum_name, value.name).by_field_num(field_num)
         if opt_str is None:
             continue
         cases.append((value.name, _escape_kotlin_string(opt_str)))
@@ -145,21 +138,21 @@ def _emit_enum_reverse_factory(
     proto_enum_name: str,
     enum_desc: descriptor_pb2.EnumDescriptorProto,
     field_num: int,
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `fun <Enum>.Companion.fromWireString(value: String): <Enum>?`.
     Wire generates a `companion object` on every enum (verified at
     `AudioFormat.kt:58`), so the extension binds without consumer-side
     boilerplate. Match is case-insensitive against the annotation value
-    to preserve the pre-IDL hand-written `fromWireString` behaviour."""
+    to preserve the pre-IDL hand-written `fromWireString` behaviour; it
+    dispatches on `value.length` and compares with
+    `equals(ignoreCase = true)`, so no lowercased copy is allocated."""
     cases: list[tuple[str, str]] = []
     for value in enum_desc.value:
-        if not value.HasField("options"):
-            continue
-        opt_str = get_string_option(value.options, field_num)
+        opt_str = index.value(proto_enum_name, value.name).by_field_num(field_num)
         if opt_str is None:
             continue
-        safe = _escape_kotlin_string(opt_str.lower())
-        cases.append((value.name, safe))
+        cases.append((value.name, opt_str.lower()))
     if not cases:
         return None
 
@@ -168,9 +161,25 @@ def _emit_enum_reverse_factory(
     lines.append(
         f"public fun {proto_enum_name}.Companion.fromWireString(value: String): {proto_enum_name}? ="
     )
-    lines.append("    when (value.lowercase()) {")
-    for case_name, value in cases:
-        lines.append(f"        \"{value}\" -> {proto_enum_name}.{case_name}")
+    buckets = wire_cases_by_length(cases)
+    if buckets is None:
+        lines.append("    when (value.lowercase()) {")
+        for case_name, value in cases:
+            lines.append(f"        \"{_escape_kotlin_string(value)}\" -> {proto_enum_name}.{case_name}")
+        lines.append("        else -> null")
+        lines.append("    }")
+        return "\n".join(lines)
+
+    lines.append("    when (value.length) {")
+    for length, bucket in buckets:
+        lines.append(f"        {length} -> when {{")
+        for case_name, value in bucket:
+            lines.append(
+                f"            value.equals(\"{_escape_kotlin_string(value)}\", ignoreCase = true) -> "
+                f"{proto_enum_name}.{case_name}"
+            )
+        lines.append("            else -> null")
+        lines.append("        }")
     lines.append("        else -> null")
     lines.append("    }")
     return "\n".join(lines)
@@ -180,6 +189,7 @@ def _emit_message_defaults_factory(
     proto_msg_name: str,
     msg_desc: descriptor_pb2.DescriptorProto,
     enum_case_map: dict[str, str],
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `fun <Msg>.Companion.defaults(): <Msg>` invoking the Wire-
     generated primary constructor with named snake_case arguments for
@@ -187,9 +197,7 @@ def _emit_message_defaults_factory(
     values. Returns None when no fields carry `rac_default`."""
     assignments: list[tuple[str, str]] = []
     for field in msg_desc.field:
-        if not field.HasField("options"):
-            continue
-        default_str = get_string_option(field.options, RAC_DEFAULT_FIELD_NUM)
+        default_str = index.field(proto_msg_name, field.name).default
         if default_str is None:
             continue
         literal = to_default_literal(field, default_str, enum_case_map, KOTLIN_PROFILE)
@@ -214,6 +222,7 @@ def _emit_message_defaults_factory(
 def _emit_message_validate(
     proto_msg_name: str,
     msg_desc: descriptor_pb2.DescriptorProto,
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `fun <Msg>.validate()` issuing range / required-field checks
     and throwing `SDKException.validationFailed(...)` on first failure.
@@ -222,6 +231,7 @@ def _emit_message_validate(
     for field in msg_desc.field:
         if not field.HasField("options"):
             continue
+        ann = index.field(proto_msg_name, field.name)
         # Wire constructor args use snake_case verbatim — same name on the
         # extension receiver, so we reference the field by `field.name`.
         kt_field = field.name
@@ -244,7 +254,7 @@ def _emit_message_validate(
                 "        )",
             ]
 
-        is_required = get_bool_option(field.options, RAC_REQUIRED_FIELD_NUM)
+        is_required = ann.required
         if is_required:
             t = field.type
             if t == TYPE_STRING:
@@ -271,8 +281,8 @@ def _emit_message_validate(
                 checks.extend(_throw(f"\"{field.name} is required\""))
                 checks.append("    }")
 
-        min_int = get_int32_option(field.options, RAC_MIN_FIELD_NUM)
-        max_int = get_int32_option(field.options, RAC_MAX_FIELD_NUM)
+        min_int = ann.min
+        max_int = ann.max
         if (min_int is not None or max_int is not None) and field.type in INTEGER_TYPES:
             parts: list[str] = []
             if min_int is not None:
@@ -295,8 +305,8 @@ def _emit_message_validate(
             ))
             checks.append("    }")
 
-        min_f = get_double_option(field.options, RAC_MIN_FLOAT_FIELD_NUM)
-        max_f = get_double_option(field.options, RAC_MAX_FLOAT_FIELD_NUM)
+        min_f = ann.min_float
+        max_f = ann.max_float
         if (min_f is not None or max_f is not None) and field.type in FLOAT_TYPES:
             parts = []
             if min_f is not None:
@@ -336,10 +346,13 @@ def _emit_message_validate(
 # Top-level driver.
 # ---------------------------------------------------------------------------
 
-def main() -> int:
-    script_dir = Path(__file__).resolve().parent
-    repo_root  = script_dir.parent.parent
-    proto_dir  = repo_root / "idl"
+def generate(
+    fds: descriptor_pb2.FileDescriptorSet,
+    repo_root: Path,
+    index: AnnotationIndex | None = None,
+) -> int:
+    """Write RAConvenience.kt for `fds` under `repo_root`. Shared by main() and the
+    one-process driver (generate_convenience.py)."""
     out_dir = (
         repo_root
         / "sdk" / "runanywhere-kotlin" / "src" / "main" / "kotlin"
@@ -347,14 +360,9 @@ def main() -> int:
     )
     out_path = out_dir / "RAConvenience.kt"
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    fds = load_file_descriptor_set(proto_dir)
-    if fds is None:
-        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
-        return 0
-
     enum_case_map = build_enum_case_map(fds, "kotlin")
+    if index is None:
+        index = build_annotation_index(fds)
 
     blocks: list[str] = []
     referenced_types: set[str] = set()
@@ -370,14 +378,16 @@ def main() -> int:
                 ("analyticsKey",  RAC_ANALYTICS_KEY_FIELD_NUM),
                 ("wireString",    RAC_WIRE_STRING_FIELD_NUM),
             ):
-                block = _emit_enum_accessor(proto_enum_name, enum_desc, accessor_name, field_num)
+                block = _emit_enum_accessor(
+                    proto_enum_name, enum_desc, accessor_name, field_num, index,
+                )
                 if block is not None:
                     blocks.append(block)
                     enum_emitted = True
                     annotated_enum_count += 1
 
             reverse_block = _emit_enum_reverse_factory(
-                proto_enum_name, enum_desc, RAC_WIRE_STRING_FIELD_NUM,
+                proto_enum_name, enum_desc, RAC_WIRE_STRING_FIELD_NUM, index,
             )
             if reverse_block is not None:
                 blocks.append(reverse_block)
@@ -390,7 +400,7 @@ def main() -> int:
             msg_emitted = False
 
             defaults_block = _emit_message_defaults_factory(
-                proto_msg_name, msg_desc, enum_case_map,
+                proto_msg_name, msg_desc, enum_case_map, index,
             )
             if defaults_block is not None:
                 blocks.append(defaults_block)
@@ -400,14 +410,12 @@ def main() -> int:
                 # Track enum types referenced as `rac_default` literals so
                 # we can import them alongside the message type itself.
                 for field in msg_desc.field:
-                    if not field.HasField("options"):
-                        continue
-                    if get_string_option(field.options, RAC_DEFAULT_FIELD_NUM) is None:
+                    if index.field(proto_msg_name, field.name).default is None:
                         continue
                     if field.type_name and field.type == 14:  # TYPE_ENUM
                         referenced_types.add(field.type_name.split(".")[-1])
 
-            validate_block = _emit_message_validate(proto_msg_name, msg_desc)
+            validate_block = _emit_message_validate(proto_msg_name, msg_desc, index)
             if validate_block is not None:
                 blocks.append(validate_block)
                 annotated_message_validate_count += 1
@@ -461,14 +469,26 @@ def main() -> int:
         )
 
     content = "\n".join(header) + body_text + "\n"
-    out_path.write_text(content, encoding="utf-8")
+    out = OutputWriter()
+    out.write(out_path, content)
 
     print(f"✓ Kotlin convenience post-processor → {out_path}")
+    print(f"  output: {out.summary()}")
     print(f"  annotated enum-accessor blocks emitted: {annotated_enum_count}")
     print(f"  message defaults() factories emitted: {annotated_message_defaults_count}")
     print(f"  message validate() helpers emitted: {annotated_message_validate_count}")
     return 0
 
 
+def main() -> int:
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    proto_dir = repo_root / "idl"
+    fds = load_file_descriptor_set(proto_dir)
+    if fds is None:
+        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
+        return 0
+    return generate(fds, repo_root)
+
+
 if __name__ == "__main__":
     sys.exit(main())
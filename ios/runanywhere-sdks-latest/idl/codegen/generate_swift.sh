@@ -88,11 +88,16 @@ rm -f "${OUT_DIR}"/*.grpc.swift
 # rac_required / rac_min / rac_max). The post-processor reads idl/*.proto via
 # protoc --descriptor_set_out and writes hand-friendly accessor extensions onto
 # the RA* swift-protobuf types in the same module.
+#
+# generate_all.sh sets RAC_CONVENIENCE_DEFERRED=1 and runs all four
+# convenience emitters at the end through generate_convenience.py instead.
 if command -v python3 >/dev/null 2>&1; then
-    python3 "${SCRIPT_DIR}/generate_swift_convenience.py"
-    # Generate `ModalityProtoABI+Generated.swift` from the
-    # manifest at swift-modality-abi.yaml. Owns the dlsym table for the 7
-    # fully-equivalent modality-ABI methods.
+    if [ "${RAC_CONVENIENCE_DEFERRED:-0}" != "1" ]; then
+        python3 "${SCRIPT_DIR}/generate_swift_convenience.py"
+    fi
+    # Generate one `ModalityProtoABI+<Modality>.swift` per modality from the
+    # manifest at swift-modality-abi.yaml. Owns the C symbol tables for the
+    # codegen-eligible modality-ABI methods.
     python3 "${SCRIPT_DIR}/generate_swift_modality_abi.py"
 else
     echo "warning: python3 not found — skipping RAConvenience.swift + ModalityProtoABI codegen." >&2
@@ -47,22 +47,14 @@ from _convenience_common import (
     INTEGER_TYPES,
     FLOAT_TYPES,
     RAC_ANALYTICS_KEY_FIELD_NUM,
-    RAC_DEFAULT_FIELD_NUM,
     RAC_DISPLAY_NAME_FIELD_NUM,
-    RAC_MAX_FIELD_NUM,
-    RAC_MAX_FLOAT_FIELD_NUM,
-    RAC_MIN_FIELD_NUM,
-    RAC_MIN_FLOAT_FIELD_NUM,
-    RAC_REQUIRED_FIELD_NUM,
     RAC_WIRE_STRING_FIELD_NUM,
     SWIFT_PROFILE,
     TYPE_STRING,
+    AnnotationIndex,
     annotation_name,
+    build_annotation_index,
     build_enum_case_map,
-    get_bool_option,
-    get_double_option,
-    get_int32_option,
-    get_string_option,
     iter_runanywhere_files,
     iter_top_level_enums,
     iter_top_level_messages,
@@ -70,7 +62,9 @@ from _convenience_common import (
     proto_field_to_camel,
     swift_enum_case,
     to_default_literal,
+    wire_cases_by_length,
 )
+from _output import OutputWriter
 
 SWIFT_PREFIX = "RA"
 
@@ -82,15 +76,14 @@ def _emit_enum_accessor(
     enum_desc: descriptor_pb2.EnumDescriptorProto,
     accessor_name: str,
     field_num: int,
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit a Swift `var <accessor_name>: String` on RA<EnumName> if at
     least one enum value carries the given annotation. Returns None when
     no values are annotated (so the caller can skip the whole extension)."""
     cases: list[tuple[str, str]] = []
     for value in enum_desc.value:
-        if not value.HasField("options"):
-            continue
-        opt_str = get_string_option(value.options, field_num)
+        opt_str = index.value(proto_enum_name, value.name).by_field_num(field_num)
         if opt_str is None:
             continue
         case_name = swift_enum_case(proto_enum_name, value.name)
@@ -114,44 +107,83 @@ def _emit_enum_accessor(
     return "\n".join(lines)
 
 
+# ASCII case-insensitive match used by every length-dispatched
+# `from(wireString:)`. Emitted once, after the blocks that call it.
+WIRE_MATCH_HELPER = """/// ASCII case-insensitive comparison of `value` with an already-lowercased
+/// wire string. Unlike `value.lowercased() == lowered` it allocates nothing;
+/// the `from(wireString:)` factories run on event-decoding hot paths.
+@inline(__always)
+fileprivate func racWireStringMatches(_ value: String, _ lowered: StaticString) -> Bool {
+    lowered.withUTF8Buffer { expected in
+        var index = 0
+        for byte in value.utf8 {
+            guard index < expected.count else { return false }
+            let folded = (0x41...0x5A).contains(byte) ? byte | 0x20 : byte
+            if folded != expected[index] { return false }
+            index += 1
+        }
+        return index == expected.count
+    }
+}"""
+
+
 def _emit_enum_reverse_factory(
     proto_enum_name: str,
     enum_desc: descriptor_pb2.EnumDescriptorProto,
     factory_name: str,
     parameter_label: str,
     field_num: int,
+    index: AnnotationIndex,
+    wire_match_used: list[bool],
 ) -> str | None:
     """Emit `static func <factory_name>(<parameter_label>:)` on RA<EnumName>
     that reverses the wire-string annotation lookup. Static factory rather
     than `init?` to avoid colliding with swift-protobuf's auto-generated
     `init?(rawValue:)` / `init?(name:)` initializers. Match is
     case-insensitive against the annotation value to preserve the
-    pre-IDL hand-written behavior. Returns None when no values are
-    annotated."""
+    pre-IDL hand-written behavior: the factory switches on the UTF-8
+    length and compares with `racWireStringMatches` (sets
+    `wire_match_used[0]`), so no lowercased copy is allocated. Returns
+    None when no values are annotated."""
     cases: list[tuple[str, str]] = []
     for value in enum_desc.value:
-        if not value.HasField("options"):
-            continue
-        opt_str = get_string_option(value.options, field_num)
+        opt_str = index.value(proto_enum_name, value.name).by_field_num(field_num)
         if opt_str is None:
             continue
         case_name = swift_enum_case(proto_enum_name, value.name)
-        safe = opt_str.replace("\\", "\\\\").replace("\"", "\\\"").lower()
-        cases.append((case_name, safe))
+        cases.append((case_name, opt_str.lower()))
     if not cases:
         return None
 
+    def literal(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\"", "\\\"")
+
     swift_type = f"{SWIFT_PREFIX}{proto_enum_name}"
     lines: list[str] = []
     lines.append(f"extension {swift_type} {{")
     lines.append(f"    /// Generated reverse of the `{annotation_name(field_num)}` accessor.")
     lines.append(f"    /// Matches case-insensitively against the annotation value.")
     lines.append(f"    public static func {factory_name}({parameter_label}: String) -> {swift_type}? {{")
-    lines.append(f"        switch {parameter_label}.lowercased() {{")
-    for case_name, value in cases:
-        lines.append(f"        case \"{value}\": return .{case_name}")
-    lines.append("        default: return nil")
-    lines.append("        }")
+    buckets = wire_cases_by_length(cases)
+    if buckets is None:
+        lines.append(f"        switch {parameter_label}.lowercased() {{")
+        for case_name, value in cases:
+            lines.append(f"        case \"{literal(value)}\": return .{case_name}")
+        lines.append("        default: return nil")
+        lines.append("        }")
+    else:
+        wire_match_used[0] = True
+        lines.append(f"        switch {parameter_label}.utf8.count {{")
+        for length, bucket in buckets:
+            lines.append(f"        case {length}:")
+            for case_name, value in bucket:
+                lines.append(
+                    f"            if racWireStringMatches({parameter_label}, \"{literal(value)}\") "
+                    f"{{ return .{case_name} }}"
+                )
+            lines.append("            return nil")
+        lines.append("        default: return nil")
+        lines.append("        }")
     lines.append("    }")
     lines.append("}")
     return "\n".join(lines)
@@ -163,15 +195,14 @@ def _emit_message_defaults_factory(
     proto_msg_name: str,
     msg_desc: descriptor_pb2.DescriptorProto,
     enum_case_map: dict[str, str],
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `public static func defaults() -> RA<MessageName>` when at
     least one field carries `rac_default`. Returns None when the message
     has no relevant annotations."""
     assignments: list[tuple[str, str]] = []
     for field in msg_desc.field:
-        if not field.HasField("options"):
-            continue
-        default_str = get_string_option(field.options, RAC_DEFAULT_FIELD_NUM)
+        default_str = index.field(proto_msg_name, field.name).default
         if default_str is None:
             continue
         literal = to_default_literal(field, default_str, enum_case_map, SWIFT_PROFILE)
@@ -202,6 +233,7 @@ def _emit_message_validate(
     proto_msg_name: str,
     msg_desc: descriptor_pb2.DescriptorProto,
     enum_case_map: dict[str, str],
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `public func validate() throws` when at least one field carries
     `rac_required`, `rac_min`, `rac_max`, `rac_min_float`, or
@@ -221,7 +253,7 @@ def _emit_message_validate(
         if not field.proto3_optional:
             return swift_field
 
-        default_str = get_string_option(field.options, RAC_DEFAULT_FIELD_NUM)
+        default_str = index.field(proto_msg_name, field.name).default
         if default_str is None:
             return swift_field
 
@@ -239,13 +271,14 @@ def _emit_message_validate(
     def _optional_presence_guard(field: descriptor_pb2.FieldDescriptorProto, swift_field: str) -> str | None:
         if not field.proto3_optional:
             return None
-        if get_string_option(field.options, RAC_DEFAULT_FIELD_NUM) is not None:
+        if index.field(proto_msg_name, field.name).default is not None:
             return None
         return f"has{swift_field[0].upper()}{swift_field[1:]}"
 
     for field in msg_desc.field:
         if not field.HasField("options"):
             continue
+        ann = index.field(proto_msg_name, field.name)
         swift_field = proto_field_to_camel(field.name, id_uppercase=True)
 
         def _throw(message_literal: str, indent: str = "            ") -> list[str]:
@@ -267,7 +300,7 @@ def _emit_message_validate(
                 f"{indent})",
             ]
 
-        is_required = get_bool_option(field.options, RAC_REQUIRED_FIELD_NUM)
+        is_required = ann.required
         if is_required:
             t = field.type
             if t == TYPE_STRING:
@@ -279,8 +312,8 @@ def _emit_message_validate(
                 checks.extend(_throw(f'"{field.name} is required"'))
                 checks.append(f"        }}")
 
-        min_int = get_int32_option(field.options, RAC_MIN_FIELD_NUM)
-        max_int = get_int32_option(field.options, RAC_MAX_FIELD_NUM)
+        min_int = ann.min
+        max_int = ann.max
         if (min_int is not None or max_int is not None) and field.type in INTEGER_TYPES:
             value_expr = _value_expression(field, swift_field)
             presence_guard = _optional_presence_guard(field, swift_field)
@@ -305,8 +338,8 @@ def _emit_message_validate(
             ))
             checks.append(f"        }}")
 
-        min_f = get_double_option(field.options, RAC_MIN_FLOAT_FIELD_NUM)
-        max_f = get_double_option(field.options, RAC_MAX_FLOAT_FIELD_NUM)
+        min_f = ann.min_float
+        max_f = ann.max_float
         if (min_f is not None or max_f is not None) and field.type in FLOAT_TYPES:
             value_expr = _value_expression(field, swift_field)
             presence_guard = _optional_presence_guard(field, swift_field)
@@ -347,26 +380,25 @@ def _emit_message_validate(
 
 # --- Top-level driver. -----------------------------------------------------
 
-def main() -> int:
-    script_dir = Path(__file__).resolve().parent
-    repo_root  = script_dir.parent.parent
-    proto_dir  = repo_root / "idl"
+def generate(
+    fds: descriptor_pb2.FileDescriptorSet,
+    repo_root: Path,
+    index: AnnotationIndex | None = None,
+) -> int:
+    """Write RAConvenience.swift for `fds` under `repo_root`. Shared by main() and the
+    one-process driver (generate_convenience.py)."""
     out_dir    = repo_root / "sdk" / "runanywhere-swift" / "Sources" / "RunAnywhere" / "Generated"
     out_path   = out_dir / "RAConvenience.swift"
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    fds = load_file_descriptor_set(proto_dir)
-    if fds is None:
-        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
-        return 0
-
     blocks: list[str] = []
+    wire_match_used = [False]
     annotated_enum_count = 0
     annotated_message_defaults_count = 0
     annotated_message_validate_count = 0
 
     enum_case_map = build_enum_case_map(fds, "swift")
+    if index is None:
+        index = build_annotation_index(fds)
 
     for file_desc in iter_runanywhere_files(fds):
         for proto_enum_name, enum_desc in iter_top_level_enums(file_desc):
@@ -375,7 +407,9 @@ def main() -> int:
                 ("analyticsKey",  RAC_ANALYTICS_KEY_FIELD_NUM),
                 ("wireString",    RAC_WIRE_STRING_FIELD_NUM),
             ):
-                block = _emit_enum_accessor(proto_enum_name, enum_desc, accessor_name, field_num)
+                block = _emit_enum_accessor(
+                    proto_enum_name, enum_desc, accessor_name, field_num, index,
+                )
                 if block is not None:
                     blocks.append(block)
                     annotated_enum_count += 1
@@ -389,23 +423,28 @@ def main() -> int:
                 factory_name="from",
                 parameter_label="wireString",
                 field_num=RAC_WIRE_STRING_FIELD_NUM,
+                index=index,
+                wire_match_used=wire_match_used,
             )
             if reverse_block is not None:
                 blocks.append(reverse_block)
 
         for proto_msg_name, msg_desc in iter_top_level_messages(file_desc):
             defaults_block = _emit_message_defaults_factory(
-                proto_msg_name, msg_desc, enum_case_map,
+                proto_msg_name, msg_desc, enum_case_map, index,
             )
             if defaults_block is not None:
                 blocks.append(defaults_block)
                 annotated_message_defaults_count += 1
 
-            validate_block = _emit_message_validate(proto_msg_name, msg_desc, enum_case_map)
+            validate_block = _emit_message_validate(proto_msg_name, msg_desc, enum_case_map, index)
             if validate_block is not None:
                 blocks.append(validate_block)
                 annotated_message_validate_count += 1
 
+    if wire_match_used[0]:
+        blocks.append(WIRE_MATCH_HELPER)
+
     header = [
         "// DO NOT EDIT.",
         "// swift-format-ignore-file",
@@ -437,14 +476,26 @@ def main() -> int:
         )
 
     content = "\n".join(header) + body_text + "\n"
-    out_path.write_text(content, encoding="utf-8")
+    out = OutputWriter()
+    out.write(out_path, content)
 
     print(f"✓ Swift convenience post-processor → {out_path}")
+    print(f"  output: {out.summary()}")
     print(f"  annotated enum-accessor blocks emitted: {annotated_enum_count}")
     print(f"  message defaults() factories emitted: {annotated_message_defaults_count}")
     print(f"  message validate() helpers emitted: {annotated_message_validate_count}")
     return 0
 
 
+def main() -> int:
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    proto_dir = repo_root / "idl"
+    fds = load_file_descriptor_set(proto_dir)
+    if fds is None:
+        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
+        return 0
+    return generate(fds, repo_root)
+
+
 if __name__ == "__main__":
     sys.exit(main())
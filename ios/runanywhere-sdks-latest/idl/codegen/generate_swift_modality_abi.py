@@ -10,8 +10,14 @@
 # `kind: custom` and the 17 facade methods tagged `keep_handwritten: true` stay
 # hand-written in CppBridge+ModalityProtoABI.swift.
 #
-# Output:
-#   sdk/runanywhere-swift/Sources/RunAnywhere/Generated/ModalityProtoABI+Generated.swift
+# Output (one file per modality, so a manifest edit re-typechecks only the
+# modalities it touches):
+#   sdk/runanywhere-swift/Sources/RunAnywhere/Generated/ModalityProtoABI+<Modality>.swift
+#
+# Each modality is rendered once; `--single-file` joins the same blocks into
+# the former ModalityProtoABI+Generated.swift instead. Either way, any other
+# ModalityProtoABI+*.swift in the output directory (a removed modality, the
+# other layout) is deleted as stale.
 #
 # Phase B simplification (B2 + B3): the generated file is now emitted directly
 # onto `extension CppBridge.<Modality>` (no parallel `CppBridge_Generated`
@@ -25,13 +31,18 @@
 # Special cases:
 #   * Each `kind: stream` entry has its own terminal-event factory keyed by
 #     c_symbol (see STREAM_ON_ERROR_FACTORIES).
+#   * A `kind: stream` entry with `coalesce: {max_events, max_latency_ms}`
+#     also gets a `<swift_name>Batched` method yielding arrays of events
+#     through ProtoStreamBatchContext.runRequestStream (see the manifest).
 #
 # Invoked by generate_swift.sh AFTER swift-protobuf has produced the *.pb.swift
 # files, so the RA*-prefixed type names are already known to exist.
 
 from __future__ import annotations
 
+import argparse
 import sys
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -45,21 +56,28 @@ except ImportError:  # pragma: no cover
     )
     sys.exit(127)
 
+from _output import OutputWriter, remove_output
+
 # ----------------------------------------------------------------------------
 # Paths
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent.parent
 MANIFEST_PATH = SCRIPT_DIR / "swift-modality-abi.yaml"
-OUTPUT_PATH = (
+OUTPUT_DIR = (
     REPO_ROOT
     / "sdk"
     / "runanywhere-swift"
     / "Sources"
     / "RunAnywhere"
     / "Generated"
-    / "ModalityProtoABI+Generated.swift"
 )
+OUTPUT_PATH = OUTPUT_DIR / "ModalityProtoABI+Generated.swift"  # --single-file
+OUTPUT_GLOB = "ModalityProtoABI+*.swift"
+
+
+def modality_output_path(name: str) -> Path:
+    return OUTPUT_DIR / f"ModalityProtoABI+{name}.swift"
 
 # ----------------------------------------------------------------------------
 # Per-stream terminal-event factories (mirrors the hand-written `onError:`
@@ -192,18 +210,31 @@ def to_typealias_name(swift_name: str) -> str:
 
 
 # ----------------------------------------------------------------------------
-# Header banner
+# Header banners. The banner lines and imports are shared by both layouts;
+# only the summary paragraph differs.
 
-
-def render_header(modality_count: int, method_count: int) -> str:
-    return f"""// DO NOT EDIT.
+BANNER = """// DO NOT EDIT.
 // swift-format-ignore-file
 // swiftlint:disable all
 //
 // Generated by idl/codegen/generate_swift_modality_abi.py from the manifest at
 // idl/codegen/swift-modality-abi.yaml.
 //
-// Covers {method_count} codegen-emitted methods across {modality_count} modality
+"""
+
+IMPORTS = """
+import CRACommons
+import Foundation
+import SwiftProtobuf
+
+// MARK: - Generated C symbol tables
+
+"""
+
+
+def render_header(modality_count: int, method_count: int) -> str:
+    """Banner for the `--single-file` layout."""
+    return BANNER + f"""// Covers {method_count} codegen-emitted methods across {modality_count} modality
 // entries. The remaining `kind: custom` entries stay hand-written in
 // CppBridge+ModalityProtoABI.swift.
 //
@@ -218,14 +249,16 @@ def render_header(modality_count: int, method_count: int) -> str:
 // voidCall (handle[+req] -> rc only), createHandle (req -> new handle),
 // invokeOutOnly (no req, no handle, out -> proto). Migrated 11 of the 18
 // former custom entries onto these new templates.
+""" + IMPORTS
 
-import CRACommons
-import Foundation
-import SwiftProtobuf
-
-// MARK: - Generated C symbol tables
 
-"""
+def render_modality_header(name: str, method_count: int) -> str:
+    """Banner for one per-modality file."""
+    return BANNER + f"""// The {method_count} codegen-emitted `{name}` method(s). Shared scaffolding
+// (ProtoStreamYielder, protoStreamTrampoline, ProtoStreamContext,
+// ProtoStreamBatchContext, runRequestStream) and the `kind: custom` entries
+// stay hand-written in CppBridge+ModalityProtoABI.swift.
+""" + IMPORTS
 
 
 # ----------------------------------------------------------------------------
@@ -271,7 +304,7 @@ def render_generated_enum(modality: dict[str, Any]) -> str:
                 f"    typealias {type_alias} = @convention(c) (\n"
                 f"        UnsafePointer<UInt8>?,\n"
                 f"        Int,\n"
-                f"        @convention(c) (UnsafePointer<UInt8>?, Int, UnsafeMutableRawPointer?) -> Void,\n"
+                f"        (@convention(c) (UnsafePointer<UInt8>?, Int, UnsafeMutableRawPointer?) -> Void)?,\n"
                 f"        UnsafeMutableRawPointer?\n"
                 f"    ) -> rac_result_t"
             )
@@ -333,7 +366,7 @@ def render_generated_enum(modality: dict[str, Any]) -> str:
 
         name_lines.append(f'    static let {swift}Name = "{c_symbol}"')
         load_lines.append(
-            f"    static let {swift} = NativeProtoABI.load({swift}Name, as: {type_alias}.self)"
+            f"    static let {swift}: {type_alias}? = {c_symbol}"
         )
 
     lines.extend(type_lines)
@@ -403,7 +436,34 @@ def render_invoke_method(modality: dict[str, Any], method: dict[str, Any]) -> st
     return head + "\n" + "\n".join(body_lines)
 
 
+def coalesce_options(method: dict[str, Any]) -> tuple[int, int] | None:
+    """`(max_events, max_latency_ms)` from a stream method's optional
+    `coalesce:` mapping, or None when the method does not coalesce."""
+    options = method.get("coalesce")
+    if options is None:
+        return None
+    swift = method.get("swift_name")
+    if method.get("kind") != "stream" or not isinstance(options, dict):
+        raise ValueError(f"coalesce: must be a mapping on a kind: stream method ({swift!r})")
+    unknown = set(options) - {"max_events", "max_latency_ms"}
+    if unknown:
+        raise ValueError(f"unknown coalesce key(s) {sorted(unknown)} for {swift!r}")
+    max_events = options.get("max_events")
+    max_latency_ms = options.get("max_latency_ms")
+    # YAML booleans are ints to Python; reject them along with floats and
+    # strings so a typo fails the render instead of being coerced.
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in (max_events, max_latency_ms)):
+        raise ValueError(
+            f"coalesce: for {swift!r} needs integer max_events and max_latency_ms"
+        )
+    if max_events < 1 or max_latency_ms < 1:
+        raise ValueError(f"coalesce: limits for {swift!r} must be >= 1")
+    return max_events, max_latency_ms
+
+
 def render_stream_method(modality: dict[str, Any], method: dict[str, Any]) -> str:
+    """Per-event stream method, followed by its `<name>Batched` sibling when
+    the manifest entry carries `coalesce:`."""
     name = modality["name"]
     enum_ref = f"{name}GeneratedProtoABI"
     swift = method["swift_name"]
@@ -411,6 +471,7 @@ def render_stream_method(modality: dict[str, Any], method: dict[str, Any]) -> st
     request_proto = method.get("request")
     response_proto = method.get("response")
     is_static = bool(method.get("static"))
+    coalesce = coalesce_options(method)
 
     factory = STREAM_ON_ERROR_FACTORIES.get(c_symbol)
     if factory is None:
@@ -436,28 +497,39 @@ def render_stream_method(modality: dict[str, Any], method: dict[str, Any]) -> st
     category = f"CppBridge.{name}.ProtoStream"
 
     first = first_arg_clause(method, request_proto)
-    head = (
-        f"    {keyword} {swift}({first}) throws "
-        f"-> AsyncStream<{response_proto}> {{"
-    )
-
     request_var = first_arg_name(method)
 
-    body = f"""
+    def variant(method_name: str, element: str, context: str, limits: str) -> str:
+        return f"""    {keyword} {method_name}({first}) throws -> AsyncStream<{element}> {{
         let stream = try NativeProtoABI.require(
             {enum_ref}.{swift},
             named: {enum_ref}.{swift}Name
         )
-        return try ProtoStreamContext<{response_proto}>.runRequestStream(
+        return try {context}<{response_proto}>.runRequestStream(
             request: {request_var},
-            category: "{category}",{on_error_clause}{on_cancel_clause}
+            category: "{category}",{limits}{on_error_clause}{on_cancel_clause}
             body: {{ bytes, size, trampoline, userData in
                 stream(bytes, size, trampoline, userData)
             }}
         )
     }}"""
 
-    return head + body
+    rendered = variant(swift, response_proto, "ProtoStreamContext", "")
+    if coalesce is None:
+        return rendered
+
+    # Opt-in batching (`coalesce:`): same native call, onError and onCancel,
+    # but events are yielded in arrays of up to max_events, at most
+    # max_latency_ms after the first one, so consumers wake once per batch.
+    max_events, max_latency_ms = coalesce
+    limits = (
+        f"\n            maxEvents: {max_events},"
+        f"\n            maxLatency: .milliseconds({max_latency_ms}),"
+    )
+    batched = variant(
+        f"{swift}Batched", f"[{response_proto}]", "ProtoStreamBatchContext", limits
+    )
+    return rendered + "\n\n" + batched
 
 
 # ----------------------------------------------------------------------------
@@ -722,38 +794,90 @@ def render_modality_methods(modality: dict[str, Any]) -> str:
 # Driver
 
 
-def main() -> int:
-    if not MANIFEST_PATH.exists():
-        sys.stderr.write(f"error: manifest not found at {MANIFEST_PATH}\n")
-        return 1
+@dataclass
+class RenderedModality:
+    name: str
+    method_count: int
+    enum_block: str
+    method_block: str
 
-    with MANIFEST_PATH.open("r", encoding="utf-8") as fh:
-        manifest = yaml.safe_load(fh)
 
-    modalities = manifest.get("modalities") or []
-    method_count = 0
-    enum_blocks: list[str] = []
-    method_blocks: list[str] = []
-    for modality in modalities:
+def render_modalities(manifest: dict) -> list[RenderedModality]:
+    """Render every modality with at least one emitted method, once, in
+    manifest order. Both layouts are assembled from these blocks."""
+    rendered: list[RenderedModality] = []
+    for modality in manifest.get("modalities") or []:
         emitted = [m for m in modality.get("methods", []) if should_emit(m)]
         if not emitted:
             continue
-        method_count += len(emitted)
-        enum_blocks.append(render_generated_enum(modality))
-        method_blocks.append(render_modality_methods(modality))
+        rendered.append(RenderedModality(
+            name=modality["name"],
+            method_count=len(emitted),
+            enum_block=render_generated_enum(modality),
+            method_block=render_modality_methods(modality),
+        ))
+    return rendered
+
+
+def render(manifest: dict, single_file: bool = False) -> tuple[dict[Path, str], int]:
+    """Swift sources for a parsed manifest (output path -> content) and the
+    number of methods they emit. Pure; codegen_watch.py calls it with a
+    manifest it keeps loaded."""
+    modalities = render_modalities(manifest)
+    method_count = sum(m.method_count for m in modalities)
+    if single_file:
+        output_parts = [render_header(
+            modality_count=len(manifest.get("modalities") or []), method_count=method_count,
+        )]
+        output_parts.extend(m.enum_block for m in modalities)
+        output_parts.extend(m.method_block for m in modalities)
+        return {OUTPUT_PATH: "\n".join(output_parts)}, method_count
+
+    files: dict[Path, str] = {}
+    for m in modalities:
+        path = modality_output_path(m.name)
+        if path in files:
+            raise ValueError(f"duplicate modality name {m.name!r} in {MANIFEST_PATH.name}")
+        files[path] = "\n".join([
+            render_modality_header(m.name, m.method_count), m.enum_block, m.method_block,
+        ])
+    return files, method_count
+
+
+def write_outputs(files: dict[Path, str]) -> OutputWriter:
+    """Write `files` through the write-if-changed layer and delete every
+    other ModalityProtoABI+*.swift in the output directory."""
+    out = OutputWriter()
+    for path, content in files.items():
+        out.write(path, content)
+    for stale in sorted(OUTPUT_DIR.glob(OUTPUT_GLOB)):
+        if stale not in files:
+            remove_output(stale)
+            print(f"  removed stale {stale.relative_to(REPO_ROOT)}")
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate the Swift modality-ABI bindings from swift-modality-abi.yaml.")
+    parser.add_argument("--single-file", action="store_true",
+                        help=f"emit one {OUTPUT_PATH.name} instead of one file per modality")
+    args = parser.parse_args(argv)
 
-    output_parts: list[str] = []
-    output_parts.append(
-        render_header(modality_count=len(modalities), method_count=method_count)
-    )
-    output_parts.extend(enum_blocks)
-    output_parts.extend(method_blocks)
+    if not MANIFEST_PATH.exists():
+        sys.stderr.write(f"error: manifest not found at {MANIFEST_PATH}\n")
+        return 1
+
+    with MANIFEST_PATH.open("r", encoding="utf-8") as fh:
+        manifest = yaml.safe_load(fh)
 
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT_PATH.write_text("\n".join(output_parts), encoding="utf-8")
+    files, method_count = render(manifest, single_file=args.single_file)
+    out = write_outputs(files)
 
-    rel = OUTPUT_PATH.relative_to(REPO_ROOT)
-    print(f"GENERATED {rel} ({method_count} methods across {len(modalities)} modalities)")
+    modalities = manifest.get("modalities") or []
+    rel = OUTPUT_DIR.relative_to(REPO_ROOT)
+    print(f"{rel}: {len(files)} file(s), {method_count} methods across "
+          f"{len(modalities)} modalities ({out.summary()})")
     return 0
 
 
@@ -35,168 +35,42 @@
 #     message + proto3-optional fields unless explicitly defaulted.
 #   * Validate throws ValidationError from `./_errors` (hand-written, see
 #     sdk/shared/proto-ts/src/convenience/_errors.ts).
+#   * FromWireString matches with `wireStringMatches` from `./_wire`
+#     (hand-written, sdk/shared/proto-ts/src/convenience/_wire.ts).
 #
 # Invoked by generate_all.sh AFTER generate_ts.sh so the message / enum
 # names referenced by the convenience file are already on disk.
 
 from __future__ import annotations
 
-import os
-import subprocess
 import sys
-import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
 
 from google.protobuf import descriptor_pb2
 
-# --- RunAnywhere proto-annotation field numbers (mirror idl/rac_options.proto).
-RAC_DEFAULT_FIELD_NUM       = 50001
-RAC_REQUIRED_FIELD_NUM      = 50002
-RAC_MIN_FIELD_NUM           = 50004
-RAC_MAX_FIELD_NUM           = 50005
-RAC_MIN_FLOAT_FIELD_NUM     = 50006
-RAC_MAX_FLOAT_FIELD_NUM     = 50007
-RAC_DISPLAY_NAME_FIELD_NUM  = 50010
-RAC_ANALYTICS_KEY_FIELD_NUM = 50011
-RAC_WIRE_STRING_FIELD_NUM   = 50012
-
-# --- Proto wire type enums (mirror google/protobuf/descriptor.proto).
-TYPE_DOUBLE   = 1
-TYPE_FLOAT    = 2
-TYPE_INT64    = 3
-TYPE_UINT64   = 4
-TYPE_INT32    = 5
-TYPE_FIXED64  = 6
-TYPE_FIXED32  = 7
-TYPE_BOOL     = 8
-TYPE_STRING   = 9
-TYPE_MESSAGE  = 11
-TYPE_BYTES    = 12
-TYPE_UINT32   = 13
-TYPE_ENUM     = 14
-TYPE_SFIXED32 = 15
-TYPE_SFIXED64 = 16
-TYPE_SINT32   = 17
-TYPE_SINT64   = 18
+from _convenience_common import (
+    FLOAT_TYPES,
+    INTEGER_TYPES,
+    RAC_ANALYTICS_KEY_FIELD_NUM,
+    RAC_DISPLAY_NAME_FIELD_NUM,
+    RAC_WIRE_STRING_FIELD_NUM,
+    TYPE_BOOL,
+    TYPE_BYTES,
+    TYPE_ENUM,
+    TYPE_MESSAGE,
+    TYPE_STRING,
+    AnnotationIndex,
+    build_annotation_index,
+    load_file_descriptor_set,
+    wire_cases_by_length,
+)
+from _output import OutputWriter, remove_output
 
 LABEL_OPTIONAL = 1
 LABEL_REQUIRED = 2
 LABEL_REPEATED = 3
 
-_INTEGER_TYPES = frozenset((
-    TYPE_INT32, TYPE_INT64, TYPE_UINT32, TYPE_UINT64,
-    TYPE_FIXED32, TYPE_FIXED64, TYPE_SFIXED32, TYPE_SFIXED64,
-    TYPE_SINT32, TYPE_SINT64,
-))
-_FLOAT_TYPES = frozenset((TYPE_DOUBLE, TYPE_FLOAT))
-
-
-# --- Wire-format readers for unknown FieldOptions/EnumValueOptions extensions.
-# ts-proto strips rac_* annotations from generated source; we therefore
-# decode them straight off the descriptor's serialized bytes.
-
-def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
-    result = 0
-    shift = 0
-    while True:
-        if pos >= len(buf):
-            raise ValueError("truncated varint")
-        b = buf[pos]
-        pos += 1
-        result |= (b & 0x7F) << shift
-        if (b & 0x80) == 0:
-            return result, pos
-        shift += 7
-        if shift >= 64:
-            raise ValueError("varint too long")
-
-
-def _scan_fields(buf: bytes) -> Iterable[tuple[int, int, bytes | int]]:
-    pos = 0
-    while pos < len(buf):
-        tag, pos = _read_varint(buf, pos)
-        wt = tag & 0x07
-        fn = tag >> 3
-        if wt == 0:
-            val, pos = _read_varint(buf, pos)
-            yield fn, wt, val
-        elif wt == 2:
-            length, pos = _read_varint(buf, pos)
-            payload = buf[pos:pos + length]
-            pos += length
-            yield fn, wt, payload
-        elif wt == 1:  # 64-bit
-            pos += 8
-        elif wt == 5:  # 32-bit
-            pos += 4
-        else:
-            pass
-
-
-def _decode_string_field(buf: bytes, field_num: int) -> str | None:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 2:
-            return payload.decode("utf-8")
-    return None
-
-
-def _decode_bool_field(buf: bytes, field_num: int) -> bool | None:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 0:
-            return bool(payload)
-    return None
-
-
-def _decode_int32_field(buf: bytes, field_num: int) -> int | None:
-    for fn, wt, payload in _scan_fields(buf):
-        if fn == field_num and wt == 0:
-            v = int(payload) & 0xFFFFFFFF
-            if v & 0x80000000:
-                v -= 0x100000000
-            return v
-    return None
-
-
-def _decode_double_field(buf: bytes, field_num: int) -> float | None:
-    import struct
-    pos = 0
-    while pos < len(buf):
-        tag, pos = _read_varint(buf, pos)
-        wt = tag & 0x07
-        fn = tag >> 3
-        if wt == 1:
-            if fn == field_num:
-                return struct.unpack("<d", buf[pos:pos + 8])[0]
-            pos += 8
-        elif wt == 0:
-            _, pos = _read_varint(buf, pos)
-        elif wt == 2:
-            length, pos = _read_varint(buf, pos)
-            pos += length
-        elif wt == 5:
-            pos += 4
-        else:
-            pass
-    return None
-
-
-def _opt_string(opts, field_num: int) -> str | None:
-    return _decode_string_field(opts.SerializeToString(), field_num)
-
-
-def _opt_bool(opts, field_num: int) -> bool | None:
-    return _decode_bool_field(opts.SerializeToString(), field_num)
-
-
-def _opt_int32(opts, field_num: int) -> int | None:
-    return _decode_int32_field(opts.SerializeToString(), field_num)
-
-
-def _opt_double(opts, field_num: int) -> float | None:
-    return _decode_double_field(opts.SerializeToString(), field_num)
-
 
 # --- Naming utilities -----------------------------------------------------
 
@@ -258,12 +132,12 @@ def _ts_default_literal(
         if s in ("false", "0"):
             return "false"
         return None
-    if t in _INTEGER_TYPES:
+    if t in INTEGER_TYPES:
         try:
             return str(int(default_str))
         except ValueError:
             return None
-    if t in _FLOAT_TYPES:
+    if t in FLOAT_TYPES:
         try:
             v = float(default_str)
         except ValueError:
@@ -304,7 +178,7 @@ def _ts_zero_literal(
         return "''"
     if t == TYPE_BOOL:
         return "false"
-    if t in _INTEGER_TYPES or t in _FLOAT_TYPES:
+    if t in INTEGER_TYPES or t in FLOAT_TYPES:
         return "0"
     if t == TYPE_ENUM:
         # Bare numeric assignment matches ts-proto's createBase initialiser
@@ -326,6 +200,7 @@ class GeneratedFile:
     imports_from_self: set[str]            # symbols imported from `../<base>`
     imports_from_other: dict[str, set[str]]  # owner_file -> {symbols}
     needs_validation_error: bool
+    needs_wire_match: bool
     enum_helpers_emitted: int
     defaults_emitted: int
     validate_emitted: int
@@ -344,14 +219,13 @@ def _emit_enum_accessor(
     enum_desc: descriptor_pb2.EnumDescriptorProto,
     function_name: str,
     field_num: int,
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `export const <function_name> = (e: <Enum>): string => { ... }`
     when at least one enum value carries the annotation; otherwise None."""
     cases: list[tuple[str, str]] = []
     for value in enum_desc.value:
-        if not value.HasField("options"):
-            continue
-        annotated = _opt_string(value.options, field_num)
+        annotated = index.value(proto_enum_name, value.name).by_field_num(field_num)
         if annotated is None:
             continue
         # Escape both backslash and backtick for safe inclusion in template literals.
@@ -378,30 +252,48 @@ def _emit_enum_reverse_factory(
     enum_desc: descriptor_pb2.EnumDescriptorProto,
     function_name: str,
     field_num: int,
+    index: AnnotationIndex,
+    wire_match_used: list[bool],
 ) -> str | None:
     """Emit reverse-lookup helper: `s -> <Enum> | undefined`. Returns None
     when no values are annotated. Matches case-insensitively against the
-    annotation value, mirroring the Swift `from(wireString:)` factory."""
+    annotation value, mirroring the Swift `from(wireString:)` factory:
+    switches on `s.length` and compares with `wireStringMatches` from the
+    hand-written `./_wire` (sets `wire_match_used[0]`), so no lowercased
+    copy is allocated."""
     cases: list[tuple[str, str]] = []
     for value in enum_desc.value:
-        if not value.HasField("options"):
-            continue
-        annotated = _opt_string(value.options, field_num)
+        annotated = index.value(proto_enum_name, value.name).by_field_num(field_num)
         if annotated is None:
             continue
-        safe = annotated.replace("\\", "\\\\").replace("'", "\\'").lower()
-        cases.append((value.name, safe))
+        cases.append((value.name, annotated.lower()))
     if not cases:
         return None
 
+    def literal(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("'", "\\'")
+
     lines: list[str] = []
     lines.append(
         f"export const {function_name} = (s: string): {proto_enum_name} | undefined => {{"
     )
-    lines.append("  switch (s.toLowerCase()) {")
-    for const_name, value in cases:
-        lines.append(f"    case '{value}':")
-        lines.append(f"      return {proto_enum_name}.{const_name};")
+    buckets = wire_cases_by_length(cases)
+    if buckets is None:
+        lines.append("  switch (s.toLowerCase()) {")
+        for const_name, value in cases:
+            lines.append(f"    case '{literal(value)}':")
+            lines.append(f"      return {proto_enum_name}.{const_name};")
+    else:
+        wire_match_used[0] = True
+        lines.append("  switch (s.length) {")
+        for length, bucket in buckets:
+            lines.append(f"    case {length}:")
+            for const_name, value in bucket:
+                lines.append(
+                    f"      if (wireStringMatches(s, '{literal(value)}')) "
+                    f"return {proto_enum_name}.{const_name};"
+                )
+            lines.append("      return undefined;")
     lines.append("    default:")
     lines.append("      return undefined;")
     lines.append("  }")
@@ -414,6 +306,7 @@ def _emit_message_defaults(
     enum_const_names: dict[str, set[str]],
     enum_owner_file: dict[str, str],
     needed_other_imports: dict[str, set[str]],
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `export const <msgName>Defaults = (): <Msg> => ({ ... });`.
 
@@ -427,9 +320,7 @@ def _emit_message_defaults(
 
     for field in msg_desc.field:
         ts_field = _proto_field_to_ts_camel(field.name)
-        rac_default: str | None = None
-        if field.HasField("options"):
-            rac_default = _opt_string(field.options, RAC_DEFAULT_FIELD_NUM)
+        rac_default = index.field(msg_name, field.name).default
         if rac_default is not None:
             has_any_default = True
 
@@ -476,6 +367,7 @@ def _emit_message_defaults(
 
 def _emit_message_validate(
     msg_desc: descriptor_pb2.DescriptorProto,
+    index: AnnotationIndex,
 ) -> str | None:
     """Emit `export const validate<Msg> = (m: <Msg>): void => { ... };`
     when at least one field carries a validation annotation. Returns None
@@ -500,11 +392,12 @@ def _emit_message_validate(
         if not field.HasField("options"):
             continue
         ts_field = _proto_field_to_ts_camel(field.name)
-        is_required = _opt_bool(field.options, RAC_REQUIRED_FIELD_NUM) or False
-        min_int = _opt_int32(field.options, RAC_MIN_FIELD_NUM)
-        max_int = _opt_int32(field.options, RAC_MAX_FIELD_NUM)
-        min_f = _opt_double(field.options, RAC_MIN_FLOAT_FIELD_NUM)
-        max_f = _opt_double(field.options, RAC_MAX_FLOAT_FIELD_NUM)
+        ann = index.field(msg_name, field.name)
+        is_required = ann.required or False
+        min_int = ann.min
+        max_int = ann.max
+        min_f = ann.min_float
+        max_f = ann.max_float
         # proto3 explicit-optional fields are typed `T | undefined` on the
         # ts-proto wire type, so direct numeric/string comparisons need a
         # presence guard. When unset, validation is intentionally skipped:
@@ -517,7 +410,7 @@ def _emit_message_validate(
             zero_check: str | None = None
             if t == TYPE_STRING:
                 zero_check = f"{opt_guard}m.{ts_field} === ''"
-            elif t in _INTEGER_TYPES or t in _FLOAT_TYPES:
+            elif t in INTEGER_TYPES or t in FLOAT_TYPES:
                 zero_check = f"{opt_guard}m.{ts_field} === 0"
             # pass3-syn-038: TYPE_BOOL deliberately skips the required-check
             # to match Swift / Kotlin / Dart cross-SDK behaviour. The other
@@ -533,7 +426,7 @@ def _emit_message_validate(
                 checks.extend(_throw(field.name, f"'{field.name} is required'"))
                 checks.append("  }")
 
-        if (min_int is not None or max_int is not None) and field.type in _INTEGER_TYPES:
+        if (min_int is not None or max_int is not None) and field.type in INTEGER_TYPES:
             parts: list[str] = []
             if min_int is not None:
                 parts.append(f"m.{ts_field} < {min_int}")
@@ -554,7 +447,7 @@ def _emit_message_validate(
             checks.extend(_throw(field.name, msg_literal))
             checks.append("  }")
 
-        if (min_f is not None or max_f is not None) and field.type in _FLOAT_TYPES:
+        if (min_f is not None or max_f is not None) and field.type in FLOAT_TYPES:
             parts = []
             if min_f is not None:
                 parts.append(f"m.{ts_field} < {min_f}")
@@ -631,6 +524,7 @@ def _process_file(
     file_desc: descriptor_pb2.FileDescriptorProto,
     enum_owner_file: dict[str, str],
     enum_const_names: dict[str, set[str]],
+    index: AnnotationIndex,
 ) -> GeneratedFile | None:
     base = _file_basename(file_desc)
     blocks: list[str] = []
@@ -640,6 +534,7 @@ def _process_file(
     defaults_emitted = 0
     validate_emitted = 0
     needs_validation_error = False
+    wire_match_used = [False]
 
     # Top-level enums -> wireString / displayName / analyticsKey + reverse.
     for enum_desc in file_desc.enum_type:
@@ -648,12 +543,13 @@ def _process_file(
         per_enum_blocks: list[str] = []
 
         wire_block = _emit_enum_accessor(
-            enum_name, enum_desc, f"{prefix}WireString", RAC_WIRE_STRING_FIELD_NUM,
+            enum_name, enum_desc, f"{prefix}WireString", RAC_WIRE_STRING_FIELD_NUM, index,
         )
         if wire_block is not None:
             per_enum_blocks.append(wire_block)
             reverse_block = _emit_enum_reverse_factory(
                 enum_name, enum_desc, f"{prefix}FromWireString", RAC_WIRE_STRING_FIELD_NUM,
+                index, wire_match_used,
             )
             if reverse_block is not None:
                 per_enum_blocks.append(reverse_block)
@@ -663,7 +559,7 @@ def _process_file(
             ("AnalyticsKey", RAC_ANALYTICS_KEY_FIELD_NUM),
         ):
             block = _emit_enum_accessor(
-                enum_name, enum_desc, f"{prefix}{fn_suffix}", field_num,
+                enum_name, enum_desc, f"{prefix}{fn_suffix}", field_num, index,
             )
             if block is not None:
                 per_enum_blocks.append(block)
@@ -676,14 +572,14 @@ def _process_file(
     # Top-level messages -> defaults() / validate().
     for msg_desc in file_desc.message_type:
         defaults_block = _emit_message_defaults(
-            msg_desc, enum_const_names, enum_owner_file, imports_from_other,
+            msg_desc, enum_const_names, enum_owner_file, imports_from_other, index,
         )
         if defaults_block is not None:
             imports_from_self.add(msg_desc.name)
             blocks.append(defaults_block)
             defaults_emitted += 1
 
-        validate_block = _emit_message_validate(msg_desc)
+        validate_block = _emit_message_validate(msg_desc, index)
         if validate_block is not None:
             imports_from_self.add(msg_desc.name)
             blocks.append(validate_block)
@@ -703,6 +599,7 @@ def _process_file(
         imports_from_self=imports_from_self,
         imports_from_other=imports_from_other,
         needs_validation_error=needs_validation_error,
+        needs_wire_match=wire_match_used[0],
         enum_helpers_emitted=enum_helpers_emitted,
         defaults_emitted=defaults_emitted,
         validate_emitted=validate_emitted,
@@ -739,6 +636,8 @@ def _render_file(generated: GeneratedFile) -> str:
         import_lines.append(f"import {{ {symbols} }} from '../{owner}';")
     if generated.needs_validation_error:
         import_lines.append("import { ValidationError } from './_errors';")
+    if generated.needs_wire_match:
+        import_lines.append("import { wireStringMatches } from './_wire';")
 
     sections: list[str] = []
     sections.append("\n".join(header))
@@ -751,60 +650,43 @@ def _render_file(generated: GeneratedFile) -> str:
 
 # --- Top-level driver -----------------------------------------------------
 
-def _build_descriptor_set(proto_dir: Path, proto_files: list[Path]) -> Path:
-    fd, set_path = tempfile.mkstemp(prefix="rac-fds-ts-", suffix=".pb")
-    os.close(fd)
-    cmd = [
-        "protoc",
-        f"--proto_path={proto_dir}",
-        f"--descriptor_set_out={set_path}",
-        "--include_imports",
-        *[str(p) for p in proto_files],
-    ]
-    subprocess.run(cmd, check=True)
-    return Path(set_path)
-
-
-def _clean_stale_outputs(out_dir: Path, written: set[str]) -> None:
+def _clean_stale_outputs(out_dir: Path, owned: set[str]) -> None:
     """Drop generator-owned `*_convenience.ts` files that this run did not
-    rewrite. The hand-written `_errors.ts` (and any other underscore-prefix
+    produce. The hand-written `_errors.ts` / `_wire.ts` (and any other underscore-prefix
     file) is preserved — it is part of the source tree, not a generator
     artefact."""
     if not out_dir.is_dir():
         return
     for path in out_dir.glob("*_convenience.ts"):
-        if path.name not in written:
-            path.unlink()
+        if path.name not in owned:
+            remove_output(path)
 
 
-def main() -> int:
-    script_dir = Path(__file__).resolve().parent
-    repo_root = script_dir.parent.parent
-    proto_dir = repo_root / "idl"
+def generate(
+    fds: descriptor_pb2.FileDescriptorSet,
+    repo_root: Path,
+    index: AnnotationIndex | None = None,
+    only: set[str] | None = None,
+) -> int:
+    """Write the per-proto *_convenience.ts files for `fds` under
+    `repo_root`. Shared by main() and the one-process driver
+    (generate_convenience.py).
+
+    `only` (proto names, e.g. ``llm_options.proto``) limits the rewrite to
+    those protos, for the driver's incremental mode. The existing outputs of
+    every other proto are kept, so `_clean_stale_outputs` drops exactly
+    what a full run would."""
     out_dir = repo_root / "sdk" / "shared" / "proto-ts" / "src" / "convenience"
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    proto_files = sorted(proto_dir.glob("*.proto"))
-    if not proto_files:
-        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
-        return 0
-
-    set_path = _build_descriptor_set(proto_dir, proto_files)
-    try:
-        fds = descriptor_pb2.FileDescriptorSet()
-        fds.ParseFromString(set_path.read_bytes())
-    finally:
-        try:
-            set_path.unlink()
-        except OSError:
-            pass
-
     enum_owner_file, _msg_owner_file, enum_const_names = (
         _collect_message_symbols_per_file(fds)
     )
+    if index is None:
+        index = build_annotation_index(fds)
 
-    written: set[str] = set()
+    owned: set[str] = set()
+    out = OutputWriter()
+    skipped = 0
     total_enum_helpers = 0
     total_defaults = 0
     total_validate = 0
@@ -812,25 +694,43 @@ def main() -> int:
     for file_desc in fds.file:
         if file_desc.package != "runanywhere.v1":
             continue
-        generated = _process_file(file_desc, enum_owner_file, enum_const_names)
+        if only is not None and file_desc.name not in only:
+            kept = out_dir / f"{_file_basename(file_desc)}_convenience.ts"
+            if kept.is_file():
+                owned.add(kept.name)
+                skipped += 1
+            continue
+        generated = _process_file(file_desc, enum_owner_file, enum_const_names, index)
         if generated is None:
             continue
         out_path = out_dir / f"{generated.base_name}_convenience.ts"
-        out_path.write_text(_render_file(generated), encoding="utf-8")
-        written.add(out_path.name)
+        out.write(out_path, _render_file(generated))
+        owned.add(out_path.name)
         total_enum_helpers += generated.enum_helpers_emitted
         total_defaults += generated.defaults_emitted
         total_validate += generated.validate_emitted
 
-    _clean_stale_outputs(out_dir, written)
+    _clean_stale_outputs(out_dir, owned)
 
     print(f"✓ TypeScript convenience post-processor → {out_dir}")
-    print(f"  files written: {len(written)}")
+    print(f"  files: {out.summary()}")
+    if skipped:
+        print(f"  files up to date: {skipped}")
     print(f"  enum-accessor blocks emitted: {total_enum_helpers}")
     print(f"  message Defaults factories emitted: {total_defaults}")
     print(f"  validate<Msg> helpers emitted: {total_validate}")
     return 0
 
 
+def main() -> int:
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    proto_dir = repo_root / "idl"
+    fds = load_file_descriptor_set(proto_dir)
+    if fds is None:
+        print(f"warning: no .proto files in {proto_dir}", file=sys.stderr)
+        return 0
+    return generate(fds, repo_root)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+#
+# Scaling benchmark for the codegen scripts in idl/codegen/.
+#
+# test_convenience_generators.py pins *what* the generators emit for one
+# small fixture; nothing measured how they scale as the IDL grows. This
+# harness synthesizes proto packages of N messages x M annotated fields x K
+# enums (plus a swift-modality-abi.yaml grown in proportion), runs every
+# generator against them and records, per size and generator:
+#
+#   - wall time (best of --repeat runs, cold output tree each run),
+#   - peak RSS of the generator process,
+#   - protoc time to build the synthetic FileDescriptorSet.
+#
+# Results are compared against a JSON baseline. A metric that grew by more
+# than --threshold (relative) AND by more than a small absolute noise floor
+# is reported as a regression and fails the run (exit 1). The report also
+# prints each generator's growth between consecutive sizes, so superlinear
+# scaling shows up before the production IDL doubles.
+#
+# Sandbox: as in test_convenience_generators.py, the codegen/ tree is copied
+# into a temp repo whose idl/ holds rac_options.proto + the synthetic protos;
+# the generators resolve every path from `__file__` and never touch the real
+# tree. The descriptor cache is pointed into the sandbox and warmed before
+# timing, so generator wall time excludes protoc (reported separately).
+#
+# Usage
+# -----
+#
+#   # Record a baseline on this machine (timings are machine-specific):
+#   python3 idl/codegen/tests/bench_codegen.py --update-baseline
+#
+#   # Compare against it:
+#   python3 idl/codegen/tests/bench_codegen.py
+#
+#   # Custom sizes (NxMxK), stricter threshold, explicit baseline file:
+#   python3 idl/codegen/tests/bench_codegen.py --size 40x8x10 --size 400x8x100 \
+#       --threshold 0.15 --baseline /tmp/codegen-bench.json
+#
+# Exit code: 0 when no regression (or baseline updated / absent), 1 on a
+# regression or generator failure, 2 if the toolchain is missing.
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+SCRIPT_DIR  = Path(__file__).resolve().parent
+REPO_ROOT   = SCRIPT_DIR.parent.parent.parent
+CODEGEN_DIR = REPO_ROOT / "idl" / "codegen"
+
+RAC_OPTIONS_PROTO = REPO_ROOT / "idl" / "rac_options.proto"
+MODALITY_MANIFEST = CODEGEN_DIR / "swift-modality-abi.yaml"
+
+BASELINE_FORMAT = 1
+
+# (messages, annotated fields per message, enums). The default ladder
+# quadruples each step, roughly today's IDL -> 4x -> 16x.
+DEFAULT_SIZES = ["40x8x10", "160x8x40", "640x8x160"]
+
+# Messages (and enums) per synthetic .proto file; every file after the
+# first imports its predecessor, so cross-file enum references and import
+# closures are exercised too.
+MESSAGES_PER_FILE = 10
+
+# Regressions must clear both the relative threshold and these absolute
+# floors, so timer jitter on millisecond-scale runs is not flagged.
+NOISE_FLOOR = {"wall_ms": 25.0, "protoc_ms": 25.0, "peak_rss_kb": 4096.0}
+
+# Label -> generator script (run as a subprocess from the sandbox).
+GENERATORS: dict[str, str] = {
+    "swift":        "generate_swift_convenience.py",
+    "kotlin":       "generate_kotlin_convenience.py",
+    "dart":         "generate_dart_convenience.py",
+    "ts":           "generate_ts_convenience.py",
+    "driver":       "generate_convenience.py",
+    "modality_abi": "generate_swift_modality_abi.py",
+}
+
+
+@dataclass(frozen=True)
+class Size:
+    messages: int
+    fields: int
+    enums: int
+
+    @classmethod
+    def parse(cls, text: str) -> "Size":
+        try:
+            n, m, k = (int(part) for part in text.lower().split("x"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"size must be NxMxK, got {text!r}") from None
+        if n < 1 or m < 1 or k < 1:
+            raise argparse.ArgumentTypeError(f"size components must be >= 1, got {text!r}")
+        return cls(n, m, k)
+
+    def __str__(self) -> str:
+        return f"{self.messages}x{self.fields}x{self.enums}"
+
+
+# ---------------------------------------------------------------------------
+# Toolchain checks.
+# ---------------------------------------------------------------------------
+
+def check_toolchain() -> int:
+    """Return 0 if protoc + python protobuf runtime are available, 2 otherwise."""
+    if shutil.which("protoc") is None:
+        print("error: protoc not found on PATH.", file=sys.stderr)
+        return 2
+    try:
+        import google.protobuf  # noqa: F401
+    except ImportError:
+        print("error: python protobuf runtime not installed; "
+              "run `pip install protobuf`.", file=sys.stderr)
+        return 2
+    return 0
+
+
+def have_yaml() -> bool:
+    try:
+        import yaml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Synthetic schemas.
+# ---------------------------------------------------------------------------
+
+_FILE_OPTIONS = """\
+option java_multiple_files   = true;
+option java_package          = "ai.runanywhere.proto.v1";
+option objc_class_prefix     = "RAV1";
+option swift_prefix          = "RA";
+"""
+
+
+def _enum_block(name: str, values: int = 4) -> str:
+    prefix = "".join("_" + c if c.isupper() else c.upper() for c in name).lstrip("_")
+    lines = [f"enum {name} {{"]
+    for v in range(values):
+        label = "UNSPECIFIED" if v == 0 else f"V{v}"
+        lines.append(
+            f"    {prefix}_{label} = {v} [\n"
+            f"        (runanywhere.v1.rac_display_name)  = \"{name} {label}\",\n"
+            f"        (runanywhere.v1.rac_analytics_key) = \"{label.lower()}\",\n"
+            f"        (runanywhere.v1.rac_wire_string)   = \"{name.lower()}_{label.lower()}\"\n"
+            f"    ];"
+        )
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _field(index: int, enum_name: str | None) -> str:
+    """One annotated field; the type cycles through every annotation path
+    the emitters implement."""
+    number = index + 1
+    kind = index % 7
+    if kind == 0:
+        return (f"    string text_{number} = {number} [(runanywhere.v1.rac_default) = \"v{number}\", "
+                f"(runanywhere.v1.rac_required) = true];")
+    if kind == 1:
+        return (f"    int32 count_{number} = {number} [(runanywhere.v1.rac_default) = \"{number}\", "
+                f"(runanywhere.v1.rac_min) = 0, (runanywhere.v1.rac_max) = {number * 100}];")
+    if kind == 2:
+        return (f"    int64 size_{number} = {number} [(runanywhere.v1.rac_default) = \"{number * 1024}\", "
+                f"(runanywhere.v1.rac_min) = 1, (runanywhere.v1.rac_max) = 1048576];")
+    if kind == 3:
+        return (f"    float ratio_{number} = {number} [(runanywhere.v1.rac_default) = \"0.5\", "
+                f"(runanywhere.v1.rac_min_float) = 0.0, (runanywhere.v1.rac_max_float) = 1.0];")
+    if kind == 4:
+        return (f"    double weight_{number} = {number} [(runanywhere.v1.rac_default) = \"0.25\", "
+                f"(runanywhere.v1.rac_min_float) = 0.0, (runanywhere.v1.rac_max_float) = 4.0];")
+    if kind == 5:
+        return (f"    bool flag_{number} = {number} [(runanywhere.v1.rac_default) = \"true\", "
+                f"(runanywhere.v1.rac_required) = true];")
+    if enum_name is None:
+        return f"    string note_{number} = {number} [(runanywhere.v1.rac_required) = true];"
+    prefix = "".join("_" + c if c.isupper() else c.upper() for c in enum_name).lstrip("_")
+    return (f"    {enum_name} mode_{number} = {number} "
+            f"[(runanywhere.v1.rac_default) = \"{prefix}_V1\"];")
+
+
+def synthesize_protos(size: Size, idl_dir: Path) -> list[Path]:
+    """Write bench_NNN.proto files for `size` into `idl_dir`."""
+    files = max(1, -(-size.messages // MESSAGES_PER_FILE))
+    enums_per_file = [size.enums // files + (1 if i < size.enums % files else 0) for i in range(files)]
+    paths: list[Path] = []
+    previous_enum: str | None = None
+    for i in range(files):
+        name = f"bench_{i:03d}.proto"
+        imports = ['import "rac_options.proto";']
+        if i:
+            imports.append(f'import "bench_{i - 1:03d}.proto";')
+        enum_names = [f"BenchMode{i:03d}E{k}" for k in range(enums_per_file[i])]
+        blocks = [_enum_block(e) for e in enum_names]
+        first = i * MESSAGES_PER_FILE
+        for n in range(first, min(first + MESSAGES_PER_FILE, size.messages)):
+            # Alternate between a local enum and the previous file's, so
+            # half the enum defaults resolve through an import.
+            local = enum_names[n % len(enum_names)] if enum_names else None
+            enum_name = previous_enum if (n % 2 and previous_enum) else (local or previous_enum)
+            fields = "\n".join(_field(f, enum_name) for f in range(size.fields))
+            blocks.append(f"message BenchConfig{n:04d} {{\n{fields}\n}}")
+        if enum_names:
+            previous_enum = enum_names[-1]
+        text = (
+            "// Synthetic schema generated by idl/codegen/tests/bench_codegen.py.\n"
+            'syntax = "proto3";\n\npackage runanywhere.v1;\n\n'
+            + "\n".join(imports) + "\n\n" + _FILE_OPTIONS + "\n"
+            + "\n\n".join(blocks) + "\n"
+        )
+        path = idl_dir / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def synthesize_manifest(size: Size, out_path: Path) -> int:
+    """Grow the real swift-modality-abi.yaml to ~one modality per 10
+    messages by cloning its modalities under fresh names/symbols. Returns
+    the modality count."""
+    import yaml
+
+    manifest = yaml.safe_load(MODALITY_MANIFEST.read_text(encoding="utf-8"))
+    source = manifest.get("modalities") or []
+    target = max(len(source), size.messages // MESSAGES_PER_FILE)
+    modalities = []
+    for i in range(target):
+        modality = json.loads(json.dumps(source[i % len(source)]))
+        copy = i // len(source)
+        if copy:
+            modality["name"] = f"{modality['name']}Bench{copy}"
+            for method in modality.get("methods", []):
+                if method.get("c_symbol"):
+                    method["c_symbol"] = f"{method['c_symbol']}_bench{copy}"
+        modalities.append(modality)
+    manifest["modalities"] = modalities
+    out_path.write_text(yaml.safe_dump(manifest, sort_keys=False), encoding="utf-8")
+    return len(modalities)
+
+
+# ---------------------------------------------------------------------------
+# Measurement.
+# ---------------------------------------------------------------------------
+
+def _maxrss_kb(rusage) -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return rusage.ru_maxrss / 1024.0 if sys.platform == "darwin" else float(rusage.ru_maxrss)
+
+
+def run_measured(cmd: list[str], env: dict[str, str]) -> tuple[int, float, float, str]:
+    """Run `cmd`; returns (exit code, wall ms, peak RSS KiB, stderr)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = proc.stderr.read().decode("utf-8", "replace")
+    _, status, rusage = os.wait4(proc.pid, 0)
+    wall_ms = (time.perf_counter() - start) * 1000
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    proc.stderr.close()
+    return proc.returncode, wall_ms, _maxrss_kb(rusage), stderr
+
+
+def build_sandbox(sandbox: Path, size: Size, with_manifest: bool) -> list[Path]:
+    (sandbox / "idl").mkdir(parents=True)
+    shutil.copy(RAC_OPTIONS_PROTO, sandbox / "idl" / "rac_options.proto")
+    shutil.copytree(CODEGEN_DIR, sandbox / "idl" / "codegen",
+                    ignore=shutil.ignore_patterns("__pycache__", "tests"))
+    if with_manifest:
+        synthesize_manifest(size, sandbox / "idl" / "codegen" / "swift-modality-abi.yaml")
+    return synthesize_protos(size, sandbox / "idl")
+
+
+def bench_size(size: Size, labels: list[str], repeat: int) -> tuple[dict, list[str]]:
+    failures: list[str] = []
+    result: dict = {}
+    with tempfile.TemporaryDirectory(prefix="rac-codegen-bench-") as tmp:
+        sandbox = Path(tmp) / "repo"
+        protos = build_sandbox(sandbox, size, "modality_abi" in labels)
+        codegen = sandbox / "idl" / "codegen"
+        env = dict(os.environ, RAC_DESCRIPTOR_CACHE_DIR=str(Path(tmp) / "cache"))
+
+        protoc_ms = float("inf")
+        fds_out = Path(tmp) / "bench.pb"
+        for _ in range(repeat):
+            code, wall, _, stderr = run_measured(
+                ["protoc", f"--proto_path={sandbox / 'idl'}", f"--descriptor_set_out={fds_out}",
+                 "--include_imports", *map(str, protos)], env)
+            if code:
+                return {}, [f"[{size}] protoc exited {code}: {stderr.strip()}"]
+            protoc_ms = min(protoc_ms, wall)
+        result["protoc_ms"] = round(protoc_ms, 1)
+        result["protos"] = len(protos)
+
+        # Warm the descriptor cache so the timed runs measure the generators.
+        subprocess.run([sys.executable, str(codegen / "_descriptor_cache.py"), str(sandbox / "idl")],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+
+        generators: dict[str, dict] = {}
+        for label in labels:
+            best_wall, peak = float("inf"), 0.0
+            for _ in range(repeat):
+                shutil.rmtree(sandbox / "sdk", ignore_errors=True)  # cold output tree
+                code, wall, rss, stderr = run_measured(
+                    [sys.executable, str(codegen / GENERATORS[label])], env)
+                if code:
+                    failures.append(f"[{size}] {label} exited {code}: {stderr.strip()}")
+                    break
+                best_wall, peak = min(best_wall, wall), max(peak, rss)
+            else:
+                generators[label] = {"wall_ms": round(best_wall, 1), "peak_rss_kb": round(peak)}
+        result["generators"] = generators
+    return result, failures
+
+
+# ---------------------------------------------------------------------------
+# Baseline.
+# ---------------------------------------------------------------------------
+
+def default_baseline_path() -> Path:
+    # Timings are machine-specific, so the default baseline lives with the
+    # other per-machine codegen state (see _descriptor_cache.py).
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "runanywhere-idl" / "bench-baseline.json"
+
+
+def environment() -> dict[str, str]:
+    protoc = subprocess.run(["protoc", "--version"], capture_output=True, text=True).stdout.strip()
+    return {"python": platform.python_version(), "platform": platform.platform(), "protoc": protoc}
+
+
+def _regressed(metric: str, old: float, new: float, threshold: float) -> bool:
+    return new > old * (1 + threshold) and new - old > NOISE_FLOOR[metric]
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    regressions: list[str] = []
+    for size, now in current.items():
+        then = baseline.get(size)
+        if not then:
+            continue
+        if _regressed("protoc_ms", then["protoc_ms"], now["protoc_ms"], threshold):
+            regressions.append(f"[{size}] protoc: {then['protoc_ms']:.0f} -> {now['protoc_ms']:.0f} ms")
+        for label, metrics in now["generators"].items():
+            old = then.get("generators", {}).get(label)
+            if not old:
+                continue
+            for metric, unit in (("wall_ms", "ms"), ("peak_rss_kb", "KiB")):
+                if _regressed(metric, old[metric], metrics[metric], threshold):
+                    regressions.append(f"[{size}] {label} {metric}: "
+                                       f"{old[metric]:.0f} -> {metrics[metric]:.0f} {unit}")
+    return regressions
+
+
+def print_report(sizes: list[Size], results: dict, labels: list[str]) -> None:
+    header = f"{'size':>12} {'protoc':>9} " + " ".join(f"{label:>13}" for label in labels)
+    print(header)
+    print("-" * len(header))
+    for size in sizes:
+        r = results.get(str(size))
+        if not r:
+            continue
+        cells = []
+        for label in labels:
+            g = r["generators"].get(label)
+            cells.append(f"{g['wall_ms']:>7.0f}ms/{g['peak_rss_kb'] / 1024:>3.0f}M" if g else f"{'-':>13}")
+        print(f"{str(size):>12} {r['protoc_ms']:>7.0f}ms " + " ".join(cells))
+
+    # Growth between consecutive sizes: time ratio / message ratio. ~1.0 is
+    # linear; well above 1.0 is superlinear and worth a look.
+    for small, large in zip(sizes, sizes[1:]):
+        a, b = results.get(str(small)), results.get(str(large))
+        if not a or not b:
+            continue
+        scale = large.messages * large.fields / (small.messages * small.fields)
+        parts = []
+        for label in labels:
+            ga, gb = a["generators"].get(label), b["generators"].get(label)
+            if ga and gb and ga["wall_ms"] > 0:
+                parts.append(f"{label} {gb['wall_ms'] / ga['wall_ms'] / scale:.2f}")
+        print(f"growth {small} -> {large} (time ratio / size ratio {scale:.1f}x): " + ", ".join(parts))
+
+
+# ---------------------------------------------------------------------------
+# Main.
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Scaling benchmark for idl/codegen generators on synthetic schemas.")
+    parser.add_argument("--size", action="append", type=Size.parse, default=None,
+                        help=f"NxMxK: messages x annotated fields x enums "
+                             f"(repeatable; default: {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--generator", action="append", choices=list(GENERATORS), default=None,
+                        help="generators to run (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per measurement; the fastest is kept (default: 3)")
+    parser.add_argument("--baseline", type=Path, default=default_baseline_path(),
+                        help="baseline JSON (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative growth that counts as a regression (default: 0.25)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write this run's results as the new baseline")
+    parser.add_argument("--json", type=Path, default=None,
+                        help="also write this run's results to PATH")
+    args = parser.parse_args()
+
+    rc = check_toolchain()
+    if rc != 0:
+        return rc
+
+    sizes = sorted(args.size or [Size.parse(s) for s in DEFAULT_SIZES],
+                   key=lambda s: s.messages * s.fields)
+    labels = args.generator or list(GENERATORS)
+    if "modality_abi" in labels and not have_yaml():
+        print("warning: PyYAML not installed; skipping modality_abi.", file=sys.stderr)
+        labels = [label for label in labels if label != "modality_abi"]
+
+    results: dict = {}
+    failures: list[str] = []
+    for size in sizes:
+        print(f"-- benchmarking {size} (messages x fields x enums) ...")
+        result, errors = bench_size(size, labels, max(1, args.repeat))
+        failures.extend(errors)
+        if result:
+            results[str(size)] = result
+
+    print()
+    print_report(sizes, results, labels)
+    document = {"format": BASELINE_FORMAT, "environment": environment(), "results": results}
+    if args.json:
+        args.json.write_text(json.dumps(document, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+    if failures:
+        print(file=sys.stderr)
+        for f in failures:
+            print(f, file=sys.stderr)
+        return 1
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(document, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}.")
+        return 0
+
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        print(f"\nNo baseline at {args.baseline}; record one with --update-baseline.")
+        return 0
+    if baseline.get("format") != BASELINE_FORMAT:
+        print(f"\nBaseline at {args.baseline} has an old format; re-record it with --update-baseline.")
+        return 0
+    if baseline.get("environment") != document["environment"]:
+        print("\nnote: baseline was recorded in a different environment "
+              f"({baseline.get('environment')}); comparisons may be noisy.")
+
+    regressions = compare(baseline["results"], results, args.threshold)
+    if regressions:
+        print(f"\nFAIL: {len(regressions)} regression(s) beyond {args.threshold:.0%}:", file=sys.stderr)
+        for r in regressions:
+            print(f"  {r}", file=sys.stderr)
+        return 1
+    print(f"\nOK: no regression beyond {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
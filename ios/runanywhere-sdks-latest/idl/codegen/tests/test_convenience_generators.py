@@ -13,20 +13,19 @@
 #      test_options.proto (which applies every rac_* option to every
 #      relevant scalar type) plus the canonical idl/rac_options.proto.
 #
-#   2. Runs each generator against that fixture FDS, writing the output
-#      to a temp directory.
+#   2. Runs all four emitters against that fixture FDS, in-process and in
+#      parallel, through generate_convenience.render(): every emitter's
+#      `generate(fds, repo_root, index)` runs under _output.capture(), so
+#      the rendered files come back in memory and nothing is written.
 #
 #   3. Diffs the per-language output against the committed goldens at
 #      idl/codegen/tests/golden/{swift,kotlin,dart,ts}.expected.
 #
-# Approach: each generator's `main()` reads `proto_dir = repo_root / "idl"`
-# and writes to a fixed SDK output path, with `repo_root` computed from
-# `__file__`. To run them against the fixture in isolation, we copy the
-# entire idl/codegen/ tree into a tempdir sandbox and populate
-# `sandbox/idl/` with only `rac_options.proto` + the fixture. The
-# generators then compute their own paths via `Path(__file__).resolve()`
-# and operate purely on the sandbox — they never see or touch the real
-# repo's idl/ or SDK source trees.
+# Approach: the set is built once with a single protoc call (fixtures/ and
+# idl/ on the include path), the annotation index once, and the emitters
+# render against a virtual `repo_root` that never exists on disk. There is
+# no sandbox copy of idl/codegen/ and no per-generator interpreter, so the
+# whole run takes well under a second.
 #
 # Usage
 # -----
@@ -40,24 +39,19 @@
 # Exit code: 0 on success, 1 if any generator output diverges from its
 # golden, 2 if the toolchain (protoc, python protobuf) is missing.
 #
-# CI integration: not currently wired into pr-build.yml. Running this in
-# CI requires protoc on PATH and the Python protobuf runtime installed —
-# both are already prerequisites for the existing idl-drift-check.yml
-# workflow, so the additional cost is two subprocess invocations per
-# language. A follow-up patch may add a `convenience-smoke` job that
-# invokes this script after idl-drift-check; see pass2-syn-056 for the
-# rationale and the dormant-bug surface this smoke test catches.
+# CI integration: runs as the "Convenience generator smoke test" step of
+# idl-drift-check.yml; it is cheap enough to run on every commit.
 
 from __future__ import annotations
 
 import argparse
 import difflib
-import os
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import time
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -70,11 +64,16 @@ GOLDEN_DIR  = TESTS_DIR / "golden"
 FIXTURE_PROTO     = FIXTURE_DIR / "test_options.proto"
 RAC_OPTIONS_PROTO = REPO_ROOT / "idl" / "rac_options.proto"
 
+# The `repo_root` the emitters render against. It is never created: under
+# capture() nothing reaches the disk, and the emitters only read it to find
+# stale outputs (there are none).
+VIRTUAL_ROOT = Path(tempfile.gettempdir()) / "rac-convenience-test-virtual-root"
+
 
 # Each tuple = (language label, generator filename, relative output path
-# under the sandbox repo). The relative output path mirrors each
-# generator's hard-coded SDK output location; we read the resulting file
-# from inside the sandbox after running the generator.
+# under the virtual repo). The relative output path mirrors each
+# generator's hard-coded SDK output location; we pick the rendered file
+# for it out of the emitter's VirtualTree.
 GENERATORS: list[tuple[str, str, Path]] = [
     (
         "swift",
@@ -127,52 +126,46 @@ def check_toolchain() -> int:
 
 
 # ---------------------------------------------------------------------------
-# Sandbox repo setup.
+# Fixture descriptor set + in-process rendering.
 # ---------------------------------------------------------------------------
 
-def build_sandbox(sandbox: Path) -> None:
-    """Create a minimal repo layout under `sandbox` that the generators can
-    operate on unchanged. The generators compute `repo_root` from
-    `Path(__file__).resolve().parent.parent.parent` — `.resolve()` follows
-    symlinks, so we cannot symlink the codegen dir; we must copy it so the
-    generator scripts physically live inside the sandbox.
-
-    Layout produced:
-      sandbox/
-        idl/
-          rac_options.proto          (copy of the real one)
-          test_options.proto         (copy of fixtures/test_options.proto)
-          codegen/                   (copy of the real codegen/ dir)
-            generate_swift_convenience.py
-            generate_kotlin_convenience.py
-            generate_dart_convenience.py
-            generate_ts_convenience.py
-            _convenience_common.py
-            templates/...
-    """
-    (sandbox / "idl").mkdir(parents=True)
-    shutil.copy(RAC_OPTIONS_PROTO, sandbox / "idl" / "rac_options.proto")
-    shutil.copy(FIXTURE_PROTO,     sandbox / "idl" / "test_options.proto")
-    # Copy the entire codegen/ tree so the generator scripts compute
-    # `repo_root` as the sandbox (their `.resolve()` chain stays inside
-    # `sandbox/`). The copy is shallow enough (<200 KB) that the cost is
-    # negligible per test run.
-    shutil.copytree(
-        CODEGEN_DIR,
-        sandbox / "idl" / "codegen",
-        ignore=shutil.ignore_patterns("__pycache__", "tests"),
-    )
+def build_fixture_fds():
+    """One protoc call: the fixture plus (via --include_imports) the real
+    idl/rac_options.proto it imports."""
+    from google.protobuf import descriptor_pb2
 
-
-def run_generator(generator_script: str, sandbox: Path) -> tuple[int, str, str]:
-    """Run a single generator's main() against the sandbox idl/ dir."""
-    script_path = sandbox / "idl" / "codegen" / generator_script
-    proc = subprocess.run(
-        [sys.executable, str(script_path)],
-        capture_output=True,
-        text=True,
-    )
-    return proc.returncode, proc.stdout, proc.stderr
+    with tempfile.TemporaryDirectory(prefix="rac-convenience-test-") as tmp:
+        set_path = Path(tmp) / "fixture.pb"
+        subprocess.run([
+            "protoc",
+            f"--proto_path={FIXTURE_DIR}",
+            f"--proto_path={RAC_OPTIONS_PROTO.parent}",
+            f"--descriptor_set_out={set_path}",
+            "--include_imports",
+            str(FIXTURE_PROTO),
+        ], check=True)
+        fds = descriptor_pb2.FileDescriptorSet()
+        fds.ParseFromString(set_path.read_bytes())
+    return fds
+
+
+def render_outputs(fds, jobs: int | None = None) -> dict[str, str]:
+    """language -> rendered text of the file each generator owns for the
+    fixture. Raises RuntimeError when an emitter fails or renders nothing
+    at the expected path."""
+    sys.path.insert(0, str(CODEGEN_DIR))
+    from generate_convenience import render
+
+    langs = [language for language, _, _ in GENERATORS]
+    trees = render(langs, fds, VIRTUAL_ROOT, jobs=jobs)
+    outputs: dict[str, str] = {}
+    for language, generator_script, out_rel_path in GENERATORS:
+        data = trees[language].files.get(VIRTUAL_ROOT / out_rel_path)
+        if data is None:
+            raise RuntimeError(f"[{language}] {generator_script} rendered nothing at "
+                               f"{out_rel_path}; got {sorted(map(str, trees[language].files))}")
+        outputs[language] = data.decode("utf-8")
+    return outputs
 
 
 # ---------------------------------------------------------------------------
@@ -382,10 +375,11 @@ def main() -> int:
              "Run after changing the fixture or the generator implementation.",
     )
     parser.add_argument(
-        "--keep-sandbox",
-        action="store_true",
-        help="Print the sandbox path and skip cleanup. Useful for "
-             "debugging generator failures interactively.",
+        "--dump",
+        type=Path,
+        metavar="DIR",
+        help="Also write the rendered files under DIR (a stand-in repo root) "
+             "for inspection. Nothing is written otherwise.",
     )
     args = parser.parse_args()
 
@@ -395,67 +389,67 @@ def main() -> int:
 
     failures: list[str] = []
     updated_paths: list[Path] = []
-    generated_outputs: dict[str, str] = {}
 
-    with tempfile.TemporaryDirectory(prefix="rac-convenience-test-") as tmp:
-        sandbox = Path(tmp) / "repo"
-        build_sandbox(sandbox)
-
-        for language, generator_script, out_rel_path in GENERATORS:
-            print(f"-- running {generator_script} (language={language}) ...")
-            code, stdout, stderr = run_generator(generator_script, sandbox)
-            if code != 0:
-                failures.append(
-                    f"[{language}] {generator_script} exited {code}\n"
-                    f"  stdout: {stdout}\n"
-                    f"  stderr: {stderr}"
-                )
-                continue
-
-            out_path = sandbox / out_rel_path
-            if not out_path.is_file():
-                failures.append(
-                    f"[{language}] generator did not produce expected output at "
-                    f"{out_rel_path}\n  stdout: {stdout}\n  stderr: {stderr}"
-                )
-                continue
-
-            generated = out_path.read_text(encoding="utf-8")
-            generated_outputs[language] = generated
-
-            if args.update_golden:
-                p = write_golden(language, generated)
-                updated_paths.append(p)
-                print(f"   wrote golden -> {p}")
-                continue
-
-            ok, diff = diff_against_golden(language, generated)
-            if not ok:
-                failures.append(f"[{language}] golden mismatch:\n{diff}")
-            else:
-                print(f"   {language} ok ({len(generated)} bytes)")
-
-        # Cross-language structural parity check (pass3-syn-124). Runs in
-        # both verification and --update-golden modes so that bootstrapping
-        # the goldens still surfaces structural divergences. Skipped if any
-        # generator failed (incomplete inputs would yield spurious
-        # violations).
-        if len(generated_outputs) == len(GENERATORS):
-            print("-- asserting cross-language structural parity ...")
-            parity_violations = assert_cross_language_parity(generated_outputs)
-            if parity_violations:
-                for v in parity_violations:
-                    failures.append(v)
-            else:
-                print("   parity ok (validated-field set + error-shape "
-                      "aligned across swift/kotlin/dart/ts)")
-
-        if args.keep_sandbox:
-            # Re-root the sandbox so the TemporaryDirectory cleanup does
-            # not delete it. (shutil.copytree → /tmp/.../keep)
-            keep = Path(tempfile.mkdtemp(prefix="rac-convenience-keep-"))
-            shutil.copytree(sandbox, keep / "repo", symlinks=True)
-            print(f"-- sandbox copy retained at: {keep / 'repo'}")
+    start = time.perf_counter()
+    fds = build_fixture_fds()
+    print("-- rendering swift/kotlin/dart/ts in-process (parallel) ...")
+    try:
+        generated_outputs = render_outputs(fds)
+    except RuntimeError as e:
+        failures.append(str(e))
+        generated_outputs = {}
+
+    for language, _, out_rel_path in GENERATORS:
+        generated = generated_outputs.get(language)
+        if generated is None:
+            continue
+        if args.dump:
+            dump_path = args.dump / out_rel_path
+            dump_path.parent.mkdir(parents=True, exist_ok=True)
+            dump_path.write_text(generated, encoding="utf-8")
+
+        if args.update_golden:
+            p = write_golden(language, generated)
+            updated_paths.append(p)
+            print(f"   wrote golden -> {p}")
+            continue
+
+        ok, diff = diff_against_golden(language, generated)
+        if not ok:
+            failures.append(f"[{language}] golden mismatch:\n{diff}")
+        else:
+            print(f"   {language} ok ({len(generated)} bytes)")
+
+    # Cross-language structural parity check (pass3-syn-124). Runs in
+    # both verification and --update-golden modes so that bootstrapping
+    # the goldens still surfaces structural divergences. Skipped if any
+    # generator failed (incomplete inputs would yield spurious
+    # violations).
+    if len(generated_outputs) == len(GENERATORS):
+        print("-- asserting cross-language structural parity ...")
+        parity_violations = assert_cross_language_parity(generated_outputs)
+        if parity_violations:
+            for v in parity_violations:
+                failures.append(v)
+        else:
+            print("   parity ok (validated-field set + error-shape "
+                  "aligned across swift/kotlin/dart/ts)")
+
+    # The process-pool path (generate_all.sh, the driver) and the
+    # in-process path (--jobs 1) must render byte-identical output.
+    if len(generated_outputs) == len(GENERATORS) and not args.update_golden:
+        print("-- rendering again in-process (serial) ...")
+        serial = render_outputs(fds, jobs=1)
+        mismatched = [lang for lang in generated_outputs if serial[lang] != generated_outputs[lang]]
+        if mismatched:
+            failures.append(f"[driver] serial and parallel rendering differ for: "
+                            f"{', '.join(mismatched)}")
+        else:
+            print("   serial ok (identical to the parallel render)")
+
+    if args.dump:
+        print(f"-- rendered files written under: {args.dump}")
+    elapsed_ms = (time.perf_counter() - start) * 1000
 
     if failures:
         print(file=sys.stderr)
@@ -472,7 +466,7 @@ def main() -> int:
         print(f"Updated {len(updated_paths)} golden file(s). Commit these.")
 
     print()
-    print("OK: convenience generator smoke test passed.")
+    print(f"OK: convenience generator smoke test passed ({elapsed_ms:.0f} ms).")
     return 0
 
 
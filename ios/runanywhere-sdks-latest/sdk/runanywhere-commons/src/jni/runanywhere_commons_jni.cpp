@@ -5452,7 +5452,7 @@ Java_com_runanywhere_sdk_native_bridge_RunAnywhereBridge_racRagSessionCreateProt
 // outRc[0] so the Kotlin caller can build a typed SDKException instead of the
 // opaque "returned 0" message produced by the legacy primitive-jlong thunk.
 // Matches the parity contract Swift's CppBridge.RAG.createPipeline satisfies
-// at sdk/runanywhere-swift/.../ModalityProtoABI+Generated.swift:641-654.
+// at sdk/runanywhere-swift/.../ModalityProtoABI+RAG.swift:63-76.
 JNIEXPORT jlong JNICALL
 Java_com_runanywhere_sdk_native_bridge_RunAnywhereBridge_racRagSessionCreateProtoWithError(
     JNIEnv* env, jclass clazz, jbyteArray configProto, jintArray outRc) {
@@ -0,0 +1,106 @@
+// SPDX-License-Identifier: Apache-2.0
+
+import 'dart:io';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:runanywhere/generated/convenience/ra_convenience.dart';
+import 'package:runanywhere/generated/logging.pbenum.dart';
+import 'package:runanywhere/generated/model_types.pbenum.dart';
+
+// Micro-benchmark for the generated <enumName>FromWireString factories. They
+// used to `switch (value.toLowerCase())`, allocating a String per call; the
+// generator now dispatches on `value.length` and compares candidates in
+// place. The baseline is the old lowercase-then-lookup shape, checked and
+// timed against the generated code on the same corpus.
+//
+// The timing pass only runs with RAC_BENCHMARKS=1 and reports its numbers
+// without asserting on them; wall-clock comparisons are too noisy for CI.
+
+final Map<String, AudioFormat> _audioFormats = {
+  for (final e in AudioFormat.values) e.wireString: e,
+};
+final Map<String, ModelCategory> _categories = {
+  for (final e in ModelCategory.values) e.wireString: e,
+};
+final Map<String, LogLevel> _logLevels = {
+  for (final e in LogLevel.values) e.wireString: e,
+};
+
+List<String> _corpus() {
+  final known = [..._audioFormats.keys, ..._categories.keys, ..._logLevels.keys]
+      .where((s) => s.isNotEmpty)
+      .toList();
+  return [
+    ...known,
+    ...known.map((s) => s.toUpperCase()),
+    ...known.map((s) => s[0].toUpperCase() + s.substring(1)),
+    '', 'pcm16', 'INFO ', 'debugging', 'ŴAV',
+  ];
+}
+
+/// Fastest of several timed passes, after warm-up, in microseconds.
+int _bestOf(int Function() pass) {
+  var sink = 0;
+  for (var i = 0; i < 2000; i++) {
+    sink += pass();
+  }
+  var best = 1 << 62;
+  final watch = Stopwatch();
+  for (var i = 0; i < 200; i++) {
+    watch
+      ..reset()
+      ..start();
+    sink += pass();
+    watch.stop();
+    if (watch.elapsedMicroseconds < best) best = watch.elapsedMicroseconds;
+  }
+  expect(sink, greaterThan(0));
+  return best;
+}
+
+void main() {
+  group('wire string lookup bench (dart)', () {
+    final corpus = _corpus();
+
+    test('generated lookup matches the lowercasing baseline', () {
+      for (final value in corpus) {
+        final lowered = value.toLowerCase();
+        expect(audioFormatFromWireString(value), _audioFormats[lowered],
+            reason: value);
+        expect(modelCategoryFromWireString(value), _categories[lowered],
+            reason: value);
+        expect(logLevelFromWireString(value), _logLevels[lowered],
+            reason: value);
+      }
+    });
+
+    test(
+      'benchmark: generated lookup against the baseline',
+      () {
+        final generated = _bestOf(() {
+          var hits = 0;
+          for (final value in corpus) {
+            if (audioFormatFromWireString(value) != null) hits++;
+            if (modelCategoryFromWireString(value) != null) hits++;
+            if (logLevelFromWireString(value) != null) hits++;
+          }
+          return hits;
+        });
+        final baseline = _bestOf(() {
+          var hits = 0;
+          for (final value in corpus) {
+            if (_audioFormats[value.toLowerCase()] != null) hits++;
+            if (_categories[value.toLowerCase()] != null) hits++;
+            if (_logLevels[value.toLowerCase()] != null) hits++;
+          }
+          return hits;
+        });
+        stderr.writeln(
+            'fromWireString: generated=${generated}us baseline=${baseline}us');
+      },
+      skip: Platform.environment['RAC_BENCHMARKS'] == '1'
+          ? false
+          : 'Set RAC_BENCHMARKS=1 to run the timing benchmark',
+    );
+  });
+}
@@ -170,7 +170,7 @@ object CppBridgeLLM {
      *
      * Swift's `CppBridge.LLM.generateStream` follows the same shape:
      * it calls into the generated `ProtoStreamContext` single-call path
-     * (`Sources/RunAnywhere/Generated/ModalityProtoABI+Generated.swift`)
+     * (`Sources/RunAnywhere/Generated/ModalityProtoABI+LLM.swift`)
      * rather than registering once via
      * `rac_llm_set_stream_proto_callback` / `rac_llm_unset_stream_proto_callback`.
      * Both SDKs keep a `LLMStreamAdapter` typealias around
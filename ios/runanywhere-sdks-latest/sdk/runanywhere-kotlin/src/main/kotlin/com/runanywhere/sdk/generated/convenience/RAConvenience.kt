@@ -53,17 +53,29 @@ public val AudioFormat.wireString: String
 
 /** Generated reverse of the `rac_wire_string` accessor. Case-insensitive. */
 public fun AudioFormat.Companion.fromWireString(value: String): AudioFormat? =
-    when (value.lowercase()) {
-        "unspecified" -> AudioFormat.AUDIO_FORMAT_UNSPECIFIED
-        "pcm" -> AudioFormat.AUDIO_FORMAT_PCM
-        "wav" -> AudioFormat.AUDIO_FORMAT_WAV
-        "mp3" -> AudioFormat.AUDIO_FORMAT_MP3
-        "opus" -> AudioFormat.AUDIO_FORMAT_OPUS
-        "aac" -> AudioFormat.AUDIO_FORMAT_AAC
-        "flac" -> AudioFormat.AUDIO_FORMAT_FLAC
-        "ogg" -> AudioFormat.AUDIO_FORMAT_OGG
-        "m4a" -> AudioFormat.AUDIO_FORMAT_M4A
-        "pcm_s16le" -> AudioFormat.AUDIO_FORMAT_PCM_S16LE
+    when (value.length) {
+        3 -> when {
+            value.equals("pcm", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_PCM
+            value.equals("wav", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_WAV
+            value.equals("mp3", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_MP3
+            value.equals("aac", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_AAC
+            value.equals("ogg", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_OGG
+            value.equals("m4a", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_M4A
+            else -> null
+        }
+        4 -> when {
+            value.equals("opus", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_OPUS
+            value.equals("flac", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_FLAC
+            else -> null
+        }
+        9 -> when {
+            value.equals("pcm_s16le", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_PCM_S16LE
+            else -> null
+        }
+        11 -> when {
+            value.equals("unspecified", ignoreCase = true) -> AudioFormat.AUDIO_FORMAT_UNSPECIFIED
+            else -> null
+        }
         else -> null
     }
 
@@ -85,17 +97,44 @@ public val ModelCategory.wireString: String
 
 /** Generated reverse of the `rac_wire_string` accessor. Case-insensitive. */
 public fun ModelCategory.Companion.fromWireString(value: String): ModelCategory? =
-    when (value.lowercase()) {
-        "unspecified" -> ModelCategory.MODEL_CATEGORY_UNSPECIFIED
-        "language" -> ModelCategory.MODEL_CATEGORY_LANGUAGE
-        "speech-recognition" -> ModelCategory.MODEL_CATEGORY_SPEECH_RECOGNITION
-        "speech-synthesis" -> ModelCategory.MODEL_CATEGORY_SPEECH_SYNTHESIS
-        "vision" -> ModelCategory.MODEL_CATEGORY_VISION
-        "image-generation" -> ModelCategory.MODEL_CATEGORY_IMAGE_GENERATION
-        "multimodal" -> ModelCategory.MODEL_CATEGORY_MULTIMODAL
-        "audio" -> ModelCategory.MODEL_CATEGORY_AUDIO
-        "embedding" -> ModelCategory.MODEL_CATEGORY_EMBEDDING
-        "voice-activity-detection" -> ModelCategory.MODEL_CATEGORY_VOICE_ACTIVITY_DETECTION
+    when (value.length) {
+        5 -> when {
+            value.equals("audio", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_AUDIO
+            else -> null
+        }
+        6 -> when {
+            value.equals("vision", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_VISION
+            else -> null
+        }
+        8 -> when {
+            value.equals("language", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_LANGUAGE
+            else -> null
+        }
+        9 -> when {
+            value.equals("embedding", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_EMBEDDING
+            else -> null
+        }
+        10 -> when {
+            value.equals("multimodal", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_MULTIMODAL
+            else -> null
+        }
+        11 -> when {
+            value.equals("unspecified", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_UNSPECIFIED
+            else -> null
+        }
+        16 -> when {
+            value.equals("speech-synthesis", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_SPEECH_SYNTHESIS
+            value.equals("image-generation", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_IMAGE_GENERATION
+            else -> null
+        }
+        18 -> when {
+            value.equals("speech-recognition", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_SPEECH_RECOGNITION
+            else -> null
+        }
+        24 -> when {
+            value.equals("voice-activity-detection", ignoreCase = true) -> ModelCategory.MODEL_CATEGORY_VOICE_ACTIVITY_DETECTION
+            else -> null
+        }
         else -> null
     }
 
@@ -111,11 +150,20 @@ public val SDKEnvironment.wireString: String
 
 /** Generated reverse of the `rac_wire_string` accessor. Case-insensitive. */
 public fun SDKEnvironment.Companion.fromWireString(value: String): SDKEnvironment? =
-    when (value.lowercase()) {
-        "unspecified" -> SDKEnvironment.SDK_ENVIRONMENT_UNSPECIFIED
-        "development" -> SDKEnvironment.SDK_ENVIRONMENT_DEVELOPMENT
-        "staging" -> SDKEnvironment.SDK_ENVIRONMENT_STAGING
-        "production" -> SDKEnvironment.SDK_ENVIRONMENT_PRODUCTION
+    when (value.length) {
+        7 -> when {
+            value.equals("staging", ignoreCase = true) -> SDKEnvironment.SDK_ENVIRONMENT_STAGING
+            else -> null
+        }
+        10 -> when {
+            value.equals("production", ignoreCase = true) -> SDKEnvironment.SDK_ENVIRONMENT_PRODUCTION
+            else -> null
+        }
+        11 -> when {
+            value.equals("unspecified", ignoreCase = true) -> SDKEnvironment.SDK_ENVIRONMENT_UNSPECIFIED
+            value.equals("development", ignoreCase = true) -> SDKEnvironment.SDK_ENVIRONMENT_DEVELOPMENT
+            else -> null
+        }
         else -> null
     }
 
@@ -131,11 +179,23 @@ public val ModelSource.wireString: String
 
 /** Generated reverse of the `rac_wire_string` accessor. Case-insensitive. */
 public fun ModelSource.Companion.fromWireString(value: String): ModelSource? =
-    when (value.lowercase()) {
-        "unspecified" -> ModelSource.MODEL_SOURCE_UNSPECIFIED
-        "remote" -> ModelSource.MODEL_SOURCE_REMOTE
-        "local" -> ModelSource.MODEL_SOURCE_LOCAL
-        "built-in" -> ModelSource.MODEL_SOURCE_BUILT_IN
+    when (value.length) {
+        5 -> when {
+            value.equals("local", ignoreCase = true) -> ModelSource.MODEL_SOURCE_LOCAL
+            else -> null
+        }
+        6 -> when {
+            value.equals("remote", ignoreCase = true) -> ModelSource.MODEL_SOURCE_REMOTE
+            else -> null
+        }
+        8 -> when {
+            value.equals("built-in", ignoreCase = true) -> ModelSource.MODEL_SOURCE_BUILT_IN
+            else -> null
+        }
+        11 -> when {
+            value.equals("unspecified", ignoreCase = true) -> ModelSource.MODEL_SOURCE_UNSPECIFIED
+            else -> null
+        }
         else -> null
     }
 
@@ -152,12 +212,27 @@ public val ArchiveStructure.wireString: String
 
 /** Generated reverse of the `rac_wire_string` accessor. Case-insensitive. */
 public fun ArchiveStructure.Companion.fromWireString(value: String): ArchiveStructure? =
-    when (value.lowercase()) {
-        "unspecified" -> ArchiveStructure.ARCHIVE_STRUCTURE_UNSPECIFIED
-        "singlefilenested" -> ArchiveStructure.ARCHIVE_STRUCTURE_SINGLE_FILE_NESTED
-        "directorybased" -> ArchiveStructure.ARCHIVE_STRUCTURE_DIRECTORY_BASED
-        "nesteddirectory" -> ArchiveStructure.ARCHIVE_STRUCTURE_NESTED_DIRECTORY
-        "unknown" -> ArchiveStructure.ARCHIVE_STRUCTURE_UNKNOWN
+    when (value.length) {
+        7 -> when {
+            value.equals("unknown", ignoreCase = true) -> ArchiveStructure.ARCHIVE_STRUCTURE_UNKNOWN
+            else -> null
+        }
+        11 -> when {
+            value.equals("unspecified", ignoreCase = true) -> ArchiveStructure.ARCHIVE_STRUCTURE_UNSPECIFIED
+            else -> null
+        }
+        14 -> when {
+            value.equals("directorybased", ignoreCase = true) -> ArchiveStructure.ARCHIVE_STRUCTURE_DIRECTORY_BASED
+            else -> null
+        }
+        15 -> when {
+            value.equals("nesteddirectory", ignoreCase = true) -> ArchiveStructure.ARCHIVE_STRUCTURE_NESTED_DIRECTORY
+            else -> null
+        }
+        16 -> when {
+            value.equals("singlefilenested", ignoreCase = true) -> ArchiveStructure.ARCHIVE_STRUCTURE_SINGLE_FILE_NESTED
+            else -> null
+        }
         else -> null
     }
 
@@ -253,13 +328,22 @@ public val LogLevel.wireString: String
 
 /** Generated reverse of the `rac_wire_string` accessor. Case-insensitive. */
 public fun LogLevel.Companion.fromWireString(value: String): LogLevel? =
-    when (value.lowercase()) {
-        "trace" -> LogLevel.LOG_LEVEL_TRACE
-        "debug" -> LogLevel.LOG_LEVEL_DEBUG
-        "info" -> LogLevel.LOG_LEVEL_INFO
-        "warning" -> LogLevel.LOG_LEVEL_WARNING
-        "error" -> LogLevel.LOG_LEVEL_ERROR
-        "fatal" -> LogLevel.LOG_LEVEL_FATAL
+    when (value.length) {
+        4 -> when {
+            value.equals("info", ignoreCase = true) -> LogLevel.LOG_LEVEL_INFO
+            else -> null
+        }
+        5 -> when {
+            value.equals("trace", ignoreCase = true) -> LogLevel.LOG_LEVEL_TRACE
+            value.equals("debug", ignoreCase = true) -> LogLevel.LOG_LEVEL_DEBUG
+            value.equals("error", ignoreCase = true) -> LogLevel.LOG_LEVEL_ERROR
+            value.equals("fatal", ignoreCase = true) -> LogLevel.LOG_LEVEL_FATAL
+            else -> null
+        }
+        7 -> when {
+            value.equals("warning", ignoreCase = true) -> LogLevel.LOG_LEVEL_WARNING
+            else -> null
+        }
         else -> null
     }
 
@@ -346,20 +430,26 @@ public val STTLanguage.wireString: String
 
 /** Generated reverse of the `rac_wire_string` accessor. Case-insensitive. */
 public fun STTLanguage.Companion.fromWireString(value: String): STTLanguage? =
-    when (value.lowercase()) {
-        "auto" -> STTLanguage.STT_LANGUAGE_AUTO
-        "en" -> STTLanguage.STT_LANGUAGE_EN
-        "es" -> STTLanguage.STT_LANGUAGE_ES
-        "fr" -> STTLanguage.STT_LANGUAGE_FR
-        "de" -> STTLanguage.STT_LANGUAGE_DE
-        "zh" -> STTLanguage.STT_LANGUAGE_ZH
-        "ja" -> STTLanguage.STT_LANGUAGE_JA
-        "ko" -> STTLanguage.STT_LANGUAGE_KO
-        "it" -> STTLanguage.STT_LANGUAGE_IT
-        "pt" -> STTLanguage.STT_LANGUAGE_PT
-        "ar" -> STTLanguage.STT_LANGUAGE_AR
-        "ru" -> STTLanguage.STT_LANGUAGE_RU
-        "hi" -> STTLanguage.STT_LANGUAGE_HI
+    when (value.length) {
+        2 -> when {
+            value.equals("en", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_EN
+            value.equals("es", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_ES
+            value.equals("fr", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_FR
+            value.equals("de", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_DE
+            value.equals("zh", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_ZH
+            value.equals("ja", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_JA
+            value.equals("ko", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_KO
+            value.equals("it", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_IT
+            value.equals("pt", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_PT
+            value.equals("ar", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_AR
+            value.equals("ru", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_RU
+            value.equals("hi", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_HI
+            else -> null
+        }
+        4 -> when {
+            value.equals("auto", ignoreCase = true) -> STTLanguage.STT_LANGUAGE_AUTO
+            else -> null
+        }
         else -> null
     }
 
@@ -0,0 +1,91 @@
+/*
+ * Copyright 2026 RunAnywhere SDK
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+package com.runanywhere.sdk.public.extensions
+
+import ai.runanywhere.proto.v1.AudioFormat
+import ai.runanywhere.proto.v1.LogLevel
+import ai.runanywhere.proto.v1.ModelCategory
+import com.runanywhere.sdk.generated.convenience.fromWireString
+import com.runanywhere.sdk.generated.convenience.wireString
+import org.junit.Assume.assumeTrue
+import kotlin.test.Test
+import kotlin.test.assertEquals
+import kotlin.test.assertTrue
+
+/**
+ * Micro-benchmark for the generated `fromWireString` factories. They used to
+ * `when (value.lowercase())`, allocating a String per call; the generator now
+ * dispatches on `value.length` and compares candidates with
+ * `equals(ignoreCase = true)`. The baseline is the old lowercase-then-lookup
+ * shape, kept here so both can be checked and timed on the same corpus.
+ *
+ * The timing pass only runs with `RAC_BENCHMARKS=1` and reports its numbers
+ * without asserting on them; wall-clock comparisons are too noisy for CI.
+ */
+class WireStringLookupBenchmarkTest {
+    private val audioFormats = AudioFormat.values().associateBy { it.wireString }
+    private val categories = ModelCategory.values().associateBy { it.wireString }
+    private val logLevels = LogLevel.values().associateBy { it.wireString }
+
+    private val corpus: List<String> =
+        (audioFormats.keys + categories.keys + logLevels.keys)
+            .filter { it.isNotEmpty() }
+            .let { known -> known + known.map { it.uppercase() } + known.map { it.replaceFirstChar(Char::uppercaseChar) } }
+            .plus(listOf("", "pcm16", "INFO ", "debugging", "ŴAV"))
+
+    @Test
+    fun generatedLookupMatchesLowercasingBaseline() {
+        for (value in corpus) {
+            val lowered = value.lowercase()
+            assertEquals(audioFormats[lowered], AudioFormat.fromWireString(value), value)
+            assertEquals(categories[lowered], ModelCategory.fromWireString(value), value)
+            assertEquals(logLevels[lowered], LogLevel.fromWireString(value), value)
+        }
+    }
+
+    @Test
+    fun benchmarkGeneratedLookupAgainstBaseline() {
+        assumeTrue("set RAC_BENCHMARKS=1 to run", System.getenv("RAC_BENCHMARKS") == "1")
+        val generated = bestOf {
+            var hits = 0
+            for (value in corpus) {
+                if (AudioFormat.fromWireString(value) != null) hits++
+                if (ModelCategory.fromWireString(value) != null) hits++
+                if (LogLevel.fromWireString(value) != null) hits++
+            }
+            hits
+        }
+        val baseline = bestOf {
+            var hits = 0
+            for (value in corpus) {
+                if (audioFormats[value.lowercase()] != null) hits++
+                if (categories[value.lowercase()] != null) hits++
+                if (logLevels[value.lowercase()] != null) hits++
+            }
+            hits
+        }
+        System.err.println("fromWireString: generated=${generated}ns baseline=${baseline}ns per corpus pass")
+    }
+
+    /** Fastest of several timed passes, after warm-up, in nanoseconds. */
+    private inline fun bestOf(pass: () -> Int): Long {
+        var sink = 0
+        repeat(WARMUP_PASSES) { sink += pass() }
+        var best = Long.MAX_VALUE
+        repeat(TIMED_PASSES) {
+            val start = System.nanoTime()
+            sink += pass()
+            best = minOf(best, System.nanoTime() - start)
+        }
+        assertTrue(sink > 0)
+        return best
+    }
+
+    private companion object {
+        const val WARMUP_PASSES = 2_000
+        const val TIMED_PASSES = 200
+    }
+}
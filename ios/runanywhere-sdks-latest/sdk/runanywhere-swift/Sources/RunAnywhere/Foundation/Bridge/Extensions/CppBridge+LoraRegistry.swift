@@ -30,7 +30,7 @@ extension CppBridge {
         }
 
         // Low-level catalog operations are implemented in
-        // `Generated/ModalityProtoABI+Generated.swift`. The public actor methods
+        // `Generated/ModalityProtoABI+LoraRegistry.swift`. The public actor methods
         // below keep the non-Sendable registry pointer inside this actor.
 
         /// Resolves the registry handle, lazily reacquiring it from the
@@ -2,7 +2,7 @@
 //  CppBridge+ModalityProtoABI.swift
 //  RunAnywhere SDK
 //
-//  Hand-written companion to `Generated/ModalityProtoABI+Generated.swift`.
+//  Hand-written companion to the `Generated/ModalityProtoABI+<Modality>.swift` files.
 //
 //  Phase C (aggressive): in addition to the original Phase B migration,
 //  11 former `kind: custom` methods have been migrated onto the new
@@ -320,6 +320,188 @@ final class ProtoStreamContext<Event: Message>: @unchecked Sendable, ProtoStream
     // swiftlint:enable unused_declaration
 }
 
+/// Batching counterpart of `ProtoStreamContext`, behind the generated
+/// `<method>Batched` stream methods (`coalesce:` in swift-modality-abi.yaml).
+/// Decoded events accumulate on the native callback thread and are yielded
+/// as one array once `maxEvents` are pending or the oldest pending event is
+/// `maxLatency` old, so a token stream wakes its consumer — and any SwiftUI
+/// view it drives — once per batch instead of once per token.
+final class ProtoStreamBatchContext<Event: Message>: @unchecked Sendable, ProtoStreamYielder {
+    private struct State {
+        var pending: [Event] = []
+        /// Bumped on every flush so a latency timer armed for an earlier
+        /// batch leaves the current one alone.
+        var generation: UInt64 = 0
+        var cancelled = false
+    }
+
+    let continuation: AsyncStream<[Event]>.Continuation
+    let logger: SDKLogger
+    let maxEvents: Int
+    let maxLatency: DispatchTimeInterval
+
+    // Unchecked: `Event` need not be Sendable. Every access goes through
+    // the lock.
+    private let state = OSAllocatedUnfairLock(uncheckedState: State())
+
+    init(
+        continuation: AsyncStream<[Event]>.Continuation,
+        category: String,
+        maxEvents: Int,
+        maxLatency: DispatchTimeInterval
+    ) {
+        self.continuation = continuation
+        self.logger = SDKLogger(category: category)
+        self.maxEvents = max(1, maxEvents)
+        self.maxLatency = maxLatency
+    }
+
+    /// True once the AsyncStream has been cancelled by its consumer.
+    var isCancelled: Bool {
+        state.withLockUnchecked { $0.cancelled }
+    }
+
+    /// Mark the stream cancelled and drop any pending events. Idempotent;
+    /// safe from any thread.
+    func cancel() {
+        state.withLockUnchecked { state in
+            state.cancelled = true
+            state.pending.removeAll()
+        }
+    }
+
+    func yield(bytes: UnsafePointer<UInt8>?, size: Int) {
+        guard let bytes, size > 0 else { return }
+        if isCancelled { return }
+        let event: Event
+        do {
+            event = try Event(serializedBytes: Data(bytes: bytes, count: size))
+        } catch {
+            logger.warning("Failed to decode proto stream event: \(error.localizedDescription)")
+            return
+        }
+        // Flush a full batch; arm the latency timer when `event` opens one.
+        let armed: UInt64? = state.withLockUnchecked { state in
+            guard !state.cancelled else { return nil }
+            state.pending.append(event)
+            if state.pending.count >= maxEvents {
+                flushLocked(&state)
+                return nil
+            }
+            return state.pending.count == 1 ? state.generation : nil
+        }
+        guard let armed else { return }
+        DispatchQueue.global(qos: .userInitiated).asyncAfter(deadline: .now() + maxLatency) { [self] in
+            state.withLockUnchecked { state in
+                if state.generation == armed, !state.cancelled {
+                    flushLocked(&state)
+                }
+            }
+        }
+    }
+
+    /// Yield whatever is pending, followed by `terminal` when given, as the
+    /// final batch.
+    func finish(terminal: Event?) {
+        state.withLockUnchecked { state in
+            guard !state.cancelled else { return }
+            if let terminal {
+                state.pending.append(terminal)
+            }
+            flushLocked(&state)
+        }
+        continuation.finish()
+    }
+
+    /// Yields while the lock is held, so batches flushed by the callback
+    /// thread and by the latency timer reach the consumer in order.
+    /// `AsyncStream.Continuation.yield` only enqueues; it never calls back.
+    private func flushLocked(_ state: inout State) {
+        guard !state.pending.isEmpty else { return }
+        continuation.yield(state.pending)
+        state.pending.removeAll(keepingCapacity: true)
+        state.generation &+= 1
+    }
+
+    // Usages live in `Sources/RunAnywhere/Generated/` (see
+    // `ProtoStreamContext.runRequestStream`).
+    // swiftlint:disable unused_declaration
+    /// Batching variant of `ProtoStreamContext.runRequestStream`: the same
+    /// request serialisation, shared trampoline, cancellation wiring
+    /// (`onTermination` + `withTaskCancellationHandler`, both invoking
+    /// `onCancel`) and `onError` terminal event, but events are delivered as
+    /// arrays bounded by `maxEvents` / `maxLatency`. Pending events are
+    /// flushed, with the terminal event appended to the last batch, when the
+    /// C call returns; a cancelled stream drops them.
+    ///
+    /// - Parameters:
+    ///   - maxEvents: Largest batch yielded; a full batch flushes at once.
+    ///   - maxLatency: Longest an event waits for its batch to fill.
+    ///   - Others: As for `ProtoStreamContext.runRequestStream`.
+    /// - Returns: An `AsyncStream<[Event]>` of non-empty batches that
+    ///   finishes when the C call returns.
+    /// - Throws: Errors raised by `request.serializedData()`.
+    static func runRequestStream<Request: Message>(
+        request: Request,
+        category: String,
+        maxEvents: Int,
+        maxLatency: DispatchTimeInterval,
+        onError: (@Sendable (rac_result_t) -> Event?)? = nil,
+        onCancel: (@Sendable () -> Void)? = nil,
+        body: @escaping @Sendable (
+            UnsafePointer<UInt8>?,
+            Int,
+            @convention(c) (UnsafePointer<UInt8>?, Int, UnsafeMutableRawPointer?) -> Void,
+            UnsafeMutableRawPointer
+        ) -> rac_result_t
+    ) throws -> AsyncStream<[Event]> {
+        let requestData = try request.serializedData()
+        return AsyncStream { continuation in
+            let context = ProtoStreamBatchContext<Event>(
+                continuation: continuation,
+                category: category,
+                maxEvents: maxEvents,
+                maxLatency: maxLatency
+            )
+            let contextPtr = Unmanaged.passRetained(context).toOpaque()
+
+            continuation.onTermination = { @Sendable termination in
+                switch termination {
+                case .cancelled:
+                    context.cancel()
+                    onCancel?()
+                case .finished:
+                    break
+                @unknown default:
+                    break
+                }
+            }
+
+            Task.detached {
+                let rc = await withTaskCancellationHandler {
+                    requestData.withUnsafeBytes { rawBuffer in
+                        body(
+                            rawBuffer.bindMemory(to: UInt8.self).baseAddress,
+                            rawBuffer.count,
+                            protoStreamTrampoline,
+                            contextPtr
+                        )
+                    }
+                } onCancel: {
+                    context.cancel()
+                    onCancel?()
+                }
+                Unmanaged<ProtoStreamBatchContext<Event>>
+                    .fromOpaque(contextPtr)
+                    .release()
+                let terminal = rc != RAC_SUCCESS && !context.isCancelled ? onError?(rc) : nil
+                context.finish(terminal: terminal)
+            }
+        }
+    }
+    // swiftlint:enable unused_declaration
+}
+
 internal final class ProtoProgressContext<Event: Message>: @unchecked Sendable {
     let callback: (Event) -> Bool
     let logger: SDKLogger
@@ -652,7 +834,7 @@ extension CppBridge.VLM {
 
 extension CppBridge {
     /// Embeddings proto namespace. Methods live in
-    /// `Generated/ModalityProtoABI+Generated.swift`.
+    /// `Generated/ModalityProtoABI+Embeddings.swift`.
     public enum EmbeddingsProto {}
 }
 
@@ -16,7 +16,7 @@ import Foundation
 // properties were deleted because no Swift call site invoked them — the
 // public `RunAnywhere.generateStructured(...)` facade routes through the
 // LLM path (`LLM.generate(...)`), and the streaming variant lives in the
-// generated `Generated/ModalityProtoABI+Generated.swift` extension.
+// generated `Generated/ModalityProtoABI+StructuredOutput.swift` extension.
 // Periphery flagged them as dead at HEAD a2de2a4d6.
 private enum StructuredOutputGeneratedProtoABI {
     static let parseName = "rac_structured_output_parse_proto"
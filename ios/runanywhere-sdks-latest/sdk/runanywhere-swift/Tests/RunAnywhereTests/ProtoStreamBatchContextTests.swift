@@ -0,0 +1,126 @@
+//
+//  ProtoStreamBatchContextTests.swift
+//  RunAnywhere SDK
+//
+//  Coverage for `ProtoStreamBatchContext.runRequestStream`, the batching
+//  variant behind the generated `<method>Batched` stream methods. The tests
+//  pass a synthetic `body` that drives serialized `RALLMStreamEvent`s
+//  through the shared C trampoline, so no native symbol is resolved.
+//
+
+import CRACommons
+import Foundation
+import SwiftProtobuf
+import XCTest
+
+@testable import RunAnywhere
+
+final class ProtoStreamBatchContextTests: XCTestCase {
+
+    // MARK: - Helpers
+
+    private static func token(_ text: String) -> RALLMStreamEvent {
+        var event = RALLMStreamEvent()
+        event.token = text
+        return event
+    }
+
+    /// Emit each event through `trampoline`, sleeping `pauses[i]` (if any)
+    /// before event `i`.
+    private static func emit(
+        _ events: [RALLMStreamEvent],
+        pauses: [Int: TimeInterval] = [:],
+        trampoline: @convention(c) (UnsafePointer<UInt8>?, Int, UnsafeMutableRawPointer?) -> Void,
+        userData: UnsafeMutableRawPointer
+    ) {
+        for (index, event) in events.enumerated() {
+            if let pause = pauses[index] {
+                Thread.sleep(forTimeInterval: pause)
+            }
+            guard let data = try? event.serializedData() else { continue }
+            data.withUnsafeBytes { raw in
+                trampoline(raw.bindMemory(to: UInt8.self).baseAddress, raw.count, userData)
+            }
+        }
+    }
+
+    private static func collect(_ stream: AsyncStream<[RALLMStreamEvent]>) async -> [[String]] {
+        var batches: [[String]] = []
+        for await batch in stream {
+            batches.append(batch.map(\.token))
+        }
+        return batches
+    }
+
+    // MARK: - Tests
+
+    func testFullBatchesFlushImmediatelyAndRemainderFlushesOnReturn() async throws {
+        let events = (0..<10).map { Self.token("t\($0)") }
+        let stream = try ProtoStreamBatchContext<RALLMStreamEvent>.runRequestStream(
+            request: RALLMGenerateRequest(),
+            category: "ProtoStreamBatchContextTests",
+            maxEvents: 4,
+            maxLatency: .seconds(10),
+            body: { _, _, trampoline, userData in
+                Self.emit(events, trampoline: trampoline, userData: userData)
+                return RAC_SUCCESS
+            }
+        )
+
+        let batches = await Self.collect(stream)
+
+        XCTAssertEqual(batches.map(\.count), [4, 4, 2])
+        XCTAssertEqual(batches.flatMap { $0 }, events.map(\.token))
+    }
+
+    func testTerminalErrorEventClosesTheFinalBatch() async throws {
+        let stream = try ProtoStreamBatchContext<RALLMStreamEvent>.runRequestStream(
+            request: RALLMGenerateRequest(),
+            category: "ProtoStreamBatchContextTests",
+            maxEvents: 8,
+            maxLatency: .seconds(10),
+            onError: { rc in
+                var event = RALLMStreamEvent()
+                event.isFinal = true
+                event.errorCode = rc
+                return event
+            },
+            body: { _, _, trampoline, userData in
+                Self.emit([Self.token("a"), Self.token("b")], trampoline: trampoline, userData: userData)
+                return rac_result_t(-1)
+            }
+        )
+
+        var batches: [[RALLMStreamEvent]] = []
+        for await batch in stream {
+            batches.append(batch)
+        }
+
+        XCTAssertEqual(batches.count, 1)
+        XCTAssertEqual(batches.first?.map(\.token), ["a", "b", ""])
+        XCTAssertEqual(batches.first?.last?.isFinal, true)
+        XCTAssertEqual(batches.first?.last?.errorCode, -1)
+    }
+
+    func testLatencyBoundFlushesAPartialBatchWhileTheProducerStalls() async throws {
+        let stream = try ProtoStreamBatchContext<RALLMStreamEvent>.runRequestStream(
+            request: RALLMGenerateRequest(),
+            category: "ProtoStreamBatchContextTests",
+            maxEvents: 32,
+            maxLatency: .milliseconds(20),
+            body: { _, _, trampoline, userData in
+                Self.emit(
+                    [Self.token("first"), Self.token("second")],
+                    pauses: [1: 0.5],
+                    trampoline: trampoline,
+                    userData: userData
+                )
+                return RAC_SUCCESS
+            }
+        )
+
+        let batches = await Self.collect(stream)
+
+        XCTAssertEqual(batches, [["first"], ["second"]])
+    }
+}
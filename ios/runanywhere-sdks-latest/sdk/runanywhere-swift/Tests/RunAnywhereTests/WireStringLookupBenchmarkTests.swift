@@ -0,0 +1,83 @@
+//
+//  WireStringLookupBenchmarkTests.swift
+//  RunAnywhere SDK
+//
+//  Micro-benchmark for the generated `from(wireString:)` factories in
+//  Generated/RAConvenience.swift. They used to `switch wireString.lowercased()`,
+//  allocating a fresh String per call on event-decoding and config-parsing
+//  paths; the generator now dispatches on the UTF-8 length and compares the
+//  candidates in place (`racWireStringMatches`). The baseline below is the
+//  old lowercase-then-lookup shape, kept here so both can be measured on the
+//  same corpus.
+//
+
+import XCTest
+
+@testable import RunAnywhere
+
+final class WireStringLookupBenchmarkTests: XCTestCase {
+
+    // MARK: - Fixture
+
+    /// Every audio-format / model-category / log-level wire string as
+    /// emitted, upper-cased and capitalized, plus near misses.
+    private static let corpus: [String] = {
+        let known = (RAAudioFormat.allCases.map(\.wireString)
+            + RAModelCategory.allCases.map(\.wireString)
+            + RALogLevel.allCases.map(\.wireString))
+            .filter { !$0.isEmpty }
+        return known
+            + known.map { $0.uppercased() }
+            + known.map { $0.capitalized }
+            + ["", "pcm16", "INFO ", "debugging", "ŴAV"]
+    }()
+
+    private static func baselineTable<E>(_ cases: [E], _ wire: (E) -> String) -> [String: E] {
+        Dictionary(cases.map { (wire($0), $0) }, uniquingKeysWith: { first, _ in first })
+    }
+
+    private static let audioFormats = baselineTable(RAAudioFormat.allCases, \.wireString)
+    private static let categories = baselineTable(RAModelCategory.allCases, \.wireString)
+    private static let logLevels = baselineTable(RALogLevel.allCases, \.wireString)
+
+    // MARK: - Tests
+
+    func testGeneratedLookupMatchesLowercasingBaseline() {
+        for value in Self.corpus {
+            let lowered = value.lowercased()
+            XCTAssertEqual(RAAudioFormat.from(wireString: value), Self.audioFormats[lowered], value)
+            XCTAssertEqual(RAModelCategory.from(wireString: value), Self.categories[lowered], value)
+            XCTAssertEqual(RALogLevel.from(wireString: value), Self.logLevels[lowered], value)
+        }
+    }
+
+    func testGeneratedLookupPerformance() {
+        let corpus = Self.corpus
+        measure {
+            var hits = 0
+            for _ in 0..<2_000 {
+                for value in corpus {
+                    if RAAudioFormat.from(wireString: value) != nil { hits += 1 }
+                    if RAModelCategory.from(wireString: value) != nil { hits += 1 }
+                    if RALogLevel.from(wireString: value) != nil { hits += 1 }
+                }
+            }
+            XCTAssertGreaterThan(hits, 0)
+        }
+    }
+
+    func testLowercasingBaselinePerformance() {
+        let corpus = Self.corpus
+        measure {
+            var hits = 0
+            for _ in 0..<2_000 {
+                for value in corpus {
+                    if Self.audioFormats[value.lowercased()] != nil { hits += 1 }
+                    if Self.categories[value.lowercased()] != nil { hits += 1 }
+                    if Self.logLevels[value.lowercased()] != nil { hits += 1 }
+                }
+            }
+            XCTAssertGreaterThan(hits, 0)
+        }
+    }
+}
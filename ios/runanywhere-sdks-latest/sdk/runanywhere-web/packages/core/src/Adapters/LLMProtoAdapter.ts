@@ -104,7 +104,7 @@ export class LLMProtoAdapter {
       () => {
         this.cancel();
       },
-      // Swift parity (ModalityProtoABI+Generated.swift:308-316): non-success
+      // Swift parity (ModalityProtoABI+LLM.swift:53-61): non-success
       // rc synthesizes a terminal error event instead of rejecting the
       // iterator.
       (rc) => LLMStreamEvent.fromPartial({
@@ -181,7 +181,7 @@ export class STTProtoAdapter {
       )),
       (event) => event.isFinal,
       undefined,
-      // Swift parity (ModalityProtoABI+Generated.swift:394-398): terminal
+      // Swift parity (ModalityProtoABI+STT.swift:48-52): terminal
       // final partial instead of rejecting the iterator.
       (rc) => STTPartialResult.fromPartial({
         isFinal: true,
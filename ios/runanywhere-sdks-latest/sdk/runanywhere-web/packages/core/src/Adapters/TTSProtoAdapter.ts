@@ -244,7 +244,7 @@ export class TTSProtoAdapter {
       },
       undefined,
       undefined,
-      // Swift parity (ModalityProtoABI+Generated.swift:448-455): terminal
+      // Swift parity (ModalityProtoABI+TTS.swift:68-75): terminal
       // timestamp-only output instead of rejecting the iterator.
       () => TTSOutput.fromPartial({ timestampMs: Date.now() }),
     );
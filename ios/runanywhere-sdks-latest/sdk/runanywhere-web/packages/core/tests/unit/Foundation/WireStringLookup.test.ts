@@ -0,0 +1,101 @@
+/**
+ * WireStringLookup.test.ts
+ *
+ * Micro-benchmark for the generated `<enumName>FromWireString` helpers in
+ * `@runanywhere/proto-ts/convenience/*`. They used to
+ * `switch (s.toLowerCase())`, allocating a string per call; the generator
+ * now dispatches on `s.length` and compares candidates in place
+ * (`wireStringMatches`). The baseline is the old lowercase-then-lookup
+ * shape, checked and timed against the generated code on the same corpus.
+ *
+ * The timing pass only runs with RAC_BENCHMARKS=1 and reports its numbers
+ * without asserting on them; wall-clock comparisons are too noisy for CI.
+ */
+import { env } from 'node:process';
+import { describe, expect, it } from 'vitest';
+import { LogLevel } from '@runanywhere/proto-ts/logging';
+import { AudioFormat, ModelCategory } from '@runanywhere/proto-ts/model_types';
+import {
+  logLevelFromWireString,
+  logLevelWireString,
+} from '@runanywhere/proto-ts/convenience/logging_convenience';
+import {
+  audioFormatFromWireString,
+  audioFormatWireString,
+  modelCategoryFromWireString,
+  modelCategoryWireString,
+} from '@runanywhere/proto-ts/convenience/model_types_convenience';
+
+function baselineTable<E extends number>(
+  enumObject: Record<string, string | number>,
+  wire: (e: E) => string,
+): Map<string, E> {
+  const table = new Map<string, E>();
+  for (const value of Object.values(enumObject)) {
+    if (typeof value !== 'number') continue;
+    const key = wire(value as E);
+    if (key !== '' && !table.has(key)) table.set(key, value as E);
+  }
+  return table;
+}
+
+const audioFormats = baselineTable(AudioFormat, audioFormatWireString);
+const categories = baselineTable(ModelCategory, modelCategoryWireString);
+const logLevels = baselineTable(LogLevel, logLevelWireString);
+
+const known = [...audioFormats.keys(), ...categories.keys(), ...logLevels.keys()];
+const corpus = [
+  ...known,
+  ...known.map((s) => s.toUpperCase()),
+  ...known.map((s) => s[0].toUpperCase() + s.slice(1)),
+  '', 'pcm16', 'INFO ', 'debugging', 'ŴAV',
+];
+
+/** Fastest of several timed passes, after warm-up, in milliseconds. */
+function bestOf(pass: () => number): number {
+  let sink = 0;
+  for (let i = 0; i < 2_000; i++) sink += pass();
+  let best = Number.POSITIVE_INFINITY;
+  for (let i = 0; i < 200; i++) {
+    const start = performance.now();
+    sink += pass();
+    best = Math.min(best, performance.now() - start);
+  }
+  expect(sink).toBeGreaterThan(0);
+  return best;
+}
+
+describe('generated fromWireString lookups', () => {
+  it('match the lowercasing baseline on every corpus entry', () => {
+    for (const value of corpus) {
+      const lowered = value.toLowerCase();
+      expect(audioFormatFromWireString(value), value).toBe(audioFormats.get(lowered));
+      expect(modelCategoryFromWireString(value), value).toBe(categories.get(lowered));
+      expect(logLevelFromWireString(value), value).toBe(logLevels.get(lowered));
+    }
+  });
+
+  it.skipIf(env.RAC_BENCHMARKS !== '1')('benchmark against the lowercasing baseline', () => {
+    const generated = bestOf(() => {
+      let hits = 0;
+      for (const value of corpus) {
+        if (audioFormatFromWireString(value) !== undefined) hits++;
+        if (modelCategoryFromWireString(value) !== undefined) hits++;
+        if (logLevelFromWireString(value) !== undefined) hits++;
+      }
+      return hits;
+    });
+    const baseline = bestOf(() => {
+      let hits = 0;
+      for (const value of corpus) {
+        if (audioFormats.get(value.toLowerCase()) !== undefined) hits++;
+        if (categories.get(value.toLowerCase()) !== undefined) hits++;
+        if (logLevels.get(value.toLowerCase()) !== undefined) hits++;
+      }
+      return hits;
+    });
+    console.error(
+      `fromWireString: generated=${generated.toFixed(3)}ms baseline=${baseline.toFixed(3)}ms`,
+    );
+  });
+});
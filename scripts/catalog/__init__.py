@@ -0,0 +1,46 @@
+"""
+Model catalog tooling for LLM-Hub.
+
+The iOS and Android model catalogs live in ModelData.swift and ModelData.kt
+as large constructor literals. Everything in this package works from a
+single parse of those files (see `source`), so each tool is a handful of
+dictionary lookups over the parsed index rather than another regex pass.
+
+Both apps bundle the compiled model_catalog.json (ios/LLMHub/Sources/LLMHub/
+and android/app/src/main/assets/). The assets are committed; rerun
+`python3 -m scripts.catalog asset` after editing either ModelData file.
+
+Run `python3 -m scripts.catalog --help` from the repository root.
+"""
+
+from pathlib import Path
+
+from .source import (
+    CatalogEntry,
+    CatalogIndex,
+    CatalogParseError,
+    HFRef,
+    load,
+    parse,
+    parse_hf_url,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+SOURCES = {
+    "swift": REPO_ROOT / "ios" / "LLMHub" / "Sources" / "LLMHub" / "ModelData.swift",
+    "kotlin": REPO_ROOT / "android" / "app" / "src" / "main" / "java" / "com" / "llmhub"
+    / "llmhub" / "data" / "ModelData.kt",
+}
+
+__all__ = [
+    "CatalogEntry",
+    "CatalogIndex",
+    "CatalogParseError",
+    "HFRef",
+    "REPO_ROOT",
+    "SOURCES",
+    "load",
+    "parse",
+    "parse_hf_url",
+]
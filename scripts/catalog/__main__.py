@@ -0,0 +1,187 @@
+"""
+Command-line entry point for the catalog tools.
+
+    python3 -m scripts.catalog asset [--platform swift|kotlin] [--out PATH]
+    python3 -m scripts.catalog bench [--iterations N]
+    python3 -m scripts.catalog lint [--models-dir DIR] [FILE ...]
+    python3 -m scripts.catalog ladder --listing FILE --repo OWNER/NAME --revision SHA \
+        --family NAME --source TEXT [--quants Q3_K_M,Q4_K_M,...]
+    python3 -m scripts.catalog diff OLD NEW [--platform swift|kotlin] [--json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from . import REPO_ROOT, SOURCES, asset, diff, edits, ladder, lint, source
+
+ASSET_OUTPUTS = {
+    "swift": SOURCES["swift"].parent / asset.ASSET_FILENAME,
+    "kotlin": REPO_ROOT / "android" / "app" / "src" / "main" / "assets" / asset.ASSET_FILENAME,
+}
+
+
+def _platforms(args):
+    return [args.platform] if args.platform else list(SOURCES)
+
+
+def cmd_asset(args):
+    if args.out and not args.platform:
+        print("error: --out needs --platform", file=sys.stderr)
+        return 2
+    for platform in _platforms(args):
+        try:
+            index = source.load(SOURCES[platform], platform)
+        except source.CatalogParseError as e:
+            print(f"error: {platform}: {e}", file=sys.stderr)
+            return 2
+        out = Path(args.out) if args.out else ASSET_OUTPUTS[platform]
+        try:
+            size, written = asset.write(index, out)
+        except asset.AssetError as e:
+            print(f"error: {platform}: {e}", file=sys.stderr)
+            return 1
+        status = "" if written else ", unchanged"
+        print(f"{platform}: {len(index.entries)} models -> {out} ({size} bytes{status})")
+    return 0
+
+
+def cmd_bench(args):
+    for platform in _platforms(args):
+        try:
+            result = asset.benchmark(SOURCES[platform], args.iterations)
+        except source.CatalogParseError as e:
+            print(f"error: {platform}: {e}", file=sys.stderr)
+            return 2
+        print(
+            f"{platform}: parse source {result['parse_source_ms']:.2f} ms "
+            f"({result['source_bytes']} bytes), "
+            f"load asset {result['load_asset_ms']:.2f} ms ({result['asset_bytes']} bytes)"
+        )
+    return 0
+
+
+def cmd_lint(args):
+    start = time.perf_counter()
+    paths = args.files or [SOURCES[p] for p in _platforms(args)]
+    try:
+        indexes = [source.load(str(path)) for path in paths]
+    except source.CatalogParseError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    findings = lint.lint(indexes, args.models_dir)
+    for finding in findings:
+        print(finding)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    entries = sum(len(index.entries) for index in indexes)
+    print(f"{len(findings)} finding(s) in {entries} entries ({elapsed:.0f} ms)", file=sys.stderr)
+    return 1 if findings else 0
+
+
+def cmd_ladder(args):
+    spec = ladder.LadderSpec(
+        family=args.family,
+        repo=args.repo,
+        revision=args.revision,
+        source=args.source,
+        summary=args.summary or "",
+        context_window=args.context,
+        supports_thinking=args.thinking,
+        vision=args.vision,
+    )
+    try:
+        listing = ladder.read_listing(args.listing)
+        projectors = args.projectors.split(",") if args.projectors else None
+        files = ladder.select_files(listing, args.quants.split(","), projectors)
+    except ladder.LadderError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    entries = ladder.build_entries(spec, files)
+    rendered = {
+        "swift": ladder.render_swift(spec, entries),
+        "kotlin": ladder.render_kotlin(spec, entries),
+    }
+    for platform, text in rendered.items():
+        out = getattr(args, f"{platform}_out")
+        if out:
+            status = "" if edits.write_if_changed(out, text) else " (unchanged)"
+            print(f"{platform}: {len(entries)} entries -> {out}{status}", file=sys.stderr)
+        else:
+            print(f"// ---- {SOURCES[platform].name} ----")
+            print(text)
+    return 0
+
+
+def cmd_diff(args):
+    try:
+        old = source.load(args.old, args.platform)
+        new = source.load(args.new, args.platform or old.platform)
+    except source.CatalogParseError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    changes = diff.diff(old, new)
+    if args.json:
+        print(json.dumps({
+            "changes": [c.record() for c in changes],
+            "stale_urls": diff.stale_urls(changes),
+        }, indent=2))
+    else:
+        for change in changes:
+            print(change)
+        print(f"{len(changes)} change(s)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m scripts.catalog", description=__doc__.split("\n\n")[0].strip())
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("asset", help="compile ModelData into model_catalog.json")
+    p.add_argument("--platform", choices=sorted(SOURCES))
+    p.add_argument("--out", help="output path (default: the app's resource directory)")
+    p.set_defaults(func=cmd_asset)
+
+    p = sub.add_parser("bench", help="time source parsing against asset decoding")
+    p.add_argument("--platform", choices=sorted(SOURCES))
+    p.add_argument("--iterations", type=int, default=20)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("lint", help="check the catalogs for duplicates and revision/size mismatches")
+    p.add_argument("files", nargs="*", help="ModelData sources to lint (default: both apps)")
+    p.add_argument("--platform", choices=sorted(SOURCES))
+    p.add_argument("--models-dir", help="directory of downloaded files to check GGUF sizes against")
+    p.set_defaults(func=cmd_lint)
+
+    p = sub.add_parser("ladder", help="generate a quant ladder from a repo file listing")
+    p.add_argument("--listing", required=True, help="JSON dump of the repo's files and sizes")
+    p.add_argument("--repo", required=True, help="Hugging Face repo, e.g. unsloth/gemma-4-E2B-it-GGUF")
+    p.add_argument("--revision", required=True, help="commit hash to pin every URL to")
+    p.add_argument("--family", required=True, help='display name prefix, e.g. "Gemma 4 E2B"')
+    p.add_argument("--source", required=True, help='source label, e.g. "Google via Unsloth"')
+    p.add_argument("--summary", help='description lead-in (default: the family name)')
+    p.add_argument("--quants", default=",".join(ladder.DEFAULT_QUANTS))
+    p.add_argument("--projectors", help="mmproj precisions to include, e.g. F16 (default: all)")
+    p.add_argument("--context", type=int, default=131072, help="context window in tokens")
+    p.add_argument("--thinking", action="store_true", help="mark the quants as thinking models")
+    p.add_argument("--vision", action=argparse.BooleanOptionalAction, default=None,
+                   help="force the multimodal category (default: when an mmproj is listed)")
+    p.add_argument("--swift-out", help="write the Swift entries here instead of stdout")
+    p.add_argument("--kotlin-out", help="write the Kotlin entries here instead of stdout")
+    p.set_defaults(func=cmd_ladder)
+
+    p = sub.add_parser("diff", help="report added/removed/re-pinned/resized files between two catalogs")
+    p.add_argument("old", help="previous ModelData source (e.g. a `git show REV:path` dump)")
+    p.add_argument("new", help="current ModelData source")
+    p.add_argument("--platform", choices=sorted(SOURCES),
+                   help="source language when it cannot be inferred from the file name")
+    p.add_argument("--json", action="store_true", help="emit records and stale URLs as JSON")
+    p.set_defaults(func=cmd_diff)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
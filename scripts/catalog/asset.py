@@ -0,0 +1,161 @@
+"""
+Compile the parsed catalog into a versioned JSON asset.
+
+The asset holds the same entries as the source literal, grouped by the list
+they are declared in, with every argument that equals the constructor
+default left out. ModelCatalogAsset.swift and ModelCatalogAsset.kt decode it
+lazily on first use, so neither app has to type-check or run a 4,000-line
+constructor literal at launch.
+"""
+
+import json
+import re
+import statistics
+import time
+
+from . import source
+from .edits import write_if_changed
+
+ASSET_FORMAT_VERSION = 1
+ASSET_FILENAME = "model_catalog.json"
+
+# Constructor defaults; arguments equal to these are omitted from the asset
+# and restored by the platform loader.
+_DEFAULTS = {
+    "swift": {
+        "supportsVision": False,
+        "supportsAudio": False,
+        "supportsThinking": False,
+        "supportsGpu": True,
+        "supportsMtp": True,
+        "contextWindowSize": 2048,
+        "modelFormat": "gguf",
+        "additionalFiles": [],
+        "promptTemplate": None,
+        "chatTemplateFamily": "automatic",
+    },
+    "kotlin": {
+        "supportsAudio": False,
+        "supportsThinking": False,
+        "supportsGpu": False,
+        "supportsMtp": True,
+        "contextWindowSize": 2048,
+        "modelFormat": "task",
+        "additionalFiles": [],
+    },
+}
+
+_ENUM_CASE_RE = re.compile(r'^\s*case\s+(\w+)\s*=\s*"([^"]*)"', re.M)
+_WHEN_RE = re.compile(r"^when\s*\((?P<subject>.*?)\)\s*\{(?P<body>.*)\}$", re.S)
+_WHEN_CASE_RE = re.compile(r'^\s*(?:"(?P<key>[^"]*)"|(?P<else>else))\s*->\s*(?P<value>[\d_]+)L?', re.M)
+
+
+class AssetError(ValueError):
+    """Raised when an entry cannot be represented in the asset."""
+
+
+def _swift_enum_raw_values(text, enum_name):
+    start = text.find(f"enum {enum_name}")
+    if start < 0:
+        return {}
+    end = text.find("\n}", start)
+    return dict(_ENUM_CASE_RE.findall(text[start:end]))
+
+
+def _kotlin_size_switch(expr):
+    """Encode `when (subject) { "a" -> 1L ... else -> 2L }` for the loader."""
+    match = _WHEN_RE.match(expr.strip())
+    if not match:
+        return None
+    cases = {}
+    for case in _WHEN_CASE_RE.finditer(match["body"]):
+        key = "else" if case["else"] else case["key"]
+        cases[key] = int(case["value"].replace("_", ""))
+    if "else" not in cases:
+        return None
+    return {"subject": match["subject"], "cases": cases}
+
+
+def entry_record(entry, category_raw_values=None):
+    """Return the asset form of one entry, with default arguments removed."""
+    defaults = _DEFAULTS[entry.platform]
+    record = {}
+    if entry.platform == "swift":
+        # AIModel's decoder requires an id, so the derived one is written out.
+        record["id"] = entry.id
+    for name, f in entry.fields.items():
+        value = f.value
+        if f.kind == "call":
+            value = {k: v for k, v in value.items() if k != "__call__"}
+        elif f.kind == "enum" and name == "category" and category_raw_values:
+            value = category_raw_values[value]
+        elif f.kind == "expr":
+            switch = _kotlin_size_switch(value) if name == "sizeBytes" else None
+            if switch is None:
+                raise AssetError(
+                    f"{entry.name!r} (line {entry.line}): argument {name} is computed "
+                    f"at runtime and cannot be stored in the asset: {value}"
+                )
+            record["sizeBytesWhen"] = switch
+            continue
+        if name in defaults and defaults[name] == value:
+            continue
+        record[name] = value
+    return record
+
+
+def build(index):
+    """Build the asset document for a parsed catalog."""
+    category_raw_values = None
+    if index.platform == "swift":
+        category_raw_values = _swift_enum_raw_values(index.text, "ModelCategory")
+    groups = {}
+    for entry in index.entries:
+        groups.setdefault(entry.group, []).append(entry_record(entry, category_raw_values))
+    return {
+        "formatVersion": ASSET_FORMAT_VERSION,
+        "platform": index.platform,
+        "sourceSha256": index.sha256,
+        "groups": groups,
+    }
+
+
+def dumps(document):
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def write(index, out_path):
+    """Write the asset for `index` to `out_path`.
+
+    Returns (byte size, written); an up-to-date asset is left untouched.
+    """
+    data = dumps(build(index)).encode("utf-8")
+    return len(data), write_if_changed(out_path, data)
+
+
+def benchmark(source_path, iterations=20):
+    """Time a full source parse against decoding the equivalent asset.
+
+    Returns a dict of median timings in milliseconds plus both sizes, so
+    regressions in either the parser or the asset layout are visible.
+    """
+    with open(source_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    platform = source.platform_for_path(str(source_path))
+    payload = dumps(build(source.parse(text, platform, str(source_path))))
+
+    def median_ms(fn):
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000.0)
+        return statistics.median(samples)
+
+    return {
+        "platform": platform,
+        "source_bytes": len(text.encode("utf-8")),
+        "asset_bytes": len(payload.encode("utf-8")),
+        "parse_source_ms": median_ms(lambda: source.parse(text, platform)),
+        "load_asset_ms": median_ms(lambda: json.loads(payload)),
+    }
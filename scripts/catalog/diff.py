@@ -0,0 +1,104 @@
+"""
+Structured change report between two versions of a catalog.
+
+Both versions are parsed once and every downloadable file (an entry's url
+plus its additionalFiles) is keyed by its Hugging Face repo and path, so a
+revision bump on the same file is reported as one `revision-changed` record
+rather than a removal plus an addition. Files outside Hugging Face are keyed
+by their URL without the query string. The result is a list of plain
+records suitable for release notes or for evicting exactly the changed
+files from the app's download cache.
+"""
+
+from dataclasses import asdict, dataclass
+from urllib.parse import urlsplit
+
+from .source import parse_hf_url
+
+ADDED = "added"
+REMOVED = "removed"
+REVISION_CHANGED = "revision-changed"
+SIZE_CHANGED = "size-changed"
+
+_KIND_ORDER = {ADDED: 0, REMOVED: 1, REVISION_CHANGED: 2, SIZE_CHANGED: 3}
+
+
+@dataclass(frozen=True)
+class Change:
+    kind: str
+    key: str
+    name: str
+    old_url: str = None
+    new_url: str = None
+    old_size: int = None
+    new_size: int = None
+
+    @property
+    def old_revision(self):
+        ref = parse_hf_url(self.old_url)
+        return ref and ref.revision
+
+    @property
+    def new_revision(self):
+        ref = parse_hf_url(self.new_url)
+        return ref and ref.revision
+
+    def record(self):
+        out = asdict(self)
+        out["old_revision"] = self.old_revision
+        out["new_revision"] = self.new_revision
+        return {k: v for k, v in out.items() if v is not None}
+
+    def __str__(self):
+        if self.kind == ADDED:
+            return f"+ {self.name}: {self.key}"
+        if self.kind == REMOVED:
+            return f"- {self.name}: {self.key}"
+        if self.kind == REVISION_CHANGED:
+            return f"~ {self.name}: {self.key} @{self.old_revision} -> @{self.new_revision}"
+        return f"~ {self.name}: {self.key} {self.old_size} -> {self.new_size} bytes"
+
+
+def file_key(url):
+    ref = parse_hf_url(url)
+    if ref is not None:
+        return f"{ref.repo}/{ref.path}"
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def _files(index):
+    """Map file key -> (url, declared size or None, owning entry name)."""
+    files = {}
+    for entry in index.entries:
+        if entry.url:
+            files.setdefault(file_key(entry.url), (entry.url, entry.size_bytes, entry.name))
+        for extra in entry.additional_files:
+            files.setdefault(file_key(extra), (extra, None, entry.name))
+    return files
+
+
+def diff(old, new):
+    """Compare two parsed indexes; returns Change records in a stable order."""
+    before = _files(old)
+    after = _files(new)
+    changes = []
+    for key in after.keys() - before.keys():
+        url, size, name = after[key]
+        changes.append(Change(ADDED, key, name, new_url=url, new_size=size))
+    for key in before.keys() - after.keys():
+        url, size, name = before[key]
+        changes.append(Change(REMOVED, key, name, old_url=url, old_size=size))
+    for key in before.keys() & after.keys():
+        old_url, old_size, _ = before[key]
+        new_url, new_size, name = after[key]
+        if old_url != new_url:
+            changes.append(Change(REVISION_CHANGED, key, name, old_url, new_url, old_size, new_size))
+        elif old_size is not None and new_size is not None and old_size != new_size:
+            changes.append(Change(SIZE_CHANGED, key, name, old_url, new_url, old_size, new_size))
+    return sorted(changes, key=lambda c: (_KIND_ORDER[c.kind], c.key))
+
+
+def stale_urls(changes):
+    """URLs whose cached downloads are no longer valid."""
+    return sorted({c.old_url for c in changes if c.kind != ADDED and c.old_url})
@@ -0,0 +1,211 @@
+"""
+Minimal-diff, atomic rewrites of ModelData.swift / ModelData.kt.
+
+Changes are expressed as a list of `Edit(start, end, text)` replacements
+against the spans recorded by the parser, so only the argument values that
+actually change are touched and everything else (comments, layout, other
+entries) is kept byte for byte. Edits that would not change anything are
+dropped, and a file is only rewritten when at least one effective edit
+remains. The write goes through a temporary file in the same directory and
+`os.replace`, so a crash never leaves a truncated source behind and a no-op
+run leaves the file's mtime (and Xcode's / Gradle's incremental state)
+untouched.
+"""
+
+import os
+import tempfile
+from typing import NamedTuple
+
+from .source import parse_hf_url
+
+
+class EditError(ValueError):
+    pass
+
+
+class Edit(NamedTuple):
+    start: int
+    end: int
+    text: str
+
+
+# ---------------------------------------------------------------------------
+# Literal rendering
+# ---------------------------------------------------------------------------
+
+def render_string(value, platform):
+    """Render `value` as a Swift/Kotlin string literal.
+
+    `${...}` templates are kept as written, since the parser keeps them
+    verbatim in decoded values; a lone `$` is escaped for Kotlin.
+    """
+    out = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    if platform == "kotlin":
+        out = out.replace("$", "\\$").replace("\\${", "${")
+    return f'"{out}"'
+
+
+def render_value(value, platform, long=False):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return f"{value}L" if long and platform == "kotlin" else str(value)
+    if isinstance(value, str):
+        return render_string(value, platform)
+    raise EditError(f"cannot render {type(value).__name__} value {value!r}")
+
+
+# ---------------------------------------------------------------------------
+# Edit builders
+# ---------------------------------------------------------------------------
+
+def set_field(entry, name, value):
+    """Replace the value of an existing constructor argument."""
+    field = entry.fields.get(name)
+    if field is None:
+        raise EditError(f"{entry.name!r} has no {name} argument to update")
+    if field.kind == "expr":
+        raise EditError(f"{entry.name!r}: {name} is computed at runtime and cannot be rewritten")
+    return Edit(field.start, field.end, render_value(value, entry.platform, long=name == "sizeBytes"))
+
+
+def set_size(entry, size):
+    return set_field(entry, "sizeBytes", size)
+
+
+def set_url(entry, url):
+    return set_field(entry, "url", url)
+
+
+def repin(index, repo, revision=None, sizes=None, from_revision=None):
+    """Edits that move the files of a Hugging Face repo to a new revision.
+
+    Every entry whose URL points into `repo` (optionally only those pinned to
+    `from_revision`) is re-pinned to `revision`, and its sizeBytes is set
+    from `sizes`, a mapping of file path within the repo to byte size.
+    """
+    sizes = sizes or {}
+    edits = []
+    for entry in index.entries:
+        ref = entry.hf
+        if ref is None or ref.repo != repo:
+            continue
+        if from_revision and ref.revision != from_revision:
+            continue
+        if revision and ref.revision != revision:
+            edits.append(set_url(entry, entry.url.replace(f"/resolve/{ref.revision}/",
+                                                          f"/resolve/{revision}/", 1)))
+        if ref.path in sizes:
+            edits.append(set_size(entry, sizes[ref.path]))
+        extras = entry.fields.get("additionalFiles")
+        if revision and extras is not None and extras.kind == "list":
+            edits.extend(_repin_list_items(index, extras, entry.platform, repo, revision))
+    return edits
+
+
+def _repin_list_items(index, field, platform, repo, revision):
+    # List items have no spans of their own; find each literal inside the
+    # list's span so only the changed URLs are rewritten.
+    pos = field.start
+    for url in field.value:
+        raw = render_string(url, platform)
+        at = index.text.find(raw, pos, field.end)
+        if at < 0:
+            continue
+        pos = at + len(raw)
+        moved = _repin_url(url, repo, revision)
+        if moved != url:
+            yield Edit(at, pos, render_string(moved, platform))
+
+
+def _repin_url(url, repo, revision):
+    ref = parse_hf_url(url)
+    if ref is None or ref.repo != repo or ref.revision == revision:
+        return url
+    return url.replace(f"/resolve/{ref.revision}/", f"/resolve/{revision}/", 1)
+
+
+# ---------------------------------------------------------------------------
+# Applying and writing
+# ---------------------------------------------------------------------------
+
+def effective_edits(text, edits):
+    """Sort `edits`, drop no-ops and reject overlapping ranges."""
+    out = []
+    for edit in sorted(set(edits)):
+        if text[edit.start:edit.end] == edit.text:
+            continue
+        if out and edit.start < out[-1].end:
+            raise EditError(f"overlapping edits at offsets {out[-1].start} and {edit.start}")
+        out.append(edit)
+    return out
+
+
+def apply_edits(text, edits):
+    """Return `text` with `edits` applied (edits must already be effective)."""
+    parts = []
+    pos = 0
+    for edit in edits:
+        parts.append(text[pos:edit.start])
+        parts.append(edit.text)
+        pos = edit.end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def write_if_changed(path, data):
+    """Atomically replace `path` with `data` unless it already holds it.
+
+    Returns True when the file was written. Permissions of an existing file
+    are kept.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    path = os.fspath(path)
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_umask()
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
+
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def apply_to_file(index, edits, dry_run=False):
+    """Apply `edits` to the file `index` was parsed from.
+
+    Returns the list of effective edits; the file is only rewritten when that
+    list is non-empty. Raises EditError if the file changed on disk since it
+    was parsed, since the recorded spans would no longer line up.
+    """
+    with open(index.path, "r", encoding="utf-8", newline="") as f:
+        current = f.read()
+    if current != index.text:
+        raise EditError(f"{index.path} changed since it was parsed; re-run on the new file")
+    effective = effective_edits(current, edits)
+    if effective and not dry_run:
+        write_if_changed(index.path, apply_edits(current, effective))
+    return effective
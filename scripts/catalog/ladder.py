@@ -0,0 +1,237 @@
+"""
+Generate a family of GGUF catalog entries from a repository file listing.
+
+The listing is a local JSON dump of a Hugging Face repo (no network access
+is needed). Any of these shapes is accepted:
+
+  * the model API response: {"siblings": [{"rfilename": ..., "size": ...}]}
+  * the tree API response:  [{"type": "file", "path": ..., "size": ...}]
+  * a plain mapping:        {"model-Q4_K_M.gguf": 3106731392, ...}
+
+Quants are emitted smallest first, followed by the vision projectors
+(highest precision first), matching how existing families are laid out in
+ModelData.swift and ModelData.kt.
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass
+
+_QUANT_RE = re.compile(
+    r"[-_.]((?:UD-)?(?:I?Q\d(?:_[A-Z0-9]+)*|BF16|F16|F32))\.gguf$", re.IGNORECASE
+)
+_SHARD_RE = re.compile(r"-\d{5}-of-\d{5}\.gguf$")
+
+DEFAULT_QUANTS = ("Q3_K_M", "Q4_K_M", "Q5_K_M", "Q8_0")
+
+# Short notes used in descriptions, as in the hand-written entries.
+_QUANT_NOTES = {
+    "Q4_K_M": "Recommended balance of quality and size.",
+    "Q5_K_M": "Higher-quality 5-bit variant.",
+    "Q6_K": "High-quality 6-bit variant.",
+    "Q8_0": "Near full quality.",
+}
+
+
+class LadderError(ValueError):
+    pass
+
+
+@dataclass
+class LadderFile:
+    path: str
+    size: int
+    quant: str
+    projector: bool
+
+
+@dataclass
+class LadderSpec:
+    family: str
+    repo: str
+    revision: str
+    source: str
+    summary: str = ""
+    context_window: int = 131072
+    supports_thinking: bool = False
+    vision: bool = None  # None: infer from the presence of an mmproj file
+
+    @property
+    def description_prefix(self):
+        return self.summary or self.family
+
+
+def read_listing(path):
+    """Return [(path, size)] from any supported listing shape."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict) and "siblings" in data:
+        items = [(s.get("rfilename"), s.get("size") or (s.get("lfs") or {}).get("size"))
+                 for s in data["siblings"]]
+    elif isinstance(data, list):
+        items = [(s.get("path"), (s.get("lfs") or {}).get("size") or s.get("size"))
+                 for s in data if s.get("type", "file") == "file"]
+    elif isinstance(data, dict):
+        items = list(data.items())
+    else:
+        raise LadderError(f"{path}: unrecognised listing format")
+    missing = [p for p, size in items if p and p.endswith(".gguf") and not size]
+    if missing:
+        raise LadderError(f"{path}: no size for {', '.join(missing)} (dump the listing with sizes)")
+    # README.md, .gitattributes etc. are listed without a size; only the
+    # .gguf files (checked above) need one.
+    return [(p, int(size)) for p, size in items if p and size is not None]
+
+
+def select_files(listing, quants=DEFAULT_QUANTS, projectors=None):
+    """Pick the requested quants (and projectors) out of a listing.
+
+    `projectors` is a list of projector precisions (e.g. ["F16"]); None keeps
+    every mmproj file in the listing.
+    """
+    wanted = {q.upper() for q in quants}
+    chosen = []
+    for path, size in listing:
+        name = path.rsplit("/", 1)[-1]
+        if not name.endswith(".gguf") or _SHARD_RE.search(name):
+            continue
+        match = _QUANT_RE.search(name)
+        if not match:
+            continue
+        quant = match.group(1).upper()
+        is_projector = "mmproj" in name.lower()
+        if is_projector:
+            if projectors is not None and quant not in {p.upper() for p in projectors}:
+                continue
+        elif quant not in wanted:
+            continue
+        chosen.append(LadderFile(path, size, quant, is_projector))
+
+    found = {f.quant for f in chosen if not f.projector}
+    missing = sorted(wanted - found)
+    if missing:
+        raise LadderError(f"listing has no file for quant(s): {', '.join(missing)}")
+    models = sorted((f for f in chosen if not f.projector), key=lambda f: f.size)
+    mmproj = sorted((f for f in chosen if f.projector), key=lambda f: -f.size)
+    return models + mmproj
+
+
+def _size_label(size):
+    if size >= 1_000_000_000:
+        return f"{size / 1e9:.2f} GB"
+    return f"{round(size / 1e6)} MB"
+
+
+def _requirements(f):
+    gb = math.ceil(f.size / 1e9)
+    if f.projector:
+        return gb, gb + 1
+    return gb + 1, gb + 3
+
+
+def build_entries(spec, files):
+    """Return platform-neutral entry dicts in catalog order."""
+    vision = spec.vision if spec.vision is not None else any(f.projector for f in files)
+    category = "multimodal" if vision else "text"
+    context_k = f"{spec.context_window // 1024}k"
+    entries = []
+    for f in files:
+        url = f"https://huggingface.co/{spec.repo}/resolve/{spec.revision}/{f.path}?download=true"
+        min_ram, rec_ram = _requirements(f)
+        if f.projector:
+            name = f"{spec.family} (Vision Projector, {f.quant})"
+            description = (f"Vision Projector (mmproj) required to enable image input for "
+                           f"{spec.family}. {f.quant} variant. ({_size_label(f.size)})")
+            context = 0
+        else:
+            name = f"{spec.family} ({f.quant})"
+            parts = [f"{spec.description_prefix} with {f.quant} quantization ({_size_label(f.size)})."]
+            if f.quant.replace("UD-", "") in _QUANT_NOTES:
+                parts.append(_QUANT_NOTES[f.quant.replace("UD-", "")])
+            if vision:
+                parts.append("Supports text + vision — download the Vision Projector (mmproj) "
+                             "to enable image input.")
+            parts.append(f"{context_k} context.")
+            description = " ".join(parts)
+            context = spec.context_window
+        entries.append({
+            "name": name,
+            "description": description,
+            "url": url,
+            "category": category,
+            "sizeBytes": f.size,
+            "source": spec.source,
+            "supportsVision": vision,
+            "supportsThinking": spec.supports_thinking and not f.projector,
+            "requirements": (min_ram, rec_ram),
+            "contextWindowSize": context,
+        })
+    return entries
+
+
+def _swift_string(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _kotlin_string(value):
+    return _swift_string(value).replace("$", "\\$")
+
+
+def render_swift(spec, entries, indent="    "):
+    i1, i2 = indent, indent * 2
+    lines = [f"{i1}// MARK: - {spec.family}"]
+    for e in entries:
+        lines.append(f"{i1}AIModel(")
+        args = [
+            f"name: {_swift_string(e['name'])}",
+            f"description: {_swift_string(e['description'])}",
+            f"url: {_swift_string(e['url'])}",
+            f"category: .{e['category']}",
+            f"sizeBytes: {e['sizeBytes']}",
+            f"source: {_swift_string(e['source'])}",
+            f"supportsVision: {str(e['supportsVision']).lower()}",
+            "supportsAudio: false",
+        ]
+        if e["supportsThinking"]:
+            args.append("supportsThinking: true")
+        args += [
+            "supportsGpu: true",
+            f"requirements: ModelRequirements(minRamGB: {e['requirements'][0]}, "
+            f"recommendedRamGB: {e['requirements'][1]})",
+            f"contextWindowSize: {e['contextWindowSize']}",
+            "modelFormat: .gguf",
+            "additionalFiles: []",
+        ]
+        lines.append(",\n".join(f"{i2}{a}" for a in args))
+        lines.append(f"{i1}),")
+    return "\n".join(lines) + "\n"
+
+
+def render_kotlin(spec, entries, indent="        "):
+    i1, i2 = indent, indent + "    "
+    lines = [f"{i1}// {spec.family}"]
+    for e in entries:
+        lines.append(f"{i1}LLMModel(")
+        args = [
+            f"name = {_kotlin_string(e['name'])}",
+            f"description = {_kotlin_string(e['description'])}",
+            f"url = {_kotlin_string(e['url'])}",
+            f"category = \"{e['category']}\"",
+            f"sizeBytes = {e['sizeBytes']}L",
+            f"source = {_kotlin_string(e['source'])}",
+            f"supportsVision = {str(e['supportsVision']).lower()}",
+            "supportsAudio = false",
+        ]
+        if e["supportsThinking"]:
+            args.append("supportsThinking = true")
+        args += [
+            "supportsGpu = true",
+            f"requirements = ModelRequirements(minRamGB = {e['requirements'][0]}, "
+            f"recommendedRamGB = {e['requirements'][1]})",
+            f"contextWindowSize = {e['contextWindowSize']}",
+            "modelFormat = \"gguf\"",
+        ]
+        lines.append(",\n".join(f"{i2}{a}" for a in args))
+        lines.append(f"{i1}),")
+    return "\n".join(lines) + "\n"
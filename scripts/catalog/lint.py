@@ -0,0 +1,164 @@
+"""
+Consistency checks over the parsed catalog indexes.
+
+Every check is a single group-by or hash join over entries that have
+already been parsed, so linting both catalogs costs little more than
+parsing them and is cheap enough for a pre-commit hook.
+"""
+
+import os
+from dataclasses import dataclass
+
+from ..inspect_gguf import GGUFError, read_layout
+from .source import parse_hf_url, url_filename
+
+
+@dataclass(frozen=True)
+class Finding:
+    path: str
+    line: int
+    code: str
+    message: str
+
+    def __str__(self):
+        return f"{self.path}:{self.line}: [{self.code}] {self.message}"
+
+
+def _group(entries, key):
+    groups = {}
+    for entry in entries:
+        k = key(entry)
+        if k:
+            groups.setdefault(k, []).append(entry)
+    return groups
+
+
+def check_duplicate_ids(index):
+    for model_id, entries in _group(index.entries, lambda e: e.id).items():
+        for dup in entries[1:]:
+            yield Finding(index.path, dup.line, "duplicate-id",
+                          f"id {model_id!r} already declared on line {entries[0].line}")
+
+
+def check_duplicate_urls(index):
+    for url, entries in _group(index.entries, lambda e: e.url).items():
+        for dup in entries[1:]:
+            yield Finding(index.path, dup.line, "duplicate-url",
+                          f"{dup.name!r} downloads the same file as {entries[0].name!r} "
+                          f"(line {entries[0].line}): {url}")
+
+
+def check_family_revisions(index):
+    """Quants of one Hugging Face repo should all pin the same revision."""
+    by_repo = _group((e for e in index.entries if not e.is_projector),
+                     lambda e: e.hf and e.hf.repo)
+    for repo, entries in by_repo.items():
+        by_revision = _group(entries, lambda e: e.hf.revision)
+        if len(by_revision) < 2:
+            continue
+        # The revision most entries use is taken as the intended one.
+        expected = max(by_revision, key=lambda r: len(by_revision[r]))
+        for revision, stragglers in by_revision.items():
+            if revision == expected:
+                continue
+            for entry in stragglers:
+                yield Finding(index.path, entry.line, "family-revision",
+                              f"{entry.name!r} pins {repo}@{revision} but "
+                              f"{len(by_revision[expected])} other entries use @{expected}")
+
+
+def check_projector_revisions(index):
+    """Projectors must come from the same revision as the models they serve.
+
+    Covers both standalone projector entries (joined to the base entries of
+    the same repo) and projectors listed in a model's additionalFiles.
+    """
+    bases = _group((e for e in index.entries if not e.is_projector),
+                   lambda e: e.hf and e.hf.repo)
+    for entry in index.entries:
+        ref = entry.hf
+        if ref is None:
+            continue
+        if entry.is_projector:
+            revisions = {b.hf.revision for b in bases.get(ref.repo, ())}
+            if revisions and ref.revision not in revisions:
+                yield Finding(index.path, entry.line, "projector-revision",
+                              f"{entry.name!r} pins {ref.repo}@{ref.revision} but its base "
+                              f"models use @{', @'.join(sorted(revisions))}")
+        for extra in entry.additional_files:
+            extra_ref = parse_hf_url(extra)
+            if extra_ref and extra_ref.repo == ref.repo and extra_ref.revision != ref.revision:
+                yield Finding(index.path, entry.line, "projector-revision",
+                              f"{entry.name!r} pins @{ref.revision} but its additional file "
+                              f"{extra_ref.filename} pins @{extra_ref.revision}")
+
+
+def check_cross_platform_sizes(indexes):
+    """The same download URL must declare the same sizeBytes on every platform."""
+    if len(indexes) < 2:
+        return
+    first, rest = indexes[0], indexes[1:]
+    for other in rest:
+        for url, entry in other.by_url.items():
+            match = first.by_url.get(url)
+            if match is None or match.size_bytes is None or entry.size_bytes is None:
+                continue
+            if match.size_bytes != entry.size_bytes:
+                yield Finding(other.path, entry.line, "cross-platform-size",
+                              f"{entry.name!r} declares {entry.size_bytes} bytes but "
+                              f"{os.path.basename(first.path)}:{match.line} declares "
+                              f"{match.size_bytes} for the same URL")
+
+
+def index_local_files(models_dir):
+    """Map file name -> path for every file under `models_dir`."""
+    files = {}
+    for root, _dirs, names in os.walk(models_dir):
+        for name in names:
+            files.setdefault(name, os.path.join(root, name))
+    return files
+
+
+def check_gguf_sizes(index, local_files, layout_cache):
+    """Compare sizeBytes with the size implied by a local GGUF header."""
+    for entry in index.entries:
+        name = url_filename(entry.url)
+        path = local_files.get(name)
+        if path is None or not name.endswith(".gguf") or entry.size_bytes is None:
+            continue
+        if path not in layout_cache:
+            try:
+                layout_cache[path] = read_layout(path)
+            except (OSError, GGUFError, ValueError) as e:
+                layout_cache[path] = e
+        layout = layout_cache[path]
+        if isinstance(layout, Exception):
+            yield Finding(index.path, entry.line, "gguf-unreadable", f"{path}: {layout}")
+            continue
+        expected = layout["expected_file_size"]
+        if expected != entry.size_bytes:
+            yield Finding(index.path, entry.line, "gguf-size",
+                          f"{entry.name!r} declares {entry.size_bytes} bytes but the GGUF "
+                          f"header of {path} implies {expected}")
+
+
+INDEX_CHECKS = (
+    check_duplicate_ids,
+    check_duplicate_urls,
+    check_family_revisions,
+    check_projector_revisions,
+)
+
+
+def lint(indexes, models_dir=None):
+    """Run every check and return findings sorted by file and line."""
+    findings = []
+    local_files = index_local_files(models_dir) if models_dir else None
+    layout_cache = {}
+    for index in indexes:
+        for check in INDEX_CHECKS:
+            findings.extend(check(index))
+        if local_files:
+            findings.extend(check_gguf_sizes(index, local_files, layout_cache))
+    findings.extend(check_cross_platform_sizes(indexes))
+    return sorted(findings, key=lambda f: (f.path, f.line, f.code))
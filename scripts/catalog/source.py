@@ -0,0 +1,477 @@
+"""
+Parser for the model catalog literals in ModelData.swift and ModelData.kt.
+
+Both apps declare their catalog as lists of constructor calls with named
+literal arguments (`AIModel(...)` on iOS, `LLMModel(...)` on Android). This
+module tokenizes a source file once and builds a CatalogIndex: every entry
+with its decoded field values and the exact source span of each value, so
+the other catalog tools can look entries up by id or URL and edit values in
+place without regex rewrites of the whole file.
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+from typing import NamedTuple
+from urllib.parse import unquote, urlsplit
+
+CONSTRUCTORS = {
+    "swift": "AIModel",
+    "kotlin": "LLMModel",
+}
+
+# Calls that produce a list literal in Kotlin.
+_LIST_CALLS = {"listOf", "arrayOf", "mutableListOf", "emptyList"}
+
+_HF_RESOLVE_RE = re.compile(
+    r"^https://huggingface\.co/(?P<repo>[^/]+/[^/]+)/resolve/(?P<revision>[^/]+)/(?P<path>[^?#]+)"
+)
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+# One alternation per token kind, tried in order. Block comments are only
+# detected here; they nest, so _skip_block_comment consumes them.
+_TOKEN_RE = re.compile(r'''
+      (?P<space>\s+)
+    | (?P<line_comment>//[^\n]*)
+    | (?P<block_comment>/\*)
+    | (?P<string>"""[\s\S]*?"""|"(?:[^"\\\n$]+|\\.|\$\{[^}\n]*\}|\$)*")
+    | (?P<bad_string>")
+    | (?P<ident>[A-Za-z_]\w*)
+    | (?P<number>\d\w*(?:\.\d\w*)?)
+    | (?P<punct>.)
+''', re.VERBOSE | re.DOTALL)
+
+_SIMPLE_ESCAPES = {
+    "n": "\n", "t": "\t", "r": "\r", "0": "\0",
+    '"': '"', "'": "'", "\\": "\\", "$": "$",
+}
+
+
+class CatalogParseError(ValueError):
+    """Raised when a catalog source cannot be tokenized."""
+
+
+class _NotLiteral(Exception):
+    """A constructor argument is not a plain literal (e.g. `model.id`)."""
+
+
+class Token(NamedTuple):
+    kind: str  # "ident", "number", "string", "punct"
+    text: str
+    start: int
+    end: int
+
+
+@dataclass
+class Field:
+    """One named constructor argument and the source span of its value."""
+
+    name: str
+    kind: str  # "string", "int", "float", "bool", "null", "enum", "list", "call", "expr"
+    value: object
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class HFRef:
+    """A pinned Hugging Face download: repo, revision and file path."""
+
+    repo: str
+    revision: str
+    path: str
+
+    @property
+    def filename(self):
+        return self.path.rsplit("/", 1)[-1]
+
+
+@dataclass
+class CatalogEntry:
+    platform: str
+    group: str
+    start: int
+    end: int
+    line: int
+    fields: dict = field(default_factory=dict)
+
+    def get(self, name, default=None):
+        f = self.fields.get(name)
+        return default if f is None else f.value
+
+    @property
+    def name(self):
+        return self.get("name", "")
+
+    @property
+    def id(self):
+        # Mirrors AIModel.init: an explicit id wins, otherwise the lowercased
+        # name with spaces replaced by underscores.
+        explicit = self.get("id")
+        if explicit:
+            return explicit
+        return self.name.lower().replace(" ", "_")
+
+    @property
+    def url(self):
+        return self.get("url", "")
+
+    @property
+    def size_bytes(self):
+        """Declared size, or None when it is computed at runtime."""
+        value = self.get("sizeBytes")
+        return value if isinstance(value, int) else None
+
+    @property
+    def category(self):
+        """Category normalised to snake_case on both platforms."""
+        value = self.get("category", "")
+        return _CAMEL_RE.sub("_", value).lower()
+
+    @property
+    def additional_files(self):
+        return list(self.get("additionalFiles", []) or [])
+
+    @property
+    def urls(self):
+        return [self.url] + self.additional_files
+
+    @property
+    def hf(self):
+        return parse_hf_url(self.url)
+
+    @property
+    def filename(self):
+        return url_filename(self.url)
+
+    @property
+    def is_projector(self):
+        # Same rule as AIModel.isDependencyOnly on iOS.
+        return ("vision projector" in self.name.lower()
+                or "mmproj" in self.name.lower()
+                or "mmproj" in self.url.lower())
+
+    def record(self):
+        """Decoded field values keyed by argument name."""
+        return {name: f.value for name, f in self.fields.items()}
+
+
+@dataclass
+class CatalogIndex:
+    platform: str
+    path: str
+    text: str
+    entries: list
+
+    def __post_init__(self):
+        self.by_id = {}
+        self.by_url = {}
+        for entry in self.entries:
+            self.by_id.setdefault(entry.id, entry)
+            self.by_url.setdefault(entry.url, entry)
+
+    @property
+    def sha256(self):
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+    def groups(self):
+        """Entries bucketed by the list they are declared in, in source order."""
+        out = {}
+        for entry in self.entries:
+            out.setdefault(entry.group, []).append(entry)
+        return out
+
+    def line_of(self, offset):
+        return self.text.count("\n", 0, offset) + 1
+
+
+def parse_hf_url(url):
+    match = _HF_RESOLVE_RE.match(url or "")
+    if not match:
+        return None
+    return HFRef(match["repo"], match["revision"], unquote(match["path"]))
+
+
+def url_filename(url):
+    path = urlsplit(url or "").path
+    return unquote(path.rsplit("/", 1)[-1])
+
+
+def platform_for_path(path):
+    path = os.fspath(path)
+    if path.endswith(".swift"):
+        return "swift"
+    if path.endswith(".kt") or path.endswith(".kts"):
+        return "kotlin"
+    raise CatalogParseError(f"{path}: cannot infer platform (expected .swift or .kt)")
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+def tokenize(text):
+    """Split Swift/Kotlin source into tokens, dropping whitespace and comments.
+
+    Only the subset of the grammar used by catalog literals is understood,
+    but strings (including Kotlin `${...}` templates and triple-quoted
+    blocks) and comments are handled exactly so their contents never leak
+    into the token stream.
+    """
+    tokens = []
+    append = tokens.append
+    skip = ("space", "line_comment")
+    pos = 0
+    n = len(text)
+    while pos < n:
+        for m in _TOKEN_RE.finditer(text, pos):
+            kind = m.lastgroup
+            if kind in skip:
+                continue
+            if kind == "block_comment":
+                # Restart the scan after the (possibly nested) comment.
+                pos = _skip_block_comment(text, m.start())
+                break
+            if kind == "bad_string":
+                line = text.count("\n", 0, m.start()) + 1
+                raise CatalogParseError(f"unterminated string literal on line {line}")
+            append(Token(kind, m.group(), m.start(), m.end()))
+        else:
+            pos = n
+    return tokens
+
+
+def _skip_block_comment(text, i):
+    # Swift block comments nest; Kotlin's do too.
+    depth = 0
+    n = len(text)
+    while i < n:
+        if text.startswith("/*", i):
+            depth += 1
+            i += 2
+        elif text.startswith("*/", i):
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return i
+        else:
+            i += 1
+    raise CatalogParseError("unterminated block comment")
+
+
+def decode_string(raw):
+    """Decode a single-line string literal. Templates are kept verbatim."""
+    if raw.startswith('"""'):
+        return raw[3:-3]
+    body = raw[1:-1]
+    if "\\" not in body:
+        return body
+    out = []
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c != "\\":
+            out.append(c)
+            i += 1
+            continue
+        nxt = body[i + 1]
+        if nxt in _SIMPLE_ESCAPES:
+            out.append(_SIMPLE_ESCAPES[nxt])
+            i += 2
+        elif nxt == "u" and body.startswith("{", i + 2):  # Swift \u{1F600}
+            close = body.index("}", i + 3)
+            out.append(chr(int(body[i + 3:close], 16)))
+            i = close + 1
+        elif nxt == "u":  # Kotlin \u00e9
+            out.append(chr(int(body[i + 2:i + 6], 16)))
+            i += 6
+        else:
+            out.append(nxt)
+            i += 2
+    return "".join(out)
+
+
+def _decode_number(text):
+    cleaned = text.replace("_", "").rstrip("LlUu")
+    if cleaned.lower().startswith("0x"):
+        return int(cleaned, 16)
+    if any(ch in cleaned for ch in ".eE") or cleaned.endswith(("f", "F")):
+        return float(cleaned.rstrip("fF"))
+    return int(cleaned)
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+class _LiteralParser:
+    def __init__(self, text, tokens):
+        self.text = text
+        self.tokens = tokens
+
+    def expect(self, i, text):
+        if i >= len(self.tokens) or self.tokens[i].text != text:
+            raise _NotLiteral(text)
+        return i + 1
+
+    def value(self, i):
+        """Parse one literal value. Returns (kind, value, next_index)."""
+        toks = self.tokens
+        tok = toks[i]
+        if tok.kind == "string":
+            return "string", decode_string(tok.text), i + 1
+        if tok.kind == "number" or (tok.text == "-" and toks[i + 1].kind == "number"):
+            return self.number(i)
+        if tok.kind == "ident":
+            if tok.text in ("true", "false"):
+                return "bool", tok.text == "true", i + 1
+            if tok.text in ("nil", "null"):
+                return "null", None, i + 1
+            if toks[i + 1].text == "(":
+                return self.call(i)
+            raise _NotLiteral(tok.text)
+        if tok.text == "." and toks[i + 1].kind == "ident":
+            return "enum", toks[i + 1].text, i + 2
+        if tok.text == "[":
+            items, i = self.sequence(i + 1, "]")
+            return "list", items, i
+        raise _NotLiteral(tok.text)
+
+    def number(self, i):
+        total = 0
+        kind = "int"
+        while True:
+            sign = 1
+            if self.tokens[i].text == "-":
+                sign = -1
+                i += 1
+            tok = self.tokens[i]
+            if tok.kind != "number":
+                raise _NotLiteral(tok.text)
+            value = _decode_number(tok.text)
+            if isinstance(value, float):
+                kind = "float"
+            total += sign * value
+            i += 1
+            # Literal sums such as `487_614_201 + 162_952_446`.
+            if self.tokens[i].text == "+" and self.tokens[i + 1].kind == "number":
+                i += 1
+                continue
+            return kind, total, i
+
+    def sequence(self, i, close):
+        items = []
+        while self.tokens[i].text != close:
+            _, value, i = self.value(i)
+            items.append(value)
+            if self.tokens[i].text == ",":
+                i += 1
+        return items, i + 1
+
+    def call(self, i):
+        name = self.tokens[i].text
+        if name in _LIST_CALLS:
+            items, i = self.sequence(i + 2, ")")
+            return "list", items, i
+        args, i = self.arguments(i + 1)
+        return "call", {"__call__": name, **{k: f.value for k, f in args.items()}}, i
+
+    def skip_expression(self, i):
+        """Advance past one argument expression to the next `,` or `)`."""
+        depth = 0
+        while True:
+            text = self.tokens[i].text
+            if text in ("(", "[", "{"):
+                depth += 1
+            elif text in (")", "]", "}"):
+                if depth == 0:
+                    return i
+                depth -= 1
+            elif text == "," and depth == 0:
+                return i
+            elif text == "":
+                raise _NotLiteral("end of input")
+            i += 1
+
+    def arguments(self, i):
+        """Parse `(name: value, ...)` / `(name = value, ...)` starting at `(`."""
+        i = self.expect(i, "(")
+        args = {}
+        position = 0
+        while self.tokens[i].text != ")":
+            tok = self.tokens[i]
+            if tok.kind == "ident" and self.tokens[i + 1].text in (":", "="):
+                name = tok.text
+                i += 2
+            else:
+                name = f"_{position}"
+            start = self.tokens[i].start
+            try:
+                kind, value, j = self.value(i)
+                if self.tokens[j].text not in (",", ")"):
+                    raise _NotLiteral(self.tokens[j].text)
+                i = j
+            except _NotLiteral:
+                # Computed arguments (`when (...) { ... }`, helper calls) are
+                # kept as raw source so the entry is still indexed.
+                i = self.skip_expression(i)
+                kind, value = "expr", self.text[start:self.tokens[i - 1].end]
+            end = self.tokens[i - 1].end
+            args[name] = Field(name, kind, value, start, end)
+            position += 1
+            if self.tokens[i].text == ",":
+                i += 1
+        return args, i + 1
+
+
+def parse(text, platform, path="<memory>"):
+    """Parse catalog source text into a CatalogIndex."""
+    if platform not in CONSTRUCTORS:
+        raise CatalogParseError(f"unknown platform {platform!r}")
+    constructor = CONSTRUCTORS[platform]
+    tokens = tokenize(text)
+    # Sentinel so look-ahead never runs off the end.
+    tokens.append(Token("punct", "", len(text), len(text)))
+    parser = _LiteralParser(text, tokens)
+
+    entries = []
+    group = ""
+    i = 0
+    line = 1
+    line_offset = 0
+    while i < len(tokens) - 1:
+        tok = tokens[i]
+        if tok.kind == "ident" and tok.text in ("let", "val", "var") and tokens[i + 1].kind == "ident":
+            group = tokens[i + 1].text
+        elif (tok.text == constructor
+              and tokens[i + 1].text == "("
+              and i > 0 and tokens[i - 1].text in ("[", "(", ",")):
+            try:
+                args, end_i = parser.arguments(i + 1)
+            except (_NotLiteral, IndexError):
+                i += 1
+                continue
+            line += text.count("\n", line_offset, tok.start)
+            line_offset = tok.start
+            entries.append(CatalogEntry(
+                platform=platform,
+                group=group,
+                start=tok.start,
+                end=tokens[end_i - 1].end,
+                line=line,
+                fields=args,
+            ))
+            i = end_i
+            continue
+        i += 1
+    return CatalogIndex(platform, path, text, entries)
+
+
+def load(path, platform=None):
+    """Read and parse a ModelData.swift / ModelData.kt file."""
+    platform = platform or platform_for_path(path)
+    # newline="" keeps offsets aligned with the bytes on disk for `edits`.
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        text = f.read()
+    return parse(text, platform, os.fspath(path))
@@ -5,7 +5,8 @@ GGUF Metadata Inspector
 A lightweight utility to parse and display metadata from GGUF files before
 transferring them to mobile devices for LLM-Hub.
 
-Note: This script only reads the header and metadata key-value pairs. 
+Note: This script only reads the header, metadata key-value pairs and tensor
+table; tensor data is never loaded.
 For a complete C99 zero-dependency implementation of GGUF parsing and 
 highly optimized AVX-512 CPU inference, see Project Zero:
 https://github.com/shifulegend/project-zero
@@ -16,11 +17,129 @@ import sys
 import os
 
 GGUF_MAGIC = 0x46554747  # "GGUF"
+GGUF_DEFAULT_ALIGNMENT = 32
+
+# Fixed-width metadata value types: type id -> struct format.
+_SCALAR_FORMATS = {
+    0: "<B", 1: "<b", 2: "<H", 3: "<h", 4: "<I", 5: "<i",
+    6: "<f", 7: "<?", 10: "<Q", 11: "<q", 12: "<d",
+}
+_TYPE_STRING = 8
+_TYPE_ARRAY = 9
+
+# ggml tensor types: type id -> (elements per block, bytes per block).
+GGML_TYPE_SIZES = {
+    0: (1, 4),       # F32
+    1: (1, 2),       # F16
+    2: (32, 18),     # Q4_0
+    3: (32, 20),     # Q4_1
+    6: (32, 22),     # Q5_0
+    7: (32, 24),     # Q5_1
+    8: (32, 34),     # Q8_0
+    9: (32, 36),     # Q8_1
+    10: (256, 84),   # Q2_K
+    11: (256, 110),  # Q3_K
+    12: (256, 144),  # Q4_K
+    13: (256, 176),  # Q5_K
+    14: (256, 210),  # Q6_K
+    15: (256, 292),  # Q8_K
+    16: (256, 66),   # IQ2_XXS
+    17: (256, 74),   # IQ2_XS
+    18: (256, 98),   # IQ3_XXS
+    19: (256, 50),   # IQ1_S
+    20: (32, 18),    # IQ4_NL
+    21: (256, 110),  # IQ3_S
+    22: (256, 82),   # IQ2_S
+    23: (256, 136),  # IQ4_XS
+    24: (1, 1),      # I8
+    25: (1, 2),      # I16
+    26: (1, 4),      # I32
+    27: (1, 8),      # I64
+    28: (1, 8),      # F64
+    29: (256, 56),   # IQ1_M
+    30: (1, 2),      # BF16
+    34: (256, 54),   # TQ1_0
+    35: (256, 66),   # TQ2_0
+    39: (32, 17),    # MXFP4
+}
+
+
+class GGUFError(ValueError):
+    pass
+
 
 def read_string(f):
     length = struct.unpack("<Q", f.read(8))[0]
     return f.read(length).decode('utf-8', errors='replace')
 
+
+def _read_value(f, value_type):
+    if value_type == _TYPE_STRING:
+        return read_string(f)
+    if value_type == _TYPE_ARRAY:
+        item_type, count = struct.unpack("<IQ", f.read(12))
+        if item_type in _SCALAR_FORMATS:
+            # Large scalar arrays (token scores, types) are skipped in one read.
+            fmt = _SCALAR_FORMATS[item_type]
+            f.seek(struct.calcsize(fmt) * count, os.SEEK_CUR)
+            return None
+        for _ in range(count):
+            _read_value(f, item_type)
+        return None
+    fmt = _SCALAR_FORMATS.get(value_type)
+    if fmt is None:
+        raise GGUFError(f"unknown metadata value type {value_type}")
+    return struct.unpack(fmt, f.read(struct.calcsize(fmt)))[0]
+
+
+def read_layout(file_path):
+    """Read the GGUF header and tensor table without touching tensor data.
+
+    Returns a dict with the header counts, the aligned data offset, the
+    total tensor data size and the file size those imply, so a catalog
+    sizeBytes can be checked against what the file itself declares.
+    """
+    with open(file_path, "rb") as f:
+        magic = struct.unpack("<I", f.read(4))[0]
+        if magic != GGUF_MAGIC:
+            raise GGUFError(f"{file_path} is not a valid GGUF file")
+        version, tensor_count, kv_count = struct.unpack("<IQQ", f.read(20))
+
+        alignment = GGUF_DEFAULT_ALIGNMENT
+        for _ in range(kv_count):
+            key = read_string(f)
+            value_type = struct.unpack("<I", f.read(4))[0]
+            value = _read_value(f, value_type)
+            if key == "general.alignment":
+                alignment = int(value)
+
+        data_bytes = 0
+        for _ in range(tensor_count):
+            read_string(f)
+            n_dims = struct.unpack("<I", f.read(4))[0]
+            dims = struct.unpack(f"<{n_dims}Q", f.read(8 * n_dims))
+            ggml_type, offset = struct.unpack("<IQ", f.read(12))
+            if ggml_type not in GGML_TYPE_SIZES:
+                raise GGUFError(f"unknown ggml tensor type {ggml_type}")
+            block, type_size = GGML_TYPE_SIZES[ggml_type]
+            elements = 1
+            for d in dims:
+                elements *= d
+            data_bytes = max(data_bytes, offset + elements // block * type_size)
+
+        header_end = f.tell()
+        data_offset = (header_end + alignment - 1) // alignment * alignment
+
+    return {
+        "version": version,
+        "tensor_count": tensor_count,
+        "kv_count": kv_count,
+        "alignment": alignment,
+        "data_offset": data_offset,
+        "tensor_data_bytes": data_bytes,
+        "expected_file_size": data_offset + data_bytes,
+    }
+
 def parse_gguf(file_path):
     with open(file_path, "rb") as f:
         magic = struct.unpack("<I", f.read(4))[0]
@@ -36,11 +155,17 @@ def parse_gguf(file_path):
         print(f"Version: {version}")
         print(f"Tensors: {tensor_count}")
         print(f"Metadata KV pairs: {kv_count}")
-        print("-" * 40)
-        
-        # We stop parsing here to keep the script simple and standalone
-        # as a quick sanity check tool for users.
-        print("Header valid. Model is ready for LLM-Hub on-device inference!")
+
+    layout = read_layout(file_path)
+    actual_size = os.path.getsize(file_path)
+    print(f"Tensor data: {layout['tensor_data_bytes']} bytes at offset {layout['data_offset']}")
+    print(f"Expected file size: {layout['expected_file_size']} bytes (on disk: {actual_size})")
+    print("-" * 40)
+    if actual_size < layout['expected_file_size']:
+        print("Warning: file is smaller than its header declares; the download may be truncated.")
+        sys.exit(1)
+
+    print("Header valid. Model is ready for LLM-Hub on-device inference!")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
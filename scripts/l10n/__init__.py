@@ -0,0 +1,24 @@
+"""
+Localization tooling for LLM-Hub.
+
+Android strings live in android/app/src/main/res/values*/strings.xml and
+iOS strings in ios/LLMHub/Sources/LLMHub/*.lproj/Localizable.strings. The
+tools here parse each file once into a key -> span index and apply every
+change for that file in a single splice, written atomically and only when
+something actually changed.
+
+Run `python3 -m scripts.l10n --help` from the repository root.
+"""
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+ANDROID_RES = REPO_ROOT / "android" / "app" / "src" / "main" / "res"
+IOS_SOURCES = REPO_ROOT / "ios" / "LLMHub" / "Sources" / "LLMHub"
+
+__all__ = [
+    "ANDROID_RES",
+    "IOS_SOURCES",
+    "REPO_ROOT",
+]
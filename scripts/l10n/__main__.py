@@ -0,0 +1,351 @@
+"""
+Command-line entry point for the localization tools.
+
+    python3 -m scripts.l10n patch CHANGES.json [--res-dir DIR] [--dry-run]
+    python3 -m scripts.l10n check [--jobs N] [--format text|json] [--strict] [FILE ...]
+    python3 -m scripts.l10n parity [--platform android|ios] [--format text|json] [--keys]
+    python3 -m scripts.l10n sync [--full] [--dry-run] [--cache PATH] [--direction D]
+    python3 -m scripts.l10n unused [--platform android|ios] [--format text|json] [--prune]
+    python3 -m scripts.l10n aliases [--fix | --drop] [--discard-differing] [--dry-run] [--format text|json]
+    python3 -m scripts.l10n export OUT.xlf|OUT.csv [--platform android|ios] [--untranslated] [--since OLD]
+    python3 -m scripts.l10n import FILE.xlf|FILE.csv [--dry-run]
+
+CHANGES.json holds {"strings": {key: {locale: text}}, "anchors": {key: anchor}}.
+Locales are language codes ("en" is the default values folder; "id" and "he"
+also update values-in and values-iw). Export and import skip those legacy
+folders; run `aliases --fix` after an import to bring them in line.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from . import ANDROID_RES, IOS_SOURCES, REPO_ROOT, aliases, android, apple, exchange, parity, sync, unused
+
+
+def cmd_patch(args):
+    with open(args.changes, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    start = time.perf_counter()
+    try:
+        results = android.patch(args.res_dir, spec.get("strings", {}), spec.get("anchors"),
+                                dry_run=args.dry_run)
+    except android.StringsError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    for result in results:
+        if not (result.replaced or result.inserted or result.missing_anchor):
+            continue
+        print(f"{result.path}: {len(result.inserted)} inserted, {len(result.replaced)} replaced"
+              + ("" if result.written or args.dry_run else " (unchanged)"))
+        for key in result.missing_anchor:
+            print(f"  warning: anchor for {key!r} not found; appended before </resources>")
+    elapsed = (time.perf_counter() - start) * 1000.0
+    written = sum(r.written for r in results)
+    print(f"{len(results)} file(s) checked, {written} written ({elapsed:.0f} ms)", file=sys.stderr)
+    return 0
+
+
+def cmd_check(args):
+    start = time.perf_counter()
+    paths = args.files or apple.find_strings_files(IOS_SOURCES)
+    diagnostics = apple.validate(paths, args.jobs)
+    if args.format == "json":
+        print(json.dumps([d.record() for d in diagnostics], indent=2, ensure_ascii=False))
+    else:
+        for diagnostic in diagnostics:
+            print(diagnostic)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    errors = sum(d.severity == apple.ERROR for d in diagnostics)
+    print(f"{len(paths)} file(s): {errors} error(s), {len(diagnostics) - errors} warning(s) "
+          f"({elapsed:.0f} ms)", file=sys.stderr)
+    failing = diagnostics if args.strict else [d for d in diagnostics if d.severity == apple.ERROR]
+    return 1 if failing else 0
+
+
+def cmd_parity(args):
+    start = time.perf_counter()
+    matrices = {}
+    try:
+        if args.platform in (None, "android"):
+            matrices["android"] = parity.android_matrix(args.res_dir)
+        if args.platform in (None, "ios"):
+            matrices["ios"] = parity.ios_matrix(args.ios_dir)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    reports = [r for m in matrices.values() for r in parity.report(m)]
+    cross = parity.cross_platform(matrices["android"], matrices["ios"]) if len(matrices) == 2 else {}
+    elapsed = (time.perf_counter() - start) * 1000.0
+
+    if args.format == "json":
+        print(json.dumps({
+            "locales": [r.record() for r in reports],
+            "cross_platform": cross,
+        }, indent=2, ensure_ascii=False))
+    else:
+        for r in reports:
+            path = os.path.relpath(r.path, REPO_ROOT)
+            print(f"{r.platform:8} {r.column:10} {r.present:5}/{r.total:<5} "
+                  f"missing {len(r.missing):4}  extra {len(r.extra):4}  stale {len(r.stale):4}  {path}")
+            if args.keys:
+                for label in ("missing", "extra", "stale"):
+                    keys = getattr(r, label)
+                    if keys:
+                        print(f"    {label}: {', '.join(keys)}")
+        for locale, sides in cross.items():
+            if sides["android_only"] or sides["ios_only"]:
+                print(f"cross    {locale:10} android-only {len(sides['android_only']):4}  "
+                      f"ios-only {len(sides['ios_only']):4}")
+                if args.keys:
+                    for label, keys in sides.items():
+                        if keys:
+                            print(f"    {label}: {', '.join(keys)}")
+    keys = sum(len(m.keys) for m in matrices.values())
+    files = sum(len(m.columns) for m in matrices.values())
+    print(f"{files} file(s), {keys} key(s) ({elapsed:.0f} ms)", file=sys.stderr)
+    return 0
+
+
+def cmd_sync(args):
+    start = time.perf_counter()
+    try:
+        results, patched = sync.sync(args.res_dir, args.ios_dir, args.cache, full=args.full,
+                                     dry_run=args.dry_run, direction=args.direction)
+    except (ValueError, android.StringsError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    for r in results:
+        if r.skipped:
+            continue
+        if r.updated or r.added or r.pulled:
+            status = "" if r.written or args.dry_run or not (r.updated or r.added) else " (unchanged)"
+            print(f"{r.locale}: {len(r.updated)} updated, {len(r.added)} added on iOS; "
+                  f"{len(r.pulled)} sent to Android{status}")
+        for key in r.conflicts:
+            print(f"  warning: {key!r} changed on both platforms; kept the Android value")
+    for result in patched:
+        if result.replaced or result.inserted:
+            status = "" if result.written or args.dry_run else " (unchanged)"
+            print(f"{os.path.relpath(result.path, REPO_ROOT)}: {len(result.inserted)} inserted, "
+                  f"{len(result.replaced)} replaced{status}")
+    elapsed = (time.perf_counter() - start) * 1000.0
+    skipped = sum(r.skipped for r in results)
+    written = sum(r.written for r in results) + sum(r.written for r in patched)
+    print(f"{len(results)} locale(s): {skipped} unchanged since last sync, {written} file(s) written "
+          f"({elapsed:.0f} ms)", file=sys.stderr)
+    return 0
+
+
+def cmd_unused(args):
+    start = time.perf_counter()
+    reports = []
+    if args.platform in (None, "android"):
+        reports.append(unused.android_report(args.res_dir, [os.path.dirname(args.res_dir)], args.jobs))
+    if args.platform in (None, "ios"):
+        reports.append(unused.ios_report(args.ios_dir, [args.swift_dir], args.jobs))
+    elapsed = (time.perf_counter() - start) * 1000.0
+
+    if args.format == "json":
+        print(json.dumps([r.record() for r in reports], indent=2, ensure_ascii=False))
+    else:
+        for r in reports:
+            for item in r.unused:
+                print(f"{r.platform:8} {item.key:40} {item.total_bytes:7} bytes in "
+                      f"{len(item.bytes_by_locale)} file(s)")
+            for locale, size in sorted(r.bytes_by_locale().items()):
+                print(f"{r.platform:8} {locale:12} {size:7} bytes unused")
+    for r in reports:
+        print(f"{r.platform}: {len(r.unused)}/{r.base_keys} key(s) unused, "
+              f"{sum(r.bytes_by_locale().values())} bytes across locales; "
+              f"{r.sources} source file(s) scanned", file=sys.stderr)
+    print(f"scan took {elapsed:.0f} ms", file=sys.stderr)
+
+    if args.prune:
+        for r in reports:
+            keys = [item.key for item in r.unused]
+            if not keys:
+                continue
+            prune = unused.prune_android if r.platform == "android" else unused.prune_ios
+            target = args.res_dir if r.platform == "android" else args.ios_dir
+            written = prune(target, keys)
+            print(f"{r.platform}: pruned {len(keys)} key(s), {len(written)} file(s) written",
+                  file=sys.stderr)
+    return 0
+
+
+def cmd_aliases(args):
+    start = time.perf_counter()
+    try:
+        if args.fix or args.drop:
+            reports = aliases.dedupe(args.res_dir, drop=args.drop, gradle_path=args.gradle,
+                                     dry_run=args.dry_run, discard_differing=args.discard_differing)
+        else:
+            reports = aliases.compare(args.res_dir)
+    except aliases.AliasConflictError as e:
+        for r in e.reports:
+            for name in r.differing:
+                print(f"{r.legacy}: differing: {name}", file=sys.stderr)
+        print(f"error: {e}; resolve them in the canonical folder or pass --discard-differing "
+              f"to keep the canonical text", file=sys.stderr)
+        return 1
+    except android.StringsError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    elapsed = (time.perf_counter() - start) * 1000.0
+
+    if args.format == "json":
+        print(json.dumps([r.record() for r in reports], indent=2, ensure_ascii=False))
+    else:
+        for r in reports:
+            state = "identical" if r.identical else (
+                f"{len(r.legacy_only)} legacy-only, {len(r.differing)} differing")
+            action = (f" -> {r.action}" + ("" if r.written or args.dry_run else " (unchanged)")) if r.action else ""
+            print(f"{r.legacy} = {r.canonical}: {state}, {r.bytes} bytes{action}")
+            for name in r.legacy_only:
+                print(f"    legacy-only: {name}")
+            for name in r.differing:
+                print(f"    differing: {name}")
+    total = sum(r.bytes for r in reports)
+    sdk = aliases.min_sdk(args.gradle)
+    if args.drop:
+        verb = "would save" if args.dry_run else "saved"
+        summary = f"{verb} {total} bytes of duplicate strings"
+    elif sdk is not None and sdk >= aliases.ALIAS_FREE_MIN_SDK:
+        summary = f"minSdk {sdk}: --drop would save {total} bytes"
+    else:
+        summary = f"minSdk {sdk}: legacy folders are still needed"
+    print(f"{len(reports)} alias folder(s); {summary} ({elapsed:.0f} ms)", file=sys.stderr)
+    return 0
+
+
+def cmd_export(args):
+    start = time.perf_counter()
+    try:
+        fmt = exchange.format_for_path(args.out)
+        if args.platform == exchange.ANDROID:
+            base, targets = exchange.android_tables(args.res_dir)
+        else:
+            base, targets = exchange.ios_tables(args.ios_dir)
+        changed = exchange.changed_keys(base, args.since, args.platform) if args.since else None
+        items = exchange.units(args.platform, base, targets, set(args.locale or ()),
+                               untranslated=args.untranslated, changed=changed)
+        count = exchange.export(args.out, items, fmt)
+    except (exchange.ExchangeError, android.StringsError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    elapsed = (time.perf_counter() - start) * 1000.0
+    print(f"{args.out}: {count} unit(s), {len(base)} key(s) x {len(targets)} locale(s) "
+          f"({elapsed:.0f} ms)", file=sys.stderr)
+    return 0
+
+
+def cmd_import(args):
+    start = time.perf_counter()
+    try:
+        results = exchange.import_file(args.file, args.res_dir, args.ios_dir, dry_run=args.dry_run)
+    except (exchange.ExchangeError, android.StringsError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    files = written = 0
+    for platform, platform_results in results.items():
+        for result in platform_results:
+            files += 1
+            written += result.written
+            if result.replaced or result.inserted:
+                status = "" if result.written or args.dry_run else " (unchanged)"
+                print(f"{os.path.relpath(result.path, REPO_ROOT)}: {len(result.inserted)} inserted, "
+                      f"{len(result.replaced)} replaced{status}")
+    elapsed = (time.perf_counter() - start) * 1000.0
+    print(f"{files} file(s) checked, {written} written ({elapsed:.0f} ms)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m scripts.l10n", description=__doc__.split("\n\n")[0].strip())
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("patch", help="apply a {key: {locale: text}} change set to every strings.xml")
+    p.add_argument("changes", help="JSON change set")
+    p.add_argument("--res-dir", default=str(ANDROID_RES), help="Android res directory")
+    p.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    p.set_defaults(func=cmd_patch)
+
+    p = sub.add_parser("check", help="validate iOS Localizable.strings files")
+    p.add_argument("files", nargs="*", help="files to check (default: every lproj bundle of the app)")
+    p.add_argument("--jobs", type=int, help="worker processes (default: parallel only for large batches)")
+    p.add_argument("--format", choices=("text", "json"), default="text")
+    p.add_argument("--strict", action="store_true", help="fail on warnings too")
+    p.set_defaults(func=cmd_check)
+
+    p = sub.add_parser("parity", help="report missing, extra and stale keys per locale")
+    p.add_argument("--platform", choices=("android", "ios"), help="limit to one platform")
+    p.add_argument("--res-dir", default=str(ANDROID_RES), help="Android res directory")
+    p.add_argument("--ios-dir", default=str(IOS_SOURCES), help="directory holding the *.lproj bundles")
+    p.add_argument("--format", choices=("text", "json"), default="text")
+    p.add_argument("--keys", action="store_true", help="list the keys, not just the counts")
+    p.set_defaults(func=cmd_parity)
+
+    p = sub.add_parser("sync", help="sync Android strings into iOS (and back with --direction), incrementally")
+    p.add_argument("--res-dir", default=str(ANDROID_RES), help="Android res directory")
+    p.add_argument("--ios-dir", default=str(IOS_SOURCES), help="directory holding the *.lproj bundles")
+    p.add_argument("--cache", default=str(sync.DEFAULT_CACHE), help="hash cache location")
+    p.add_argument("--full", action="store_true", help="ignore the cache and compare every key")
+    p.add_argument("--dry-run", action="store_true", help="report without writing files or the cache")
+    p.add_argument("--direction", choices=sync.DIRECTIONS, default=sync.ANDROID_TO_IOS,
+                   help=f"sync direction (default: {sync.ANDROID_TO_IOS}; pulling from iOS "
+                        f"needs a cache from an earlier run)")
+    p.set_defaults(func=cmd_sync)
+
+    p = sub.add_parser("unused", help="report (and optionally prune) strings no source file references")
+    p.add_argument("--platform", choices=("android", "ios"), help="limit to one platform")
+    p.add_argument("--res-dir", default=str(ANDROID_RES),
+                   help="Android res directory; its parent (java/, AndroidManifest.xml) is scanned")
+    p.add_argument("--ios-dir", default=str(IOS_SOURCES), help="directory holding the *.lproj bundles")
+    p.add_argument("--swift-dir", default=str(IOS_SOURCES.parent), help="Swift sources to scan")
+    p.add_argument("--jobs", type=int, help="worker processes (default: parallel only for large trees)")
+    p.add_argument("--format", choices=("text", "json"), default="text")
+    p.add_argument("--prune", action="store_true", help="delete the unused keys from every locale")
+    p.set_defaults(func=cmd_unused)
+
+    p = sub.add_parser("aliases", help="fold values-in / values-iw into values-id / values-he")
+    p.add_argument("--res-dir", default=str(ANDROID_RES), help="Android res directory")
+    p.add_argument("--gradle", default=str(aliases.DEFAULT_GRADLE), help="app build script holding minSdk")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--fix", action="store_true",
+                      help="merge legacy-only strings into the canonical file and regenerate the alias")
+    mode.add_argument("--drop", action="store_true",
+                      help="merge legacy-only strings, then delete the alias (needs minSdk 24+)")
+    p.add_argument("--discard-differing", action="store_true",
+                   help="let --fix/--drop overwrite legacy strings that differ from the canonical copy")
+    p.add_argument("--dry-run", action="store_true", help="report without writing")
+    p.add_argument("--format", choices=("text", "json"), default="text")
+    p.set_defaults(func=cmd_aliases)
+
+    p = sub.add_parser("export", help="write keys x locales to XLIFF or CSV for translators")
+    p.add_argument("out", help="output file; .xlf/.xliff or .csv picks the format")
+    p.add_argument("--platform", choices=(exchange.ANDROID, exchange.IOS), default=exchange.ANDROID)
+    p.add_argument("--res-dir", default=str(ANDROID_RES), help="Android res directory")
+    p.add_argument("--ios-dir", default=str(IOS_SOURCES), help="directory holding the *.lproj bundles")
+    p.add_argument("--locale", action="append", help="limit to this locale (repeatable)")
+    p.add_argument("--untranslated", action="store_true",
+                   help="only units that are missing or still hold the source text")
+    p.add_argument("--since", metavar="OLD",
+                   help="only keys whose source differs from this older base strings file")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="apply a translated XLIFF or CSV file in one pass per resource file")
+    p.add_argument("file", help=".xlf/.xliff or .csv file produced by `export`")
+    p.add_argument("--res-dir", default=str(ANDROID_RES), help="Android res directory")
+    p.add_argument("--ios-dir", default=str(IOS_SOURCES), help="directory holding the *.lproj bundles")
+    p.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    p.set_defaults(func=cmd_import)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
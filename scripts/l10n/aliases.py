@@ -0,0 +1,196 @@
+"""
+Treat the legacy values-in / values-iw folders as aliases of values-id /
+values-he.
+
+The canonical folder is the one that gets edited. `dedupe` first moves any
+string that only the legacy copy defines into the canonical file (after the
+same neighbour it follows in the legacy file), then either regenerates the
+legacy file as a byte copy of the canonical one or, when the app's minSdk
+resolves both codes on its own, deletes it so the APK carries one copy.
+Strings whose legacy text differs from the canonical one would be lost that
+way, so `dedupe` refuses to run while any exist unless the caller opts in
+with `discard_differing`.
+`android.patch` notices byte-identical aliases and writes the canonical
+result to them instead of planning the same edits twice.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+
+from ..catalog.edits import Edit, apply_edits, effective_edits, write_if_changed
+from . import ANDROID_RES, android
+
+# From Android 7.0 resource lookup matches values-id for "in" and values-he
+# for "iw" (and vice versa), so the legacy folders are redundant.
+ALIAS_FREE_MIN_SDK = 24
+
+DEFAULT_GRADLE = ANDROID_RES.parents[2] / "build.gradle.kts"
+
+_MIN_SDK_RE = re.compile(r"\bminSdk(?:Version)?\s*=?\s*(\d+)")
+
+MIRRORED = "mirrored"
+DROPPED = "dropped"
+
+
+@dataclass
+class AliasReport:
+    legacy: str  # folder name, e.g. values-in
+    canonical: str
+    legacy_path: str
+    canonical_path: str
+    bytes: int  # size of the legacy file
+    identical: bool
+    legacy_only: list = field(default_factory=list)
+    differing: list = field(default_factory=list)
+    action: str = ""
+    written: bool = False
+
+    def record(self):
+        return {
+            "legacy": self.legacy,
+            "canonical": self.canonical,
+            "bytes": self.bytes,
+            "identical": self.identical,
+            "legacy_only": self.legacy_only,
+            "differing": self.differing,
+            "action": self.action,
+            "written": self.written,
+        }
+
+
+class AliasConflictError(android.StringsError):
+    """Raised by `dedupe` when legacy strings differ from their canonical
+    copies; `reports` lists the affected folders and keys."""
+
+    def __init__(self, reports):
+        self.reports = reports
+        parts = [f"{r.legacy}: {len(r.differing)} string(s) differ from {r.canonical}" for r in reports]
+        super().__init__("; ".join(parts))
+
+
+def min_sdk(gradle_path=DEFAULT_GRADLE):
+    """minSdk declared in the app's Gradle script, or None."""
+    try:
+        with open(gradle_path, "r", encoding="utf-8") as f:
+            match = _MIN_SDK_RE.search(f.read())
+    except FileNotFoundError:
+        return None
+    return int(match.group(1)) if match else None
+
+
+def canonical_dir(dirname):
+    """values-in -> values-id; any other folder is its own canonical form."""
+    qualifier = dirname[len("values-"):]
+    modern = android.LEGACY_QUALIFIERS.get(qualifier)
+    return f"values-{modern}" if modern else dirname
+
+
+def alias_pairs(res_dir):
+    """[(legacy dir, canonical dir)] for every legacy folder with a canonical twin."""
+    files = android.strings_files(res_dir)
+    return [(d, canonical_dir(d)) for d in files if canonical_dir(d) != d and canonical_dir(d) in files]
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def _compare(legacy_doc, canonical_doc, legacy, canonical):
+    report = AliasReport(
+        legacy, canonical, legacy_doc.path, canonical_doc.path,
+        len(legacy_doc.text.encode("utf-8")), legacy_doc.text == canonical_doc.text,
+    )
+    if report.identical:
+        return report
+    for name, res in legacy_doc.resources.items():
+        other = canonical_doc.resources.get(name)
+        if other is None:
+            report.legacy_only.append(name)
+        elif res.raw(legacy_doc.text) != other.raw(canonical_doc.text):
+            report.differing.append(name)
+    return report
+
+
+def compare(res_dir):
+    files = android.strings_files(res_dir)
+    out = []
+    for legacy, canonical in alias_pairs(res_dir):
+        out.append(_compare(android.load(files[legacy]), android.load(files[canonical]), legacy, canonical))
+    return out
+
+
+def merge_edits(legacy_doc, canonical_doc):
+    """Edits that copy legacy-only resources into the canonical file.
+
+    Each element is copied verbatim and placed after the nearest preceding
+    resource the canonical file already has (or before </resources>).
+    """
+    if canonical_doc.close < 0:
+        raise android.StringsError(f"{canonical_doc.path}: no </resources> element")
+    text = canonical_doc.text
+    inserts = {}
+    anchor = None
+    for name, res in legacy_doc.resources.items():
+        if name in canonical_doc.resources:
+            anchor = name
+            continue
+        if anchor is None:
+            offset = canonical_doc.close
+        else:
+            end = text.find("\n", canonical_doc.resources[anchor].end)
+            offset = len(text) if end < 0 else end + 1
+        inserts.setdefault(offset, []).append(f"    {legacy_doc.text[res.start:res.end]}\n")
+    return [Edit(offset, offset, "".join(lines)) for offset, lines in inserts.items()]
+
+
+# ---------------------------------------------------------------------------
+# Deduplication
+# ---------------------------------------------------------------------------
+
+def dedupe(res_dir, drop=False, gradle_path=DEFAULT_GRADLE, dry_run=False, discard_differing=False):
+    """Fold every legacy folder into its canonical twin.
+
+    With `drop` the legacy strings.xml (and its folder, once empty) is
+    deleted; this needs minSdk >= ALIAS_FREE_MIN_SDK. Otherwise the legacy
+    file is rewritten as a copy of the canonical one. Either way the legacy
+    text of `differing` strings is lost, so unless `discard_differing` is
+    set (or this is a dry run) any such string raises AliasConflictError
+    before anything is written. Returns AliasReports.
+    """
+    if drop:
+        sdk = min_sdk(gradle_path)
+        if sdk is None or sdk < ALIAS_FREE_MIN_SDK:
+            raise android.StringsError(
+                f"minSdk {sdk} in {gradle_path} still needs the legacy folders "
+                f"(dropping them requires {ALIAS_FREE_MIN_SDK}+)")
+    files = android.strings_files(res_dir)
+    pairs = []
+    for legacy, canonical in alias_pairs(res_dir):
+        legacy_doc = android.load(files[legacy])
+        canonical_doc = android.load(files[canonical])
+        report = _compare(legacy_doc, canonical_doc, legacy, canonical)
+        report.action = DROPPED if drop else MIRRORED
+        pairs.append((report, legacy_doc, canonical_doc))
+    reports = [report for report, _, _ in pairs]
+    conflicts = [report for report in reports if report.differing]
+    if conflicts and not (dry_run or discard_differing):
+        raise AliasConflictError(conflicts)
+    if dry_run:
+        return reports
+
+    for report, legacy_doc, canonical_doc in pairs:
+        text = canonical_doc.text
+        edits = effective_edits(text, merge_edits(legacy_doc, canonical_doc))
+        if edits:
+            text = apply_edits(text, edits)
+            report.written = write_if_changed(canonical_doc.path, text)
+        if drop:
+            os.remove(legacy_doc.path)
+            folder = os.path.dirname(legacy_doc.path)
+            if not os.listdir(folder):
+                os.rmdir(folder)
+            report.written = True
+        else:
+            report.written = write_if_changed(legacy_doc.path, text) or report.written
+    return reports
@@ -0,0 +1,327 @@
+"""
+Index and batch-patch Android strings.xml files.
+
+Each values*/strings.xml is scanned once into a name -> span index. A change
+set of {key: {locale: text}} is then turned into one edit list per file:
+existing strings have their value replaced in place, new strings are
+inserted after an anchor key (or before </resources>), and the file is
+spliced and written once.
+"""
+
+import html
+import os
+import re
+from dataclasses import dataclass, field
+
+from ..catalog.edits import Edit, apply_edits, effective_edits, write_if_changed
+
+DEFAULT_LOCALE = "en"
+
+# Android still resolves the pre-BCP 47 codes for Indonesian and Hebrew, so
+# the app ships both folders with identical content.
+LEGACY_QUALIFIERS = {"in": "id", "iw": "he"}
+
+_ELEMENT_RE = re.compile(
+    r"""
+      (?P<comment><!--.*?-->)
+    | <(?P<tag>string|plurals|string-array)\b(?P<attrs>[^>]*?)
+      (?:/>|>(?P<body>.*?)</(?P=tag)\s*>)
+    """,
+    re.S | re.X,
+)
+_NAME_RE = re.compile(r'\bname\s*=\s*"([^"]*)"')
+_TRANSLATABLE_RE = re.compile(r'\btranslatable\s*=\s*"false"')
+_CLOSE_RE = re.compile(r"</resources\s*>")
+
+
+class StringsError(ValueError):
+    pass
+
+
+@dataclass
+class Resource:
+    name: str
+    tag: str
+    start: int
+    end: int
+    body_start: int
+    body_end: int
+    translatable: bool = True
+
+    def raw(self, text):
+        return text[self.body_start:self.body_end]
+
+
+@dataclass
+class StringsFile:
+    path: str
+    locale: str
+    text: str
+    resources: dict = field(default_factory=dict)
+    close: int = -1  # offset of </resources>
+
+    def line_of(self, offset):
+        return self.text.count("\n", 0, offset) + 1
+
+    def value(self, name):
+        """Decoded value of a <string>, or None when absent."""
+        res = self.resources.get(name)
+        if res is None or res.tag != "string":
+            return None
+        return decode_value(res.raw(self.text))
+
+
+# ---------------------------------------------------------------------------
+# Locales
+# ---------------------------------------------------------------------------
+
+def locale_for_dir(dirname):
+    """values -> en, values-ja -> ja, values-in -> id."""
+    if dirname == "values":
+        return DEFAULT_LOCALE
+    qualifier = dirname[len("values-"):]
+    return LEGACY_QUALIFIERS.get(qualifier, qualifier)
+
+
+def dirs_for_locale(locale):
+    """Every values folder that holds `locale`, including legacy aliases."""
+    if locale == DEFAULT_LOCALE:
+        return ["values"]
+    dirs = [f"values-{locale}"]
+    dirs += [f"values-{legacy}" for legacy, modern in LEGACY_QUALIFIERS.items() if modern == locale]
+    return dirs
+
+
+def strings_files(res_dir):
+    """Return {folder name: path} for every values*/strings.xml under `res_dir`."""
+    out = {}
+    for name in sorted(os.listdir(res_dir)):
+        if name == "values" or name.startswith("values-"):
+            path = os.path.join(res_dir, name, "strings.xml")
+            if os.path.isfile(path):
+                out[name] = path
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+_DECODE_ESCAPES = {"n": "\n", "t": "\t", "'": "'", '"': '"', "\\": "\\", "@": "@", "?": "?"}
+_DECODE_RE = re.compile(r"\\(u[0-9a-fA-F]{4}|.)", re.S)
+
+
+def decode_value(raw):
+    """Resolve XML entities and Android escapes in a <string> body."""
+    value = html.unescape(raw.strip())
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+
+    def unescape(match):
+        esc = match.group(1)
+        if esc[0] == "u" and len(esc) == 5:
+            return chr(int(esc[1:], 16))
+        return _DECODE_ESCAPES.get(esc, esc)
+
+    return _DECODE_RE.sub(unescape, value)
+
+
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.S)
+_TAG_RE = re.compile(r"</?[A-Za-z][^>]*>")
+_CDATA_MARK_RE = re.compile("\ue000(\\d+)\ue001")
+
+
+def string_value(raw):
+    """Text Resources.getString() returns for a <string> body.
+
+    Styling tags such as <b> are dropped and CDATA sections are kept
+    verbatim; everything else is decoded as by decode_value.
+    """
+    if "<" not in raw:
+        return decode_value(raw)
+    sections = []
+
+    def stash(match):
+        sections.append(match.group(1))
+        return f"\ue000{len(sections) - 1}\ue001"
+
+    value = decode_value(_TAG_RE.sub("", _CDATA_RE.sub(stash, raw)))
+    return _CDATA_MARK_RE.sub(lambda m: sections[int(m.group(1))], value)
+
+
+def encode_value(value):
+    """Escape plain text for use as a <string> body."""
+    out = (value.replace("\\", "\\\\")
+           .replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+           .replace("'", "\\'").replace('"', '\\"').replace("\n", "\\n"))
+    if out[:1] in ("@", "?"):
+        out = "\\" + out
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def parse(text, path="<memory>", locale=None):
+    doc = StringsFile(path, locale or DEFAULT_LOCALE, text)
+    for match in _ELEMENT_RE.finditer(text):
+        if match["comment"]:
+            continue
+        name = _NAME_RE.search(match["attrs"])
+        if not name:
+            continue
+        if match["body"] is None:
+            body_start = body_end = match.end()
+        else:
+            body_start, body_end = match.span("body")
+        doc.resources.setdefault(name.group(1), Resource(
+            name.group(1), match["tag"], match.start(), match.end(), body_start, body_end,
+            not _TRANSLATABLE_RE.search(match["attrs"]),
+        ))
+    close = _CLOSE_RE.search(text)
+    doc.close = close.start() if close else -1
+    return doc
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        text = f.read()
+    dirname = os.path.basename(os.path.dirname(os.fspath(path)))
+    return parse(text, os.fspath(path), locale_for_dir(dirname))
+
+
+# ---------------------------------------------------------------------------
+# Patching
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PatchResult:
+    path: str
+    replaced: list = field(default_factory=list)
+    inserted: list = field(default_factory=list)
+    missing_anchor: list = field(default_factory=list)
+    written: bool = False
+
+
+def _line_bounds(text, offset):
+    start = text.rfind("\n", 0, offset) + 1
+    end = text.find("\n", offset)
+    return start, (len(text) if end < 0 else end + 1)
+
+
+def _indent_at(text, offset):
+    start, _ = _line_bounds(text, offset)
+    line = text[start:offset]
+    return line if not line.strip() else "    "
+
+
+def plan(doc, changes, anchors=None):
+    """Return (edits, PatchResult) for one parsed file.
+
+    `changes` maps key -> {locale: text}; keys whose change has no entry for
+    this file's locale are skipped. `anchors` maps a new key to the key it
+    should follow; an anchor may be another key added by the same change set
+    as long as it comes first.
+    """
+    anchors = anchors or {}
+    result = PatchResult(doc.path)
+    edits = []
+    inserts = {}  # insert offset -> [lines], kept in change-set order
+    placed = {}  # new key -> (insert offset, its line)
+    last = {}  # new key -> last line of it and the keys chained after it
+    text = doc.text
+    if doc.close < 0:
+        raise StringsError(f"{doc.path}: no </resources> element")
+    tail, _ = _line_bounds(text, doc.close)
+    # `</resources>` sharing its line: insert before it, on a line of our own.
+    inline_close = bool(text[tail:doc.close].strip())
+    if inline_close:
+        tail = doc.close
+
+    for key, by_locale in changes.items():
+        value = by_locale.get(doc.locale)
+        if value is None:
+            continue
+        encoded = encode_value(value)
+        existing = doc.resources.get(key)
+        if existing is not None:
+            if existing.tag != "string":
+                raise StringsError(f"{doc.path}:{doc.line_of(existing.start)}: "
+                                   f"{key} is a <{existing.tag}>, not a <string>")
+            if decode_value(existing.raw(text)) != value:
+                edits.append(Edit(existing.body_start, existing.body_end, encoded))
+                result.replaced.append(key)
+            continue
+
+        anchor = anchors.get(key)
+        indent = "    "
+        if anchor in placed:
+            offset = placed[anchor][0]
+        elif anchor in doc.resources:
+            res = doc.resources[anchor]
+            offset = _line_bounds(text, res.end)[1]
+            indent = _indent_at(text, res.start)
+        else:
+            if anchor:
+                result.missing_anchor.append(key)
+            offset = tail
+        line = f'{indent}<string name="{key}">{encoded}</string>\n'
+        if inline_close and offset == doc.close:
+            line = "\n" + line
+        lines = inserts.setdefault(offset, [])
+        if anchor in placed:
+            # Chain after the keys already following the anchor, so several
+            # keys anchored to one new key keep change-set order.
+            previous = last[anchor]
+            lines.insert(lines.index(previous) + 1, line)
+            while anchor in placed and last[anchor] == previous:
+                last[anchor] = line
+                anchor = anchors.get(anchor)
+        else:
+            lines.append(line)
+        placed[key] = (offset, line)
+        last[key] = line
+        result.inserted.append(key)
+
+    edits.extend(Edit(offset, offset, "".join(lines)) for offset, lines in inserts.items())
+    return edits, result
+
+
+def patch(res_dir, changes, anchors=None, dry_run=False, legacy=True):
+    """Apply a change set to every strings.xml under `res_dir`.
+
+    Returns one PatchResult per file that the change set touches. A legacy
+    folder (values-in, values-iw) that is a byte copy of its canonical twin
+    is not planned again; it receives the canonical file's new contents.
+    With `legacy` false the legacy folders are left alone entirely.
+    """
+    results = []
+    patched = {}  # canonical dirname -> (old text, new text, result)
+    for dirname, path in strings_files(res_dir).items():
+        is_legacy = dirname[len("values-"):] in LEGACY_QUALIFIERS
+        if is_legacy and not legacy:
+            continue
+        locale = locale_for_dir(dirname)
+        if not any(locale in by_locale for by_locale in changes.values()):
+            continue
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        twin = patched.get(f"values-{locale}") if is_legacy else None
+        if twin is not None and twin[0] == text:
+            old, new, source = twin
+            result = PatchResult(path, list(source.replaced), list(source.inserted),
+                                 list(source.missing_anchor))
+            if new != old and not dry_run:
+                result.written = write_if_changed(path, new)
+            results.append(result)
+            continue
+        doc = parse(text, path, locale)
+        edits, result = plan(doc, changes, anchors)
+        edits = effective_edits(doc.text, edits)
+        new = apply_edits(doc.text, edits) if edits else doc.text
+        if edits and not dry_run:
+            result.written = write_if_changed(path, new)
+        patched[dirname] = (doc.text, new, result)
+        results.append(result)
+    return results
@@ -0,0 +1,379 @@
+"""
+Tokenizer, parser and validator for iOS Localizable.strings files.
+
+The .strings format is the old-style property list subset Xcode compiles:
+
+    /* comment */  // comment
+    "key" = "value";
+    key = "value";      (unquoted keys and values are plain words)
+    "key";              (value defaults to the key)
+
+Strings may span lines and use \\" \\\\ \\n \\t \\r \\0 \\' and \\U/\\u four-digit
+hex escapes. Parsing reports every problem as a Diagnostic with the exact
+line and column instead of stopping at the first one, and returns the
+parsed entries (with source spans) so other tools can reuse them.
+"""
+
+import bisect
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from ..catalog.edits import Edit, apply_edits, effective_edits, write_if_changed
+
+# A whole `"key" = "value";` on one line is matched as a single token, so the
+# common case costs one regex match per entry; anything else falls back to
+# the individual tokens below.
+_TOKEN_RE = re.compile(
+    r'''
+      (?P<skip>(?:\s+|//[^\n]*|/\*.*?\*/)+)
+    | (?P<entry>(?P<ekey>"(?:[^"\\\n]+|\\.)*")[ \t]*=[ \t]*(?P<evalue>"(?:[^"\\]+|\\.)*")[ \t]*;)
+    | (?P<string>"(?:[^"\\]+|\\.)*")
+    | (?P<word>[A-Za-z0-9_.$:/-]+)
+    | (?P<punct>[=;])
+    | (?P<bad_comment>/\*)
+    | (?P<bad_string>")
+    | (?P<other>.)
+    ''',
+    re.S | re.X,
+)
+
+_ESCAPE_RE = re.compile(r"\\(?:([\"\\'ntr0abfv])|[Uu]([0-9a-fA-F]{4})|(.))", re.S)
+_SIMPLE_ESCAPES = {
+    '"': '"', "\\": "\\", "'": "'", "n": "\n", "t": "\t", "r": "\r", "0": "\0",
+    "a": "\a", "b": "\b", "f": "\f", "v": "\v",
+}
+
+ERROR = "error"
+WARNING = "warning"
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    path: str
+    line: int
+    column: int
+    severity: str
+    code: str
+    message: str
+
+    def __str__(self):
+        return f"{self.path}:{self.line}:{self.column}: {self.severity}: [{self.code}] {self.message}"
+
+    def record(self):
+        return asdict(self)
+
+
+@dataclass
+class Entry:
+    key: str
+    value: str
+    start: int  # offset of the key token
+    end: int  # offset just past the terminating ';'
+    value_start: int  # span of the value literal, quotes included
+    value_end: int
+    line: int
+    column: int
+
+
+@dataclass
+class StringsTable:
+    path: str
+    locale: str
+    text: str
+    entries: dict = field(default_factory=dict)
+    diagnostics: list = field(default_factory=list)
+    shadowed: list = field(default_factory=list)  # earlier entries of duplicate keys
+
+    def value(self, key):
+        entry = self.entries.get(key)
+        return None if entry is None else entry.value
+
+    @property
+    def ok(self):
+        return not any(d.severity == ERROR for d in self.diagnostics)
+
+
+class _Positions:
+    """Offset -> (line, column), both 1-based."""
+
+    def __init__(self, text):
+        self.starts = [0]
+        pos = text.find("\n")
+        while pos >= 0:
+            self.starts.append(pos + 1)
+            pos = text.find("\n", pos + 1)
+
+    def __call__(self, offset):
+        line = bisect.bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+
+def locale_for_path(path):
+    parent = os.path.basename(os.path.dirname(os.fspath(path)))
+    return parent[:-len(".lproj")] if parent.endswith(".lproj") else ""
+
+
+# ---------------------------------------------------------------------------
+# Strings
+# ---------------------------------------------------------------------------
+
+def decode_string(raw, report=None, offset=0):
+    """Decode a quoted .strings literal.
+
+    `report(offset, message)` is called for unknown escapes, which Xcode
+    would otherwise silently pass through.
+    """
+    body = raw[1:-1]
+    if "\\" not in body:
+        return body
+
+    def unescape(match):
+        simple, hex4, other = match.groups()
+        if simple is not None:
+            return _SIMPLE_ESCAPES[simple]
+        if hex4 is not None:
+            return chr(int(hex4, 16))
+        if report is not None:
+            report(offset + 1 + match.start(), f"unknown escape \\{other}")
+        return other
+
+    return _ESCAPE_RE.sub(unescape, body)
+
+
+def encode_string(value):
+    """Quote `value` as a .strings literal."""
+    out = (value.replace("\\", "\\\\").replace('"', '\\"')
+           .replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r"))
+    return f'"{out}"'
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def _tokens(text, diag):
+    """Yield (kind, text, offset, match), reporting lexical errors through `diag`."""
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "skip":
+            continue
+        start = match.start()
+        if kind == "bad_comment":
+            diag(start, ERROR, "unterminated-comment", "block comment is never closed")
+            return
+        if kind == "bad_string":
+            diag(start, ERROR, "unterminated-string", "string literal is never closed")
+            return
+        if kind == "other":
+            diag(start, ERROR, "unexpected-character", f"unexpected character {match.group()!r}")
+            continue
+        yield kind, match.group(), start, match
+
+
+def parse(text, path="<memory>", locale=None):
+    """Parse a .strings file, collecting diagnostics instead of raising."""
+    table = StringsTable(path, locale if locale is not None else locale_for_path(path), text)
+    position = _Positions(text)
+
+    def diag(offset, severity, code, message):
+        line, column = position(offset)
+        table.diagnostics.append(Diagnostic(path, line, column, severity, code, message))
+
+    def bad_escape(offset, message):
+        diag(offset, WARNING, "unknown-escape", message)
+
+    def literal(kind, raw, offset):
+        return decode_string(raw, bad_escape, offset) if kind == "string" else raw
+
+    tokens = list(_tokens(text, diag))
+    # After an unterminated string or comment the rest of the file is gone;
+    # don't pile "missing value" errors on top of that at end of input.
+    truncated = bool(table.diagnostics) and table.diagnostics[-1].code.startswith("unterminated")
+    n = len(tokens)
+
+    def at_end_error(i, offset, code, message):
+        if not (truncated and i >= n):
+            diag(offset, ERROR, code, message)
+
+    def skip_statement(i):
+        """Resynchronise after an error: continue past the next ';'."""
+        while i < n:
+            if tokens[i][0] == "entry":
+                return i
+            if tokens[i][1] == ";":
+                return i + 1
+            i += 1
+        return i
+
+    def add(key, value, start, end, value_span):
+        line, column = position(start)
+        if not key:
+            diag(start, WARNING, "empty-key", "empty key")
+        previous = table.entries.get(key)
+        if previous is not None:
+            diag(start, WARNING, "duplicate-key",
+                 f"{key!r} already defined on line {previous.line}; this value wins")
+            table.shadowed.append(previous)
+        table.entries[key] = Entry(key, value, start, end, value_span[0], value_span[1], line, column)
+
+    i = 0
+    while i < n:
+        kind, raw, start, match = tokens[i]
+        if kind == "entry":
+            add(literal("string", match["ekey"], start),
+                literal("string", match["evalue"], match.start("evalue")),
+                start, match.end(), match.span("evalue"))
+            i += 1
+            continue
+        if kind not in ("string", "word"):
+            diag(start, ERROR, "expected-key", f"expected a quoted key, found {raw!r}")
+            i = skip_statement(i)
+            continue
+        key = literal(kind, raw, start)
+        value, value_span = key, (start, start + len(raw))
+        i += 1
+        if i < n and tokens[i][1] == "=":
+            i += 1
+            if i < n and tokens[i][0] in ("string", "word"):
+                vkind, vraw, vstart, _ = tokens[i]
+                value, value_span = literal(vkind, vraw, vstart), (vstart, vstart + len(vraw))
+                i += 1
+            else:
+                where = tokens[i][2] if i < n else len(text)
+                at_end_error(i, where, "expected-value", f"missing value for {key!r}")
+                i = skip_statement(i)
+                continue
+        elif i < n and tokens[i][1] != ";":
+            diag(tokens[i][2], ERROR, "expected-equals", f"expected '=' after {key!r}")
+            i = skip_statement(i)
+            continue
+        if i < n and tokens[i][1] == ";":
+            end = tokens[i][2] + 1
+            i += 1
+        else:
+            end = value_span[1]
+            at_end_error(i, value_span[1], "missing-semicolon",
+                         f"missing ';' after the value of {key!r}")
+        add(key, value, start, end, value_span)
+    return table
+
+
+def load(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    path = os.fspath(path)
+    if data.startswith(b"\xff\xfe") or data.startswith(b"\xfe\xff"):
+        text = data.decode("utf-16")
+    else:
+        try:
+            text = data.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            table = StringsTable(path, locale_for_path(path), "")
+            table.diagnostics.append(Diagnostic(path, 1, 1, ERROR, "encoding", str(e)))
+            return table
+    return parse(text, path)
+
+
+# ---------------------------------------------------------------------------
+# Patching
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PatchResult:
+    path: str
+    replaced: list = field(default_factory=list)
+    inserted: list = field(default_factory=list)
+    written: bool = False
+
+
+def _append_block(text, lines):
+    prefix = "" if not text or text.endswith("\n") else "\n"
+    return prefix + "".join(f"{line}\n" for line in lines)
+
+
+def plan(table, values):
+    """Return (edits, replaced, inserted) setting every key of `values`.
+
+    Existing entries get their value literal replaced in place; new keys are
+    appended as one block at the end. `table` may be None for a file that
+    does not exist yet.
+    """
+    text = table.text if table is not None else ""
+    edits = []
+    replaced = []
+    appended = []
+    inserted = []
+    for key, value in values.items():
+        entry = table.entries.get(key) if table is not None else None
+        if entry is None:
+            appended.append(f"{encode_string(key)} = {encode_string(value)};")
+            inserted.append(key)
+        elif entry.value != value:
+            edits.append(Edit(entry.value_start, entry.value_end, encode_string(value)))
+            replaced.append(key)
+    if appended:
+        edits.append(Edit(len(text), len(text), _append_block(text, appended)))
+    return edits, replaced, inserted
+
+
+def patch(root, changes, dry_run=False, name="Localizable.strings"):
+    """Apply a {key: {locale: text}} change set to every bundle under `root`.
+
+    Returns one PatchResult per file the change set touches. Files with
+    syntax errors are refused rather than spliced.
+    """
+    results = []
+    for path in find_strings_files(root, name):
+        locale = locale_for_path(path)
+        values = {key: by_locale[locale] for key, by_locale in changes.items() if locale in by_locale}
+        if not values:
+            continue
+        table = load(path)
+        if not table.ok:
+            raise ValueError(f"{path}: cannot patch a file with syntax errors "
+                             f"(run `python3 -m scripts.l10n check`)")
+        edits, replaced, inserted = plan(table, values)
+        result = PatchResult(path, replaced, inserted)
+        edits = effective_edits(table.text, edits)
+        if edits and not dry_run:
+            result.written = write_if_changed(path, apply_edits(table.text, edits))
+        results.append(result)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+def find_strings_files(root, name="Localizable.strings"):
+    """Every `*.lproj/<name>` below `root`, sorted."""
+    return sorted(glob.glob(os.path.join(os.fspath(root), "**", "*.lproj", name), recursive=True))
+
+
+def _diagnose(path):
+    return load(path).diagnostics
+
+
+# Below this many files the cost of starting worker processes outweighs the
+# parsing itself.
+_PARALLEL_MIN_FILES = 64
+
+
+def validate(paths, jobs=None):
+    """Validate `paths`, in parallel across processes for large batches.
+
+    Returns all diagnostics, ordered by path, line and column.
+    """
+    paths = list(paths)
+    if jobs is None:
+        jobs = (os.cpu_count() or 1) if len(paths) >= _PARALLEL_MIN_FILES else 1
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+            results = list(pool.map(_diagnose, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    else:
+        results = [_diagnose(path) for path in paths]
+    diagnostics = [d for result in results for d in result]
+    return sorted(diagnostics, key=lambda d: (d.path, d.line, d.column))
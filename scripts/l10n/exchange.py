@@ -0,0 +1,280 @@
+"""
+XLIFF 1.2 and CSV export/import for translation rounds.
+
+Export walks the parsed resources of one platform and writes one unit per
+base key and target locale: the base-language source text and the current
+translation, if any. Units can be limited to keys that still need work
+(missing, or identical to the source) and/or keys whose source text changed
+since an older copy of the base file.
+
+Import reads a returned file into a single {key: {locale: text}} change set
+and hands it to the platform's patch engine, so every resource file is
+parsed once and written at most once however many units the file holds.
+Both directions use only the canonical Android folders: the legacy
+values-in / values-iw copies are neither exported nor patched on import
+(`python3 -m scripts.l10n aliases --fix` brings them back in line).
+
+CSV files have the columns platform, locale, key, source, target. In XLIFF
+each target locale is a <file> whose product-name is the platform.
+"""
+
+import csv
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from xml.sax.saxutils import escape, quoteattr
+
+from . import REPO_ROOT, android, apple, parity
+
+ANDROID = "android"
+IOS = "ios"
+
+XLIFF = "xliff"
+CSV = "csv"
+
+XLIFF_NS = "urn:oasis:names:tc:xliff:document:1.2"
+
+CSV_FIELDS = ("platform", "locale", "key", "source", "target")
+
+
+class ExchangeError(ValueError):
+    pass
+
+
+@dataclass
+class Unit:
+    platform: str
+    locale: str
+    key: str
+    source: str
+    target: str  # "" when untranslated
+    original: str = ""  # resource path, relative to the repository
+
+
+# ---------------------------------------------------------------------------
+# Collecting units
+# ---------------------------------------------------------------------------
+
+def _relpath(path):
+    return os.path.relpath(path, REPO_ROOT)
+
+
+def _android_strings(doc):
+    """Translatable plain <string>s of a parsed file, decoded.
+
+    Strings with inline markup are left out: their decoded text cannot be
+    written back through encode_value without losing the markup.
+    """
+    out = {}
+    for name, res in doc.resources.items():
+        if res.tag == "string" and res.translatable and "<" not in res.raw(doc.text):
+            out[name] = android.decode_value(res.raw(doc.text))
+    return out
+
+
+def android_tables(res_dir):
+    """(base values, {locale: (path, values)}); legacy alias folders are skipped."""
+    files = android.strings_files(res_dir)
+    if "values" not in files:
+        raise android.StringsError(f"{res_dir}: no values/strings.xml")
+    base = _android_strings(android.load(files["values"]))
+    targets = {}
+    for dirname, path in files.items():
+        if dirname == "values" or dirname[len("values-"):] in android.LEGACY_QUALIFIERS:
+            continue
+        targets[android.locale_for_dir(dirname)] = (path, _android_strings(android.load(path)))
+    return base, targets
+
+
+def ios_tables(ios_dir):
+    base = None
+    targets = {}
+    for path in apple.find_strings_files(ios_dir):
+        table = apple.load(path)
+        values = {key: e.value for key, e in table.entries.items()}
+        if table.locale == parity.BASE_LOCALE:
+            base = values
+        else:
+            targets[table.locale] = (path, values)
+    if base is None:
+        raise ExchangeError(f"{ios_dir}: no {parity.BASE_LOCALE}.lproj/Localizable.strings")
+    return base, targets
+
+
+def _needs_work(source, target):
+    return not target or (target == source and any(ch.isalpha() for ch in source))
+
+
+def units(platform, base, targets, locales=None, untranslated=False, changed=None):
+    """Yield Units in locale, then base-file order.
+
+    `untranslated` keeps units whose target is missing or still the source
+    text; `changed` (a set of keys) keeps units whose source moved. When
+    both are given a unit passes if either applies; with neither, every
+    unit is exported.
+    """
+    for locale in sorted(targets):
+        if locales and locale not in locales:
+            continue
+        path, values = targets[locale]
+        for key, source in base.items():
+            target = values.get(key, "")
+            if untranslated or changed is not None:
+                keep = (untranslated and _needs_work(source, target)) or (
+                    changed is not None and key in changed)
+                if not keep:
+                    continue
+            yield Unit(platform, locale, key, source, target, _relpath(path))
+
+
+def changed_keys(base, old_path, platform):
+    """Keys of `base` that are new or differ from an older base file."""
+    if platform == ANDROID:
+        old = _android_strings(android.load(old_path))
+    else:
+        old = {key: e.value for key, e in apple.load(old_path).entries.items()}
+    return {key for key, value in base.items() if old.get(key) != value}
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+def write_csv(f, items):
+    writer = csv.writer(f, lineterminator="\n")
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for unit in items:
+        writer.writerow((unit.platform, unit.locale, unit.key, unit.source, unit.target))
+        count += 1
+    return count
+
+
+def write_xliff(f, items, source_language=parity.BASE_LOCALE):
+    """Stream `items` as XLIFF 1.2, one <file> per locale."""
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write(f'<xliff xmlns="{XLIFF_NS}" version="1.2">\n')
+    current = None
+    count = 0
+    for unit in items:
+        if (unit.platform, unit.locale) != current:
+            if current is not None:
+                f.write("    </body>\n  </file>\n")
+            current = (unit.platform, unit.locale)
+            f.write(f"  <file original={quoteattr(unit.original)} datatype=\"plaintext\" "
+                    f"source-language={quoteattr(source_language)} "
+                    f"target-language={quoteattr(unit.locale)} "
+                    f"product-name={quoteattr(unit.platform)}>\n    <body>\n")
+        state = "needs-translation" if _needs_work(unit.source, unit.target) else "translated"
+        f.write(f"      <trans-unit id={quoteattr(unit.key)} xml:space=\"preserve\">\n"
+                f"        <source>{escape(unit.source)}</source>\n"
+                f"        <target state=\"{state}\">{escape(unit.target)}</target>\n"
+                f"      </trans-unit>\n")
+        count += 1
+    if current is not None:
+        f.write("    </body>\n  </file>\n")
+    f.write("</xliff>\n")
+    return count
+
+
+def export(path, items, fmt):
+    """Write `items` to `path` as XLIFF or CSV; returns the unit count."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return (write_xliff if fmt == XLIFF else write_csv)(f, items)
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+def format_for_path(path):
+    ext = os.path.splitext(os.fspath(path))[1].lower()
+    if ext in (".xlf", ".xliff"):
+        return XLIFF
+    if ext == ".csv":
+        return CSV
+    raise ExchangeError(f"{path}: unknown format (expected .xlf, .xliff or .csv)")
+
+
+def read_csv(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        missing = set(CSV_FIELDS) - set(reader.fieldnames or ())
+        if missing:
+            raise ExchangeError(f"{path}: missing column(s) {', '.join(sorted(missing))}")
+        for row in reader:
+            yield Unit(row["platform"], row["locale"], row["key"], row["source"], row["target"] or "")
+
+
+def read_xliff(path):
+    """Yield Units from an XLIFF 1.2 file, element by element."""
+    q = f"{{{XLIFF_NS}}}"
+    platform = locale = None
+    try:
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            if event == "start" and elem.tag in (f"{q}file", "file"):
+                platform = elem.get("product-name", "")
+                locale = elem.get("target-language", "")
+            elif event == "end" and elem.tag in (f"{q}trans-unit", "trans-unit"):
+                source = elem.find(f"{q}source")
+                if source is None:
+                    source = elem.find("source")
+                target = elem.find(f"{q}target")
+                if target is None:
+                    target = elem.find("target")
+                yield Unit(platform, locale, elem.get("id", ""),
+                           "" if source is None else "".join(source.itertext()),
+                           "" if target is None else "".join(target.itertext()))
+                elem.clear()
+    except ET.ParseError as e:
+        raise ExchangeError(f"{path}: {e}") from None
+
+
+def read(path):
+    return (read_xliff if format_for_path(path) == XLIFF else read_csv)(path)
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def change_sets(items):
+    """{platform: {key: {locale: text}}} from the units that carry a target."""
+    out = {}
+    for unit in items:
+        if not unit.target:
+            continue
+        if unit.platform not in (ANDROID, IOS):
+            raise ExchangeError(f"unit {unit.key!r} ({unit.locale}): unknown platform {unit.platform!r}")
+        out.setdefault(unit.platform, {}).setdefault(unit.key, {})[unit.locale] = unit.target
+    return out
+
+
+def _base_anchors(res_dir, changes):
+    """Anchor each key to the one before it in values/strings.xml.
+
+    A translation missing from a locale file is then inserted where the
+    base file has it rather than at the end.
+    """
+    path = android.strings_files(res_dir).get("values")
+    if path is None:
+        return {}
+    anchors = {}
+    previous = None
+    for name in android.load(path).resources:
+        if name in changes and previous is not None:
+            anchors[name] = previous
+        previous = name
+    return anchors
+
+
+def import_file(path, res_dir, ios_dir, dry_run=False):
+    """Apply a returned XLIFF/CSV file; returns {platform: [PatchResult]}."""
+    results = {}
+    for platform, changes in change_sets(read(path)).items():
+        if platform == ANDROID:
+            results[platform] = android.patch(res_dir, changes, _base_anchors(res_dir, changes),
+                                              dry_run=dry_run, legacy=False)
+        else:
+            results[platform] = apple.patch(ios_dir, changes, dry_run=dry_run)
+    return results
@@ -0,0 +1,185 @@
+"""
+Key x locale presence matrix for the Android and iOS string resources.
+
+Every file is parsed once. Each distinct key gets a bit position and each
+locale column is a Python int with one bit per key it defines, so the
+per-locale report is a handful of whole-set operations:
+
+    missing = base & ~column      keys the locale still falls back on
+    extra   = column & ~base      keys no longer in the base locale
+    stale   = column & same       keys still holding the base text verbatim
+
+The same bitsets give the cross-platform view: keys both base locales
+define that one platform has translated for a locale and the other has not.
+"""
+
+from dataclasses import dataclass, field
+
+from . import android, apple
+
+BASE_LOCALE = "en"
+
+# iOS bundles whose name differs from the Android locale.
+IOS_LOCALE_ALIASES = {"zh-TW": "zh"}
+
+
+@dataclass
+class Matrix:
+    platform: str
+    base: str
+    keys: list = field(default_factory=list)
+    bit: dict = field(default_factory=dict)
+    columns: dict = field(default_factory=dict)  # column -> presence mask
+    same: dict = field(default_factory=dict)  # column -> "value equals base" mask
+    untranslatable: int = 0
+    paths: dict = field(default_factory=dict)
+
+    def mask(self, keys):
+        out = 0
+        for key in keys:
+            index = self.bit.get(key)
+            if index is None:
+                index = self.bit[key] = len(self.keys)
+                self.keys.append(key)
+            out |= 1 << index
+        return out
+
+    def names(self, mask):
+        """Keys for the set bits of `mask`, in first-seen order."""
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(self.keys[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+    @property
+    def base_mask(self):
+        return self.columns[self.base] & ~self.untranslatable
+
+
+@dataclass
+class LocaleReport:
+    platform: str
+    column: str
+    path: str
+    present: int
+    total: int
+    missing: list
+    extra: list
+    stale: list
+
+    def record(self):
+        return {
+            "platform": self.platform,
+            "locale": self.column,
+            "path": self.path,
+            "present": self.present,
+            "total": self.total,
+            "missing": self.missing,
+            "extra": self.extra,
+            "stale": self.stale,
+        }
+
+
+def _popcount(mask):
+    return bin(mask).count("1")
+
+
+def _translatable_text(value):
+    return value is not None and any(ch.isalpha() for ch in value)
+
+
+def _fill(matrix, tables):
+    """tables: column -> (path, {key: value}); base column must be present."""
+    base_values = tables[matrix.base][1]
+    matrix.mask(base_values)  # base keys first so they get the low bits
+    for column, (path, values) in tables.items():
+        matrix.paths[column] = path
+        matrix.columns[column] = matrix.mask(values)
+        if column != matrix.base:
+            matrix.same[column] = matrix.mask(
+                key for key, value in values.items()
+                if value == base_values.get(key) and _translatable_text(value)
+            )
+    return matrix
+
+
+def android_matrix(res_dir):
+    matrix = Matrix("android", "values")
+    tables = {}
+    for dirname, path in android.strings_files(res_dir).items():
+        doc = android.load(path)
+        values = {name: doc.value(name) for name, res in doc.resources.items()}
+        tables[dirname] = (path, values)
+        if dirname == "values":
+            untranslatable = [name for name, res in doc.resources.items() if not res.translatable]
+    if "values" not in tables:
+        raise android.StringsError(f"{res_dir}: no values/strings.xml")
+    _fill(matrix, tables)
+    matrix.untranslatable = matrix.mask(untranslatable)
+    return matrix
+
+
+def ios_matrix(root, name="Localizable.strings"):
+    matrix = Matrix("ios", BASE_LOCALE)
+    tables = {}
+    for path in apple.find_strings_files(root, name):
+        table = apple.load(path)
+        tables[table.locale] = (path, {key: e.value for key, e in table.entries.items()})
+    if BASE_LOCALE not in tables:
+        raise ValueError(f"{root}: no {BASE_LOCALE}.lproj/{name}")
+    return _fill(matrix, tables)
+
+
+def report(matrix):
+    """One LocaleReport per non-base column."""
+    base = matrix.base_mask
+    total = _popcount(base)
+    out = []
+    for column, present in sorted(matrix.columns.items()):
+        if column == matrix.base:
+            continue
+        out.append(LocaleReport(
+            matrix.platform,
+            column,
+            matrix.paths[column],
+            _popcount(present & base),
+            total,
+            matrix.names(base & ~present),
+            matrix.names(present & ~matrix.columns[matrix.base]),
+            matrix.names(present & base & matrix.same[column]),
+        ))
+    return out
+
+
+def _android_locale(column):
+    return android.locale_for_dir(column)
+
+
+def _ios_locale(column):
+    return IOS_LOCALE_ALIASES.get(column, column)
+
+
+def cross_platform(android_m, ios_m):
+    """Per locale, shared base keys translated on one platform only.
+
+    Returns {locale: {"android_only": [...], "ios_only": [...]}}. Keys are
+    compared by name; only keys both base locales define are considered.
+    """
+    shared = set(android_m.names(android_m.base_mask)) & set(ios_m.names(ios_m.base_mask))
+    a_shared = android_m.mask(shared)
+    i_shared = ios_m.mask(shared)
+    ios_by_locale = {_ios_locale(c): mask for c, mask in ios_m.columns.items()}
+    out = {}
+    for column, mask in sorted(android_m.columns.items()):
+        locale = _android_locale(column)
+        if column == android_m.base or locale in out or locale not in ios_by_locale:
+            continue
+        a_keys = set(android_m.names(mask & a_shared))
+        i_keys = set(ios_m.names(ios_by_locale[locale] & i_shared))
+        out[locale] = {
+            "android_only": sorted(a_keys - i_keys),
+            "ios_only": sorted(i_keys - a_keys),
+        }
+    return out
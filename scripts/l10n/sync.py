@@ -0,0 +1,319 @@
+"""
+Incremental two-way sync between Android strings.xml and iOS
+Localizable.strings.
+
+Replaces scripts/sync_android_ios_locales.rb, which only copied Android into
+iOS. For every locale the two files are compared key by key:
+
+- a value only Android has (or that differs and Android changed since the
+  last sync) is written into the iOS file;
+- a value that differs while the Android side is unchanged since the last
+  sync was edited on iOS, and is written back into strings.xml;
+- a key only iOS has (one added on iOS first) is added to strings.xml,
+  unless it ends in _ios or was synced before and has since been removed
+  on Android.
+
+Placeholders are converted with one precompiled pattern and a lookup table
+per direction (%1$s <-> %1$@, %ld -> %d). Android strings with styling tags
+or CDATA are synced as the text getString() returns.
+
+A small JSON cache records, per file, its size, mtime and SHA-256, and per
+locale a short hash of every value both sides agreed on. A locale whose two
+files are unchanged since the last run is skipped without being parsed.
+The default direction is Android -> iOS only; pulling iOS edits back needs
+that cache as a baseline, so without one a pull is refused rather than
+copying every iOS-only string into strings.xml.
+iOS files are rewritten in one splice each; everything bound for Android is
+collected into a single change set and applied by android.patch, so every
+file is written at most once and only when its bytes change.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+
+from ..catalog.edits import apply_edits, effective_edits, write_if_changed
+from . import REPO_ROOT, android, apple
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = REPO_ROOT / ".l10n-sync-cache.json"
+
+ANDROID_TO_IOS = "android-to-ios"
+IOS_TO_ANDROID = "ios-to-android"
+BOTH = "both"
+DIRECTIONS = (BOTH, ANDROID_TO_IOS, IOS_TO_ANDROID)
+
+# Keys that are iOS-only by design and never copied into strings.xml.
+IOS_ONLY_SUFFIX = "_ios"
+
+# %[index$][flags][width][.precision][length]conversion
+_PLACEHOLDER_RE = re.compile(r"%(\d+\$)?([-+ #0]*\d*(?:\.\d+)?)(hh|h|ll|l|q|z|t|j|L)?([@a-zA-Z%])")
+
+# (length + conversion) -> replacement, per direction; anything else is kept.
+_TO_IOS = {"s": "@", "S": "@"}
+_TO_ANDROID = {
+    "@": "s",
+    "ld": "d", "lld": "d", "qd": "d", "zd": "d", "hd": "d", "hhd": "d",
+    "li": "d", "lli": "d", "lu": "d", "llu": "d", "zu": "d", "u": "d",
+    "lf": "f", "Lf": "f",
+}
+
+
+@dataclass
+class SyncResult:
+    locale: str
+    ios_path: str
+    skipped: bool = False
+    updated: list = field(default_factory=list)  # iOS values replaced
+    added: list = field(default_factory=list)  # keys added to iOS
+    pulled: list = field(default_factory=list)  # iOS values sent to Android
+    conflicts: list = field(default_factory=list)  # changed on both sides; Android kept
+    written: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def _file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _value_hash(value):
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class Cache:
+    """Per-file fingerprints and per-key value hashes from the last sync."""
+
+    def __init__(self, path, data=None):
+        self.path = path
+        data = data if data and data.get("version") == CACHE_VERSION else {}
+        self.files = data.get("files", {})
+        self.keys = data.get("keys", {})
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(path, json.load(f))
+        except (FileNotFoundError, ValueError):
+            return cls(path)
+
+    def _rel(self, path):
+        return os.path.relpath(path, REPO_ROOT)
+
+    def unchanged(self, path):
+        """True when `path` still matches its recorded fingerprint.
+
+        Size and mtime are checked first; the file is only hashed when they
+        moved, so an untouched tree costs two stat calls per locale.
+        """
+        entry = self.files.get(self._rel(path))
+        if entry is None or not os.path.exists(path):
+            return False
+        st = os.stat(path)
+        if entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return True
+        if entry["size"] == st.st_size and entry["sha256"] == _file_sha256(path):
+            self.record(path)  # touched but identical: refresh the mtime
+            return True
+        return False
+
+    def record(self, path):
+        st = os.stat(path)
+        self.files[self._rel(path)] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": _file_sha256(path),
+        }
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return False
+        data = {"version": CACHE_VERSION, "files": self.files, "keys": self.keys}
+        return write_if_changed(self.path, json.dumps(data, indent=1, sort_keys=True) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+def _converter(table):
+    def convert(value):
+        if "%" not in value:
+            return value
+        return _PLACEHOLDER_RE.sub(
+            lambda m: f"%{m[1] or ''}{m[2]}{table.get((m[3] or '') + m[4], (m[3] or '') + m[4])}", value)
+    return convert
+
+
+ios_value = _converter(_TO_IOS)
+ios_value.__doc__ = "Convert a decoded Android string to its iOS form (%1$s -> %1$@)."
+android_value = _converter(_TO_ANDROID)
+android_value.__doc__ = "Convert an iOS string to its Android form (%1$@ -> %1$s, %ld -> %d)."
+
+
+def android_values(doc):
+    """Syncable strings of a parsed strings.xml, in iOS form."""
+    out = {}
+    for name, res in doc.resources.items():
+        if res.tag != "string" or not res.translatable:
+            continue
+        out[name] = ios_value(android.string_value(res.raw(doc.text)))
+    return out
+
+
+def locale_pairs(res_dir, ios_dir):
+    """[(ios locale, strings.xml path, Localizable.strings path)].
+
+    Legacy values-in / values-iw folders are skipped in favour of values-id
+    / values-he. Locales are matched exactly: values-zh holds Simplified
+    Chinese and is not copied over the zh-TW bundle.
+    """
+    ios_locales = {name[:-len(".lproj")] for name in os.listdir(ios_dir) if name.endswith(".lproj")}
+    pairs = []
+    for dirname, path in android.strings_files(res_dir).items():
+        if dirname[len("values-"):] in android.LEGACY_QUALIFIERS:
+            continue
+        locale = android.locale_for_dir(dirname)
+        if locale not in ios_locales:
+            continue
+        pairs.append((locale, path, os.path.join(ios_dir, f"{locale}.lproj", "Localizable.strings")))
+    return pairs
+
+
+# ---------------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------------
+
+def _load_ios(path):
+    if not os.path.exists(path):
+        return None
+    table = apple.load(path)
+    if not table.ok:
+        raise ValueError(f"{path}: cannot sync into a file with syntax errors "
+                         f"(run `python3 -m scripts.l10n check`)")
+    return table
+
+
+def _base_resources(res_dir):
+    path = android.strings_files(res_dir).get("values")
+    return android.load(path).resources if path else {}
+
+
+def sync_locale(locale, android_path, ios_path, cache, full=False, dry_run=False,
+                direction=BOTH, base=None, to_android=None):
+    """Sync one locale pair.
+
+    iOS edits are applied here; values bound for Android are added to
+    `to_android` ({key: {locale: android text}}) for the caller to patch in
+    one pass. `base` is the resource index of values/strings.xml.
+    """
+    result = SyncResult(locale, ios_path)
+    android_same = not full and cache.unchanged(android_path)
+    ios_same = not full and cache.unchanged(ios_path)
+    if android_same and ios_same and locale in cache.keys:
+        result.skipped = True
+        return result
+
+    doc = android.load(android_path)
+    values = android_values(doc)
+    table = _load_ios(ios_path)
+    ios = {key: e.value for key, e in table.entries.items()} if table is not None else {}
+    base = base or {}
+    previous = cache.keys.get(locale, {})
+    push = direction != IOS_TO_ANDROID
+    pull = direction != ANDROID_TO_IOS
+
+    to_ios = {}
+    agreed = {}
+    for key, value in values.items():
+        current = ios.get(key)
+        if current == value:
+            agreed[key] = value
+            continue
+        if current is not None and pull and "<" not in doc.resources[key].raw(doc.text):
+            h = previous.get(key)
+            if h == _value_hash(value):
+                # Android is as it was at the last sync, so iOS was edited.
+                result.pulled.append(key)
+                agreed[key] = current
+                continue
+            if h is not None and h != _value_hash(current):
+                result.conflicts.append(key)
+        if push:
+            to_ios[key] = value
+            agreed[key] = value
+
+    if pull:
+        for key, current in ios.items():
+            if key in doc.resources or key in previous or key.endswith(IOS_ONLY_SUFFIX):
+                continue
+            res = base.get(key)
+            if res is None and locale != android.DEFAULT_LOCALE and key not in (to_android or {}):
+                continue  # a translation without a base string would fail lint
+            if res is not None and (res.tag != "string" or not res.translatable):
+                continue
+            result.pulled.append(key)
+            agreed[key] = current
+    if to_android is not None:
+        for key in result.pulled:
+            to_android.setdefault(key, {})[locale] = android_value(ios[key])
+
+    edits, result.updated, result.added = apple.plan(table, to_ios)
+    if dry_run:
+        return result
+    text = table.text if table is not None else ""
+    edits = effective_edits(text, edits)
+    if edits:
+        os.makedirs(os.path.dirname(ios_path), exist_ok=True)
+        result.written = write_if_changed(ios_path, apply_edits(text, edits))
+    cache.keys[locale] = {key: _value_hash(value) for key, value in agreed.items()}
+    cache.record(ios_path)
+    return result
+
+
+def _ios_anchors(ios_dir, keys):
+    """Anchor each key pulled into Android to the key before it in en.lproj."""
+    path = os.path.join(ios_dir, "en.lproj", "Localizable.strings")
+    if not os.path.exists(path):
+        return {}
+    anchors = {}
+    previous = None
+    for key in apple.load(path).entries:
+        if key in keys and previous is not None:
+            anchors[key] = previous
+        previous = key
+    return anchors
+
+
+def sync(res_dir, ios_dir, cache_path=DEFAULT_CACHE, full=False, dry_run=False, direction=ANDROID_TO_IOS):
+    """Sync every locale pair; returns (SyncResults, android PatchResults)."""
+    cache = Cache.load(cache_path)
+    if direction != ANDROID_TO_IOS and not cache.keys:
+        raise ValueError(f"{cache_path}: no sync baseline; run with --direction {ANDROID_TO_IOS} "
+                         f"once before pulling iOS changes into Android")
+    pairs = locale_pairs(res_dir, ios_dir)
+    base = _base_resources(res_dir) if direction != ANDROID_TO_IOS else None
+    to_android = {}
+    results = [
+        sync_locale(locale, android_path, ios_path, cache, full, dry_run, direction, base, to_android)
+        for locale, android_path, ios_path in pairs
+    ]
+    patched = []
+    if to_android:
+        patched = android.patch(res_dir, to_android, _ios_anchors(ios_dir, to_android), dry_run=dry_run)
+    if not dry_run:
+        # Record Android files after patching so the next run sees them as synced.
+        skipped = {r.locale for r in results if r.skipped}
+        for locale, android_path, _ in pairs:
+            if locale not in skipped:
+                cache.record(android_path)
+        cache.save()
+    return results, patched
@@ -0,0 +1,90 @@
+"""
+Round-trip test for `python3 -m scripts.l10n export` / `import`.
+
+Exports the repository's own strings to XLIFF and CSV and imports each
+file back unchanged into a scratch copy of the resources; every
+strings.xml and Localizable.strings, the legacy values-in / values-iw
+folders included, must come out byte-identical.
+
+Run from the repository root:
+
+    python3 -m unittest scripts.l10n.tests.test_exchange
+    python3 -m pytest scripts/l10n/tests
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.l10n import ANDROID_RES, IOS_SOURCES, exchange
+
+
+def _copy_tree(src, dst, pattern):
+    for path in Path(src).glob(pattern):
+        target = Path(dst) / path.relative_to(src)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, target)
+
+
+def _snapshot(root):
+    return {os.path.relpath(p, root): p.read_bytes() for p in sorted(Path(root).rglob("*")) if p.is_file()}
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="l10n-exchange-"))
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.res_dir = self.tmp / "res"
+        self.ios_dir = self.tmp / "ios"
+        _copy_tree(ANDROID_RES, self.res_dir, "values*/strings.xml")
+        _copy_tree(IOS_SOURCES, self.ios_dir, "*.lproj/Localizable.strings")
+
+    def _round_trip(self, platform, suffix):
+        if platform == exchange.ANDROID:
+            base, targets = exchange.android_tables(self.res_dir)
+        else:
+            base, targets = exchange.ios_tables(self.ios_dir)
+        path = self.tmp / f"{platform}{suffix}"
+        count = exchange.export(path, exchange.units(platform, base, targets),
+                                exchange.format_for_path(path))
+        self.assertGreater(count, 0)
+
+        before = _snapshot(self.tmp / ("res" if platform == exchange.ANDROID else "ios"))
+        results = exchange.import_file(path, self.res_dir, self.ios_dir)
+        after = _snapshot(self.tmp / ("res" if platform == exchange.ANDROID else "ios"))
+
+        self.assertEqual([r.path for r in results[platform] if r.written], [])
+        changed = sorted(name for name in before if before[name] != after.get(name))
+        self.assertEqual(changed, [])
+        self.assertEqual(sorted(before), sorted(after))
+
+    def test_android_xliff(self):
+        self._round_trip(exchange.ANDROID, ".xlf")
+
+    def test_android_csv(self):
+        self._round_trip(exchange.ANDROID, ".csv")
+
+    def test_ios_xliff(self):
+        self._round_trip(exchange.IOS, ".xlf")
+
+    def test_ios_csv(self):
+        self._round_trip(exchange.IOS, ".csv")
+
+    def test_import_leaves_legacy_folders_alone(self):
+        legacy = {name: (self.res_dir / name / "strings.xml").read_bytes()
+                  for name in ("values-in", "values-iw")}
+        path = self.tmp / "changes.csv"
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            exchange.write_csv(f, [exchange.Unit(exchange.ANDROID, "id", "app_name", "LLM Hub", "LLM Hub ID"),
+                                   exchange.Unit(exchange.ANDROID, "he", "app_name", "LLM Hub", "LLM Hub HE")])
+        exchange.import_file(path, self.res_dir, self.ios_dir)
+        for name, data in legacy.items():
+            self.assertEqual((self.res_dir / name / "strings.xml").read_bytes(), data, name)
+        self.assertIn("LLM Hub ID", (self.res_dir / "values-id" / "strings.xml").read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
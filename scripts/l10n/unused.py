@@ -0,0 +1,226 @@
+"""
+Find (and optionally prune) string resources no source file references.
+
+Every source file is read once and scanned with a single combined pattern
+that recognises the lookups the apps use:
+
+    Kotlin   R.string.key, stringResource(R.string.key), "key", and the same
+             through R.plurals / R.array for <plurals> and <string-array>
+    XML      @string/key, @plurals/key, @array/key (manifest, layouts, res/xml)
+    Swift    localized("key"), "key".localized, NSLocalizedString("key"), "key"
+
+Any string literal equal to a key counts as a use, since both apps pass
+keys around in tables before looking them up. Interpolated literals such
+as "gpu_layers_\\(n)" or "max_tokens_$id" keep every key with that prefix
+alive, and so does a Swift enum case of the same name (looked up through
+its rawValue). Scanning fans out over a process pool for large trees.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from ..catalog.edits import Edit, apply_edits, effective_edits, write_if_changed
+from . import android, apple, parity
+
+_KOTLIN_RE = re.compile(
+    r"""R\.(?:string|plurals|array)\.(?P<ref>\w+)
+      | @(?:string|plurals|array)/(?P<xml>\w+)
+      | "(?P<literal>\w+)"
+      | "(?P<prefix>\w*_)\$""",
+    re.X,
+)
+_SWIFT_RE = re.compile(
+    r""""(?P<literal>\w+)"
+      | \bcase[ \t]+(?P<case>\w+)
+      | "(?P<prefix>\w*_)\\\(""",
+    re.X,
+)
+_PATTERNS = {".kt": _KOTLIN_RE, ".java": _KOTLIN_RE, ".xml": _KOTLIN_RE, ".swift": _SWIFT_RE}
+
+# Below this many files a process pool costs more than it saves.
+_PARALLEL_MIN_FILES = 256
+
+
+@dataclass
+class UnusedKey:
+    key: str
+    bytes_by_locale: dict = field(default_factory=dict)
+
+    @property
+    def total_bytes(self):
+        return sum(self.bytes_by_locale.values())
+
+
+@dataclass
+class UnusedReport:
+    platform: str
+    base_keys: int
+    sources: int
+    unused: list = field(default_factory=list)
+
+    def bytes_by_locale(self):
+        out = {}
+        for item in self.unused:
+            for locale, size in item.bytes_by_locale.items():
+                out[locale] = out.get(locale, 0) + size
+        return out
+
+    def record(self):
+        return {
+            "platform": self.platform,
+            "base_keys": self.base_keys,
+            "sources": self.sources,
+            "unused": {u.key: u.bytes_by_locale for u in self.unused},
+            "bytes_by_locale": self.bytes_by_locale(),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Scanning
+# ---------------------------------------------------------------------------
+
+def source_files(roots, suffixes):
+    out = []
+    for root in roots:
+        if os.path.isfile(root):
+            out.append(os.fspath(root))
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "build"]
+            out.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(suffixes))
+    return sorted(out)
+
+
+def scan_file(path):
+    """Return (names, prefixes) referenced by one source file."""
+    pattern = _PATTERNS[os.path.splitext(path)[1]]
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    names = set()
+    prefixes = set()
+    for match in pattern.finditer(text):
+        prefix = match["prefix"]
+        if prefix is not None:
+            prefixes.add(prefix)
+        else:
+            names.add(match.group(match.lastindex))
+    return names, prefixes
+
+
+def scan(paths, jobs=None):
+    """Union of the names and dynamic prefixes referenced by `paths`."""
+    if jobs is None:
+        jobs = (os.cpu_count() or 1) if len(paths) >= _PARALLEL_MIN_FILES else 1
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+            results = list(pool.map(scan_file, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    else:
+        results = [scan_file(path) for path in paths]
+    names, prefixes = set(), set()
+    for n, p in results:
+        names |= n
+        prefixes |= p
+    return names, prefixes
+
+
+def _unused_keys(keys, names, prefixes):
+    # Prefixes shorter than "x_" would keep half the catalog alive.
+    prefixes = tuple(p for p in prefixes if len(p) >= 3)
+    return [k for k in keys if k not in names and not (prefixes and k.startswith(prefixes))]
+
+
+def _line_span(text, start, end):
+    """Widen [start, end) to whole lines when nothing else shares them."""
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", end)
+    line_end = len(text) if line_end < 0 else line_end + 1
+    if text[line_start:start].strip() or text[end:line_end].strip():
+        return start, end
+    return line_start, line_end
+
+
+# ---------------------------------------------------------------------------
+# Platforms
+# ---------------------------------------------------------------------------
+
+def _android_docs(res_dir):
+    return {dirname: android.load(path) for dirname, path in android.strings_files(res_dir).items()}
+
+
+def _ios_tables(ios_dir):
+    return {t.locale: t for t in map(apple.load, apple.find_strings_files(ios_dir))}
+
+
+def _android_spans(doc, key):
+    res = doc.resources.get(key)
+    return [] if res is None else [_line_span(doc.text, res.start, res.end)]
+
+
+def _ios_spans(table, key):
+    entry = table.entries.get(key)
+    if entry is None:
+        return []
+    entries = [e for e in table.shadowed if e.key == key] + [entry]
+    return [_line_span(table.text, e.start, e.end) for e in entries]
+
+
+def _build_report(platform, docs, base_keys, spans, source_paths, jobs):
+    """docs: column -> parsed file; spans(doc, key) -> removable spans of `key`."""
+    names, prefixes = scan(source_paths, jobs)
+    report = UnusedReport(platform, len(base_keys), len(source_paths))
+    for key in _unused_keys(base_keys, names, prefixes):
+        item = UnusedKey(key)
+        for column, doc in docs.items():
+            size = sum(len(doc.text[a:b].encode("utf-8")) for a, b in spans(doc, key))
+            if size:
+                item.bytes_by_locale[column] = size
+        report.unused.append(item)
+    return report
+
+
+def android_report(res_dir, source_roots, jobs=None):
+    """Keys of values/strings.xml that no Kotlin, Java or resource XML uses."""
+    docs = _android_docs(res_dir)
+    if "values" not in docs:
+        raise android.StringsError(f"{res_dir}: no values/strings.xml")
+    base_keys = list(docs["values"].resources)
+    # strings.xml may alias other strings; that alone does not keep them alive.
+    paths = [p for p in source_files(source_roots, (".kt", ".java", ".xml"))
+             if os.path.basename(p) != "strings.xml"]
+    return _build_report("android", docs, base_keys, _android_spans, paths, jobs)
+
+
+def ios_report(ios_dir, source_roots, jobs=None):
+    """Keys of en.lproj/Localizable.strings that no Swift file uses."""
+    tables = _ios_tables(ios_dir)
+    if parity.BASE_LOCALE not in tables:
+        raise ValueError(f"{ios_dir}: no {parity.BASE_LOCALE}.lproj/Localizable.strings")
+    base_keys = list(tables[parity.BASE_LOCALE].entries)
+    paths = source_files(source_roots, (".swift",))
+    return _build_report("ios", tables, base_keys, _ios_spans, paths, jobs)
+
+
+# ---------------------------------------------------------------------------
+# Pruning
+# ---------------------------------------------------------------------------
+
+def _prune(docs, keys, spans):
+    written = []
+    for doc in docs:
+        edits = [Edit(a, b, "") for key in keys for a, b in spans(doc, key)]
+        edits = effective_edits(doc.text, edits)
+        if edits and write_if_changed(doc.path, apply_edits(doc.text, edits)):
+            written.append(doc.path)
+    return written
+
+
+def prune_android(res_dir, keys):
+    """Remove `keys` from every strings.xml, one write per file."""
+    return _prune(_android_docs(res_dir).values(), keys, _android_spans)
+
+
+def prune_ios(ios_dir, keys):
+    """Remove `keys` from every Localizable.strings, one write per file."""
+    return _prune(_ios_tables(ios_dir).values(), keys, _ios_spans)